@@ -1,20 +1,36 @@
 """Interface to Google Drive."""
 
+import bisect
 import builtins
+import hashlib
+import io
+import itertools
 import os
+import queue
+import threading
 import time
 from argparse import Namespace
-from collections.abc import Generator
-from typing import Any
+from collections.abc import Collection, Generator, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO
 
 import libgoogle
 import xdg
 from googleapiclient.http import (  # type: ignore[import-untyped]
+    DEFAULT_CHUNK_SIZE,
     MediaFileUpload,
     MediaIoBaseDownload,
 )
 from loguru import logger
 
+from gdrive.batch import BatchExecutor
+from gdrive.bwlimit import BandwidthLimit
+from gdrive.cache import ContentCache
+from gdrive.index import DriveIndex
+from gdrive.media import ChunkSizer, HashingWriter, MediaReader, StreamUpload
+from gdrive.progress import Progress, Transfer
+from gdrive.query import quote
+
 __all__ = ["GoogleDriveAPI"]
 
 # Type alias for Google Drive items (files/folders as dicts)
@@ -29,6 +45,7 @@ class GoogleDriveAPI:  # noqa: PLR0902
     """
 
     _GOOGLE_MIMETYPE_FOLDER = "application/vnd.google-apps.folder"
+    _GOOGLE_MIMETYPE_SHORTCUT = "application/vnd.google-apps.shortcut"
 
     @classmethod
     def is_folder(cls, file: DriveItem) -> bool:
@@ -61,27 +78,89 @@ class GoogleDriveAPI:  # noqa: PLR0902
         [
             "parents",
             "id",
+            "driveId",
             "name",
             "mimeType",
             "modifiedTime",
+            "size",
+            "md5Checksum",
+            "quotaBytesUsed",
+            "ownedByMe",
             "lastModifyingUser/displayName",
             "capabilities/canDownload",
         ]
     )
 
+    # Maximum ``pageSize`` accepted by ``files().list``.
+    _PAGE_SIZE = 1000
+
+    # Retries, with randomized exponential backoff, of each chunk of a transfer.
+    _NUM_RETRIES = 5
+
+    # Files larger than this are uploaded in resumable chunks, reporting progress;
+    # initially of this size, then adapted to throughput (see `ChunkSizer`).
+    _UPLOAD_CHUNKSIZE = 8 << 20
+
     def __init__(self, options: Namespace) -> None:
         """Connect to Google Drive."""
 
         self.options = options
-        self.service: Any = libgoogle.connect("drive", "v3")
+        self._local = threading.local()
+        # Guards state shared by concurrent uploads.
+        self._lock = threading.Lock()
+        self._local.service = libgoogle.connect("drive", "v3")
         self.download_dir = xdg.xdg_data_home() / "gdrive"
 
         # Properties
         self._root_folder: DriveItem | None = None
         self._shared_with_me_folder: DriveItem | None = None
+        self._shared_drives: list[DriveItem] | None = None
         self._all_folders: list[DriveItem] | None = None
+        self._folders_by_path: dict[str, DriveItem] = {}
         self._all_files: list[DriveItem] | None = None
         self._items_by_id: dict[str, DriveItem] | None = None
+        self._items_by_md5: dict[tuple[str, str], DriveItem] | None = None
+        # Guards the (once only) crawl for ``items_by_md5``; not ``_lock``, so as not to block.
+        self._items_by_md5_lock = threading.Lock()
+        self._by_path: dict[str, DriveItem] | None = None
+        self._cache: ContentCache | None = None
+
+        # Starting chunk size of transfers; the size last chosen by any.
+        self._chunk_size = self._UPLOAD_CHUNKSIZE
+
+        # Aggregate progress, and bandwidth, of all transfers, by all workers.
+        bwlimit = BandwidthLimit(options.bwlimit) if options.bwlimit else None
+        self.progress = Progress(options.progress, bwlimit=bwlimit)
+
+        # Counters reported by upload commands.
+        self.upload_stats = {
+            "uploaded_files": 0,
+            "uploaded_bytes": 0,
+            "deduped_files": 0,
+            "deduped_bytes": 0,
+        }
+
+    @property
+    def service(self) -> Any:
+        """Return this thread's connection to the drive service.
+
+        ``httplib2`` connections must not be shared across threads, so each
+        worker thread makes its own connection on first use.
+        """
+
+        service = getattr(self._local, "service", None)
+        if service is None:
+            logger.debug("Connecting thread {!r}", threading.current_thread().name)
+            service = self._local.service = libgoogle.connect("drive", "v3")
+        return service
+
+    @property
+    def cache(self) -> ContentCache:
+        """Return the cache of downloaded content, in ``download_dir``."""
+
+        if self._cache is None:
+            self._cache = ContentCache(self.download_dir, self.options.cache_size)
+        return self._cache
 
     @property
     def root_folder(self) -> DriveItem:
@@ -98,8 +177,9 @@ class GoogleDriveAPI:  # noqa: PLR0902
         """Return item with matching ``id``."""
 
         # https://developers.google.com/drive/api/v3/reference/files/get
-        parms: dict[str, str] = {}
+        parms: dict[str, Any] = {}
         parms["fileId"] = file_id
+        parms["supportsAllDrives"] = True
         parms["fields"] = "*" if self.options.all_fields else self._FILE_ATTRS
 
         logger.debug("service.files().get({!r})", parms)
@@ -128,6 +208,179 @@ class GoogleDriveAPI:  # noqa: PLR0902
 
         return self._shared_with_me_folder
 
+    @property
+    def shared_drives(self) -> list[DriveItem]:
+        """Return the top-level folder of each shared drive, sorted by name.
+
+        Empty when shared drives are disabled by ``--no-shared-drives``.
+        """
+
+        if self._shared_drives is None:
+            self._shared_drives = []
+            if self.options.shared_drives:
+                # https://developers.google.com/drive/api/v3/reference/drives/list
+                parms: dict[str, Any] = {}
+                parms["pageSize"] = 100
+                parms["fields"] = "nextPageToken, drives(id, name, createdTime)"
+
+                while True:
+                    logger.debug("service.drives().list({!r})", parms)
+                    response = self.service.drives().list(**parms).execute()
+                    logger.trace("response {!r}", response)
+
+                    for drive in response.get("drives", []):
+                        self._shared_drives.append(
+                            {
+                                "id": drive["id"],
+                                "driveId": drive["id"],
+                                "name": drive["name"],
+                                "PATH": os.path.sep + drive["name"],
+                                "PARENT": None,
+                                "mimeType": self._GOOGLE_MIMETYPE_FOLDER,
+                                "lastModifyingUser": {"displayName": "-"},
+                                "capabilities": {"canDownload": False},
+                                "modifiedTime": drive.get("createdTime", "-"),
+                            }
+                        )
+
+                    parms["pageToken"] = response.get("nextPageToken")
+                    if not parms["pageToken"]:
+                        break
+
+            self._shared_drives.sort(key=lambda _: _["name"].lower())
+
+        return self._shared_drives
+
+    @property
+    def top_folders(self) -> list[DriveItem]:
+        """Return the top-level folders; ``My Drive``, ``Shared with me`` and each shared drive."""
+
+        return [self.root_folder, self.shared_with_me_folder, *self.shared_drives]
+
+    def _corpora(self) -> list[dict[str, Any]]:
+        """Return ``files().list`` parms selecting each independently crawlable corpus.
+
+        One for the user's own (and shared with me) items, and one per shared drive.
+        """
+
+        # https://developers.google.com/drive/api/v3/enable-shareddrives
+        corpora: list[dict[str, Any]] = [{}]
+        for drive in self.shared_drives:
+            corpora.append(
+                {
+                    "corpora": "drive",
+                    "driveId": drive["id"],
+                    "includeItemsFromAllDrives": True,
+                    "supportsAllDrives": True,
+                }
+            )
+        return corpora
+
+    def _split_by_time(self, parms: dict[str, Any], nparts: int) -> list[dict[str, Any]]:
+        """Return ``parms`` divided into (up to) ``nparts`` disjoint ``modifiedTime`` ranges.
+
+        The range boundaries are quantiles of the ``modifiedTime`` of a sample, one
+        (cheap) page of the query; a query that fits in the sample isn't divided.
+        """
+
+        sample = parms | {"fields": "nextPageToken, files(modifiedTime)"}
+        sample["pageSize"] = self._PAGE_SIZE
+        logger.debug("service.files().list({!r})", sample)
+        response = self.service.files().list(**sample).execute()
+
+        times = sorted(x["modifiedTime"] for x in response.get("files", []))
+        if not response.get("nextPageToken"):
+            return [parms]
+
+        bounds = sorted({times[len(times) * n // nparts] for n in range(1, nparts)})
+        logger.debug("Crawling {!r} in modifiedTime ranges split at {!r}", parms["q"], bounds)
+
+        clauses = [f"modifiedTime < '{bounds[0]}'"]
+        clauses += [
+            f"modifiedTime >= '{lo}' and modifiedTime < '{hi}'"
+            for lo, hi in itertools.pairwise(bounds)
+        ]
+        clauses += [f"modifiedTime >= '{bounds[-1]}'"]
+
+        return [parms | {"q": "{} and {}".format(parms["q"], x)} for x in clauses]
+
+    def _partitions(self, parms: dict[str, Any]) -> list[dict[str, Any]]:
+        """Return ``files().list`` parms dividing the query ``parms`` into disjoint partitions.
+
+        Each corpus is a partition; and, with ``--crawl-partitions N``, each corpus
+        is further divided into ``N`` ``modifiedTime`` ranges; (chosen concurrently).
+        """
+
+        corpora = [parms | x for x in self._corpora()]
+        nparts = self.options.crawl_partitions
+        if nparts <= 1:
+            return corpora
+
+        with ThreadPoolExecutor(len(corpora), thread_name_prefix="sample") as executor:
+            splits = executor.map(lambda _: self._split_by_time(_, nparts), corpora)
+            return [x for split in splits for x in split]
+
+    def _crawl(self, parms: dict[str, Any]) -> Generator[DriveItem, None, None]:
+        """Generate the items matching ``parms``, crawling all partitions concurrently.
+
+        Items are generated, unsorted, as each page of any partition arrives. An
+        item modified during the crawl may move between ``modifiedTime`` ranges,
+        and be seen twice; so items are deduplicated by ``id``.
+        """
+
+        partitions = self._partitions(parms)
+        if len(partitions) == 1:
+            yield from self._paginate(partitions[0])
+            return
+
+        pages: queue.Queue[builtins.list[DriveItem] | BaseException | None] = queue.Queue(
+            maxsize=2 * len(partitions)
+        )
+        stop = threading.Event()
+
+        def crawl(partition: dict[str, Any]) -> None:
+            try:
+                page = []
+                for item in self._paginate(partition):
+                    if stop.is_set():
+                        return
+                    page.append(item)
+                    if len(page) == self._PAGE_SIZE:
+                        pages.put(page)
+                        page = []
+                pages.put(page)
+            # Reason: re-raised by the consumer, in the calling thread.
+            except BaseException as e:  # noqa: BLE001
+                pages.put(e)
+            finally:
+                pages.put(None)
+
+        seen: set[str] = set()
+        running = len(partitions)
+        with ThreadPoolExecutor(running, thread_name_prefix="crawl") as executor:
+            for partition in partitions:
+                executor.submit(crawl, partition)
+
+            try:
+                while running:
+                    page = pages.get()
+                    if page is None:
+                        running -= 1
+                    elif isinstance(page, BaseException):
+                        raise page
+                    else:
+                        for item in page:
+                            if item["id"] not in seen:
+                                seen.add(item["id"])
+                                yield item
+            finally:
+                # stop early (on error, or when the caller stops consuming); and
+                # drain the queue, so no producer is left blocked on a full queue.
+                stop.set()
+                while running:
+                    if pages.get() is None:
+                        running -= 1
+
     @property
     def all_folders(self) -> list[DriveItem]:
         """Return list of all folders sorted by ``PATH``."""
@@ -145,69 +398,179 @@ class GoogleDriveAPI:  # noqa: PLR0902
         parms["q"] = "not trashed"
         parms["q"] += ' and mimeType="{:s}"'.format(self._GOOGLE_MIMETYPE_FOLDER)
 
-        folders = []
-        while True:
-            logger.debug("service.files().list({!r})", parms)
-            response = self.service.files().list(**parms).execute()
-            logger.trace("response {!r}", response)
-
-            files = response.get("files", [])
-            folders.extend(files)
-
-            parms["pageToken"] = response.get("nextPageToken")
-            if not parms["pageToken"]:
-                break
+        folders = list(self._crawl(parms))
 
         # build lookup map
         self._items_by_id = {}
 
         # these items are not in response; their PATH and PARENT attributes are already set.
-        for folder in (self.root_folder, self.shared_with_me_folder):
+        for folder in self.top_folders:
             self._items_by_id[folder["id"]] = folder
 
         # add items from the response
         for folder in folders:
             self._items_by_id[folder["id"]] = folder
 
+        # and the ancestors we can see, but can't list.
+        folders += self._resolve_parents(folders)
+
         # lookup map built; now we can link each item to its (first) parent.
+        self._link_folders(folders)
+
+        # create and return a sorted list
+        self._sort_folders()
+        assert self._all_folders is not None
+        return self._all_folders
+
+    def iter_folders(self, query: str = "") -> builtins.list[DriveItem]:
+        """Return list of all folders, sorted by ``PATH``; or only those matching ``query``.
+
+        Given a ``query`` (from `gdrive.query.build_query`), only matching folders
+        are listed, and, unless all folders are already known, only the folders
+        above them are fetched, rather than crawling them all.
+        """
+
+        if not query:
+            return self.all_folders
+
+        # https://developers.google.com/drive/api/v3/reference/files/list
+        parms: dict[str, Any] = {}
+        parms["fields"] = (
+            "*"
+            if self.options.all_fields
+            else "nextPageToken, files({})".format(self._FILE_ATTRS)
+        )
+        parms["q"] = "not trashed"
+        parms["q"] += ' and mimeType="{:s}"'.format(self._GOOGLE_MIMETYPE_FOLDER)
+        parms["q"] += " and " + query
+
+        self._init_items_by_id()
+        assert self._items_by_id is not None
+        matches = [self._items_by_id.setdefault(x["id"], x) for x in self._crawl(parms)]
+        self._link_folders(self._resolve_parents(matches) + matches)
+        return sorted(matches, key=lambda _: _["PATH"].lower())
+
+    def _init_items_by_id(self, folder_index: bool = False) -> None:
+        """Start ``_items_by_id`` with the top-level folders, if no crawl has.
+
+        Or, with ``folder_index``, with the (linked) folders of the cached index, if any.
+        """
+
+        if self._items_by_id is not None:
+            return
+
+        index = DriveIndex.load() if folder_index else None
+        if index:
+            self._items_by_id = {x["id"]: x for x in index.items if self.is_folder(x)}
+        else:
+            self._items_by_id = {x["id"]: x for x in self.top_folders}
+
+    def _sort_folders(self) -> None:
+        """Set ``_all_folders`` from ``_items_by_id``, sorted by ``PATH``; and index them by ``PATH``."""
+
+        assert self._items_by_id is not None
+        self._all_folders = sorted(self._items_by_id.values(), key=lambda _: _["PATH"].lower())
+
+        self._folders_by_path = {}
+        for folder in self._all_folders:
+            self._folders_by_path.setdefault(folder["PATH"], folder)
+
+    def _link_folders(self, folders: builtins.list[DriveItem]) -> None:
+        """Link each of ``folders`` to its ``PARENT``, and set its ``PATH``."""
+
         for folder in folders:
-            ids = folder.get("parents")
-            folder["PARENT"] = self._items_by_id[ids[0]] if ids else self.shared_with_me_folder
+            folder["PARENT"] = self._parent_of(folder)
 
         # and now we can utilize the links to
         # set each folder's absolute, fully-qualified PATH.
         for folder in folders:
             names = []
-            node = folder
+            node: DriveItem | None = folder
             while node:
                 names.append(node["name"])
                 node = node.get("PARENT")
             names.reverse()
             folder["PATH"] = os.path.join(os.path.sep, *names)
 
-        # create and return a sorted list
-        self._all_folders = sorted(self._items_by_id.values(), key=lambda _: _["PATH"].lower())
-        return self._all_folders
+    def _parent_of(self, item: DriveItem) -> DriveItem:
+        """Return the (first) parent folder of ``item``, or ``Shared with me`` if not visible."""
+
+        assert self._items_by_id is not None
+        ids = item.get("parents")
+        parent = self._items_by_id.get(ids[0]) if ids else None
+        return parent or self.shared_with_me_folder
+
+    def _resolve_parents(self, items: builtins.list[DriveItem]) -> builtins.list[DriveItem]:
+        """Fetch the unknown ancestors of ``items``; return them, unlinked.
+
+        Items shared into folders we can't list (or owned by others) have parents
+        that no crawl returns. Fetch the unknown parents, a batch at a time, then
+        their unknown parents, and so on up to the roots; adding each to
+        ``_items_by_id``. Parents that can't be fetched remain unknown, and their
+        children are linked to ``Shared with me``.
+        """
+
+        assert self._items_by_id is not None
+        found: builtins.list[DriveItem] = []
+        tried: set[str] = set()
+
+        while items:
+            unknown = {
+                ids[0]
+                for x in items
+                if (ids := x.get("parents"))
+                and ids[0] not in self._items_by_id
+                and ids[0] not in tried
+            }
+            if not unknown:
+                break
+
+            logger.debug("Resolving {} unknown parents", len(unknown))
+            tried |= unknown
+            items = builtins.list(self._get_items_by_id(unknown).values())
+            for item in items:
+                self._items_by_id[item["id"]] = item
+            found += items
+
+        return found
+
+    def _get_items_by_id(self, file_ids: set[str]) -> dict[str, DriveItem]:
+        """Return map of ``id`` to item, for each of ``file_ids`` that can be fetched."""
+
+        requests = {}
+        for file_id in sorted(file_ids):
+            # https://developers.google.com/drive/api/v3/reference/files/get
+            parms: dict[str, Any] = {}
+            parms["fileId"] = file_id
+            parms["supportsAllDrives"] = True
+            parms["fields"] = "*" if self.options.all_fields else self._FILE_ATTRS + ", trashed"
+            requests[file_id] = self.service.files().get(**parms)
+
+        items, errors = BatchExecutor(self.service).execute(requests)
+        for file_id, exception in errors.items():
+            logger.debug("Can't get {!r}: {}", file_id, exception)
+
+        return items
 
     def _add_folder(self, folder: DriveItem) -> None:
         """Add folder to list of all folders, maintaining sort order."""
 
         assert self._all_folders is not None
         assert self._items_by_id is not None
-        for index, value in enumerate(self._all_folders):
-            if value["PATH"] > folder["PATH"]:
-                self._all_folders.insert(index, folder)
-                self._items_by_id[folder["id"]] = folder
-                return
-
-        self._all_folders.append(folder)
+        bisect.insort(self._all_folders, folder, key=lambda _: _["PATH"].lower())
         self._items_by_id[folder["id"]] = folder
+        self._folders_by_path.setdefault(folder["PATH"], folder)
+
+    def get_folder(self, path: str) -> DriveItem | None:
+        """Return the folder at ``path``, which may be relative to ``My Drive``."""
+
+        return self._lookup_folder_by_path(self._normalize_drive_path(path))
 
     def _lookup_folder_by_path(self, path: str) -> DriveItem | None:
         """Return the folder with the matching ``PATH``."""
 
-        folders = [x for x in self.all_folders if x["PATH"] == path]
-        return folders[0] if folders else None
+        _ = self.all_folders
+        return self._folders_by_path.get(path)
 
     @property
     def all_files(self) -> list[DriveItem]:
@@ -216,7 +579,30 @@ class GoogleDriveAPI:  # noqa: PLR0902
         if self._all_files:
             return self._all_files
 
-        _ = self.all_folders
+        # create and return a sorted list
+        self._all_files = sorted(self.iter_files(), key=lambda _: _["PATH"].lower())
+
+        return self._all_files
+
+    def iter_files(
+        self, query: str = "", folder_index: bool = False
+    ) -> Generator[DriveItem, None, None]:
+        """Generate all files, unsorted, as each page of the crawl arrives.
+
+        Each file is linked to its ``PARENT`` folder and given its ``PATH``; files
+        are not retained, so memory is bounded by the folder tree, not by the drive.
+
+        Given a ``query`` (from `gdrive.query.build_query`), only matching files
+        are listed, and, unless all folders are already known, only the folders
+        above them are fetched, rather than crawling them all. With ``folder_index``,
+        the folders of the cached index (see ``get_index``) are used, if any; so
+        only folders created since the index was cached are fetched.
+        """
+
+        if query:
+            self._init_items_by_id(folder_index)
+        else:
+            _ = self.all_folders
 
         # https://developers.google.com/drive/api/v3/reference/files/list
         parms: dict[str, Any] = {}
@@ -227,31 +613,154 @@ class GoogleDriveAPI:  # noqa: PLR0902
         )
         parms["q"] = "not trashed"
         parms["q"] += ' and mimeType!="{:s}"'.format(self._GOOGLE_MIMETYPE_FOLDER)
+        if query:
+            parms["q"] += " and " + query
+
+        # point each item to its parent; holding those with unknown parents until the end.
+        assert self._items_by_id is not None
+        orphans = []
+        for item in self._crawl(parms):
+            ids = item.get("parents")
+            if ids and ids[0] not in self._items_by_id:
+                orphans.append(item)
+                continue
+            item["PARENT"] = self._parent_of(item)
+            item["PATH"] = os.path.join(item["PARENT"]["PATH"], item["name"])
+            yield item
+
+        if orphans:
+            folders = self._resolve_parents(orphans)
+            self._link_folders(folders)
+            if self._all_folders:
+                self._sort_folders()
+
+            for item in orphans:
+                item["PARENT"] = self._parent_of(item)
+                item["PATH"] = os.path.join(item["PARENT"]["PATH"], item["name"])
+                yield item
+
+    def folder_usage(self) -> dict[str, dict[str, int]]:
+        """Return map of folder ``id`` to usage of the subtree rooted at that folder.
+
+        Usage is a dict of ``size``, ``quotaBytesUsed``, ``files`` and ``folders``
+        (counts exclude the folder itself). One crawl of the files adds each file
+        to its ``PARENT``; then, one bottom-up pass over the folders, deepest
+        first, adds each folder's totals to its ``PARENT``.
+        """
+
+        def zero() -> dict[str, int]:
+            return {"size": 0, "quotaBytesUsed": 0, "files": 0, "folders": 0}
+
+        usage = {x["id"]: zero() for x in self.all_folders}
+
+        for item in self.iter_files():
+            size = int(item.get("size", 0))
+            # the crawl may have found (unlisted) ancestor folders of this file.
+            totals = usage.setdefault(item["PARENT"]["id"], zero())
+            totals["size"] += size
+            totals["quotaBytesUsed"] += int(item.get("quotaBytesUsed", size))
+            totals["files"] += 1
+
+        # bucket the folders by depth, to visit them deepest first without sorting.
+        levels: builtins.list[builtins.list[DriveItem]] = []
+        for folder in self.all_folders:
+            depth = folder["PATH"].count(os.path.sep)
+            while len(levels) <= depth:
+                levels.append([])
+            levels[depth].append(folder)
+
+        for level in reversed(levels):
+            for folder in level:
+                parent = folder.get("PARENT")
+                if not parent:
+                    continue
+                totals = usage.setdefault(folder["id"], zero())
+                parent_totals = usage.setdefault(parent["id"], zero())
+                for key, value in totals.items():
+                    parent_totals[key] += value
+                parent_totals["folders"] += 1
+
+        return usage
+
+    def _paginate(self, parms: dict[str, Any]) -> Generator[DriveItem, None, None]:
+        """Generate the ``files`` of each page of ``service.files().list(**parms)``."""
+
+        # https://developers.google.com/drive/api/v3/reference/files/list
+        parms.setdefault("pageSize", self._PAGE_SIZE)
 
-        items = []
         while True:
             logger.debug("service.files().list({!r})", parms)
             response = self.service.files().list(**parms).execute()
             logger.trace("response {!r}", response)
 
-            files = response.get("files", [])
-            items.extend(files)
+            yield from response.get("files", [])
 
             parms["pageToken"] = response.get("nextPageToken")
             if not parms["pageToken"]:
-                break
+                return
 
-        # point each item to its parent
-        assert self._items_by_id is not None
-        for item in items:
-            ids = item.get("parents")
-            item["PARENT"] = self._items_by_id[ids[0]] if ids else self.shared_with_me_folder
-            item["PATH"] = os.path.join(item["PARENT"]["PATH"], item["name"])
+    def get_index(self, refresh: bool = False) -> DriveIndex:
+        """Return the cached snapshot of all folders and files.
 
-        # create and return a sorted list
-        self._all_files = sorted(items, key=lambda _: _["PATH"].lower())
+        Crawl the drive to build (and cache) the snapshot if there isn't one, or to ``refresh`` it.
+        """
 
-        return self._all_files
+        index = None if refresh else DriveIndex.load()
+        if index is None:
+            index = DriveIndex(self.all_folders + self.all_files)
+            index.save()
+        return index
+
+    @property
+    def items_by_md5(self) -> dict[tuple[str, str], DriveItem]:
+        """Return map of ``(corpus, md5Checksum)`` to a file with that content, across the drive.
+
+        Only files in a corpus (see ``_corpus``) are mapped; not those of others.
+        """
+
+        # only callers needing the map wait for its crawl.
+        with self._items_by_md5_lock:
+            if self._items_by_md5 is None:
+                items_by_md5: dict[tuple[str, str], DriveItem] = {}
+                for item in self.all_files:
+                    md5 = item.get("md5Checksum")
+                    corpus = self._corpus(item)
+                    if md5 and corpus is not None:
+                        items_by_md5.setdefault((corpus, md5), item)
+                self._items_by_md5 = items_by_md5
+
+        return self._items_by_md5
+
+    @staticmethod
+    def _corpus(item: DriveItem) -> str | None:
+        """Return the corpus of ``item``; its shared drive's id, or "" if in ``My Drive``.
+
+        Return None if ``item`` is neither owned by the user nor in a shared drive;
+        (e.g., ``Shared with me``); such content is not the user's own copy.
+        """
+
+        if item.get("driveId"):
+            return str(item["driveId"])
+        return "" if item.get("ownedByMe") else None
+
+    def _lookup_file_by_content(self, md5: str, size: int, corpus: str = "") -> DriveItem | None:
+        """Return a file in ``corpus`` with content matching ``md5`` and ``size``, if any."""
+
+        item = self.items_by_md5.get((corpus, md5))
+        if item and int(item.get("size", -1)) == size:
+            return item
+        return None
+
+    @staticmethod
+    def md5sum(pathname: str) -> str:
+        """Return hex md5 digest of local file ``pathname``."""
+
+        # Not for security; this matches the drive's ``md5Checksum``.
+        md5 = hashlib.md5()
+        with open(pathname, "rb") as fh:
+            while chunk := fh.read(1 << 20):
+                md5.update(chunk)
+        return md5.hexdigest()
 
     def list(
         self,
@@ -259,8 +768,13 @@ class GoogleDriveAPI:  # noqa: PLR0902
         files_only: bool = False,
         folders_only: bool = False,
         recursive: bool = False,
+        query: str = "",
     ) -> Generator[DriveItem, None, None]:
-        """Generate list of items at ``PATH``."""
+        """Generate list of items at ``PATH``.
+
+        Only items matching ``query`` (from `gdrive.query.build_query`) are listed
+        from each folder; but, recursing, all sub-folders are traversed.
+        """
 
         path = self._normalize_drive_path(path)
 
@@ -274,7 +788,7 @@ class GoogleDriveAPI:  # noqa: PLR0902
                     yield item
 
                 # yield the folder's contents
-                yield from self._list(item, path, files_only, folders_only, recursive)
+                yield from self._list(item, path, files_only, folders_only, recursive, query)
 
             elif not folders_only:
                 # yield the file
@@ -283,22 +797,36 @@ class GoogleDriveAPI:  # noqa: PLR0902
         if not nitems:
             logger.error("FileNotFoundError {!r}", path)
 
+    def normalize_path(self, path: str) -> str:
+        """Return ``path`` absolute, fully-qualified from a top-level folder."""
+
+        return self._normalize_drive_path(path)
+
     def _normalize_drive_path(self, path: str) -> str:
-        """Normalize path to be absolute, fully-qualified from the root."""
+        """Normalize path to be absolute, fully-qualified from the root.
+
+        An absolute ``path`` whose first name is that of a top-level folder (``My
+        Drive``, ``Shared with me`` or a shared drive) is from that folder. Any
+        other is from ``My Drive``; but for a relative path starting with ``My
+        Drive`` or ``Shared with me``. So a folder in ``My Drive`` named like a
+        shared drive is reached by a relative path; the shared drive, by an
+        absolute path.
+        """
 
         # remove leading and trailing slashes.
         # reduce doubled slashes to a single slash.
 
+        absolute = False
         if path:
             path = os.path.normpath(path)
             if path[0] == os.path.sep:
+                absolute = True
                 path = path[1:]
 
+        tops = self.top_folders if absolute else [self.root_folder, self.shared_with_me_folder]
         if not path:
             path = self.root_folder["name"]
-        elif not path.startswith(self.root_folder["name"]) and not path.startswith(
-            self.shared_with_me_folder["name"]
-        ):
+        elif path.split(os.path.sep)[0] not in [x["name"] for x in tops]:
             path = os.path.join(self.root_folder["name"], path)
 
         if not path.startswith(os.path.sep):
@@ -334,9 +862,9 @@ class GoogleDriveAPI:  # noqa: PLR0902
         name: str | None = None,
         files_only: bool = False,
         folders_only: bool = False,
-        recursive: bool = False,
+        query: str = "",
     ) -> Generator[DriveItem, None, None]:
-        """Generate list of matching items."""
+        """Generate list of matching items; and matching ``query``, if given."""
 
         # https://developers.google.com/drive/api/v3/reference/files/list
 
@@ -347,31 +875,27 @@ class GoogleDriveAPI:  # noqa: PLR0902
             else "nextPageToken, files({})".format(self._FILE_ATTRS)
         )
         parms["q"] = "not trashed"
+        parms["includeItemsFromAllDrives"] = True
+        parms["supportsAllDrives"] = True
 
         if name:
-            parms["q"] += " and name='{:s}'".format(name.replace("'", "\\'"))
+            parms["q"] += " and name=" + quote(name)
 
         if parent == self.shared_with_me_folder:
             parms["q"] += " and sharedWithMe=true"
         elif parent:
             parms["q"] += ' and "{:s}" in parents'.format(parent["id"])
 
-        if files_only and not recursive:
+        if files_only:
             parms["q"] += ' and mimeType!="{:s}"'.format(self._GOOGLE_MIMETYPE_FOLDER)
 
         if folders_only:
             parms["q"] += ' and mimeType="{:s}"'.format(self._GOOGLE_MIMETYPE_FOLDER)
 
-        while True:
-            logger.debug("service.files().list({!r})", parms)
-            response = self.service.files().list(**parms).execute()
-            logger.trace("response {!r}", response)
+        if query:
+            parms["q"] += " and " + query
 
-            yield from response.get("files", [])
-
-            parms["pageToken"] = response.get("nextPageToken")
-            if parms["pageToken"] is None:
-                return
+        yield from self._paginate(parms)
 
     # Too many arguments; listing requires many orthogonal filter parameters.
     def _list(  # noqa: PLR0913, PLR0917
@@ -381,6 +905,7 @@ class GoogleDriveAPI:  # noqa: PLR0902
         files_only: bool,
         folders_only: bool,
         recursive: bool,
+        query: str = "",
     ) -> Generator[DriveItem, None, None]:
         """Generate list of items at ``path``, which must be an existing drive folder."""
 
@@ -389,14 +914,22 @@ class GoogleDriveAPI:  # noqa: PLR0902
         folders = []
         files = []
 
-        for item in self._search(
-            parent, files_only=files_only, folders_only=folders_only, recursive=recursive
-        ):
+        if recursive:
+            # the sub-folders are known from the crawl of all folders; search only for files.
+            folders = self._subfolders(parent)
+            if not folders_only:
+                files = builtins.list(self._search(parent, files_only=True, query=query))
+        else:
+            for item in self._search(
+                parent, files_only=files_only, folders_only=folders_only, query=query
+            ):
+                if self.is_folder(item):
+                    folders.append(item)
+                else:
+                    files.append(item)
+
+        for item in files + folders:
             item["PATH"] = os.path.join(path, item["name"])
-            if self.is_folder(item):
-                folders.append(item)
-            else:
-                files.append(item)
 
         # the files...
 
@@ -412,7 +945,23 @@ class GoogleDriveAPI:  # noqa: PLR0902
 
         for folder in folders:
             subfolder = os.path.join(path, folder["name"])
-            yield from self.list(subfolder, files_only, folders_only, recursive)
+            yield from self.list(subfolder, files_only, folders_only, recursive, query)
+
+    def _subfolders(self, folder: DriveItem) -> builtins.list[DriveItem]:
+        """Return the sub-folders of ``folder``; from ``all_folders``, without searching."""
+
+        # the folders beneath ``folder`` are one contiguous range of those sorted by PATH.
+        folders = self.all_folders
+        prefix = os.path.join(folder["PATH"], "")
+        start = bisect.bisect_left(folders, prefix.lower(), key=lambda _: _["PATH"].lower())
+
+        subfolders = []
+        for item in itertools.islice(folders, start, None):
+            if not item["PATH"].lower().startswith(prefix.lower()):
+                break
+            if (item.get("PARENT") or {}).get("id") == folder["id"]:
+                subfolders.append(item)
+        return subfolders
 
     def makedirs(self, args: Namespace, path: str) -> DriveItem | None:
         """Create folder.
@@ -421,55 +970,87 @@ class GoogleDriveAPI:  # noqa: PLR0902
         """
 
         path = self._normalize_drive_path(path)
-        folders = [x for x in path.split(os.path.sep) if x]
-
-        parent = self.root_folder
-        folder: DriveItem | None = None
-
-        for name in folders[1:]:
-            path = os.path.join(parent["PATH"], name)
-            folder = self._lookup_folder_by_path(path)
-            if not folder:
-                folder = self._create_folder(args, name, parent)
-            parent = folder
+        return self.create_folders(args, [path]).get(path)
 
-        return folder
+    def create_folders(self, args: Namespace, paths: Iterable[str]) -> dict[str, DriveItem]:
+        """Create the folders at ``paths``, and any missing ancestors; like ``makedirs``.
 
-    def _create_folder(self, args: Namespace, name: str, parent: DriveItem) -> DriveItem:
-        """Create folder ``name`` in folder ``parent``."""
-
-        # https://developers.google.com/drive/api/v3/reference/files/create
+        Plan all the missing folders up front, then create them a level at a time,
+        each level in batched requests; rather than one path, and one folder, at a
+        time. Return map of (normalized) path to folder, of ``paths`` that exist.
+        """
 
-        parms: dict[str, Any] = {
-            "body": {
+        wanted = {self._normalize_drive_path(x) for x in paths}
+
+        # plan; the missing folders, and their missing ancestors, by depth.
+        levels: dict[int, builtins.list[str]] = {}
+        missing: set[str] = set()
+        for wanted_path in wanted:
+            path = wanted_path
+            while (
+                path != os.path.sep
+                and path not in missing
+                and not self._lookup_folder_by_path(path)
+            ):
+                missing.add(path)
+                levels.setdefault(path.count(os.path.sep), []).append(path)
+                path = os.path.dirname(path)
+
+        if missing:
+            logger.info("Creating {} folders", len(missing))
+
+        for depth in sorted(levels):
+            self._create_level(args, sorted(levels[depth]))
+
+        return {x: folder for x in wanted if (folder := self._lookup_folder_by_path(x))}
+
+    def _create_level(self, args: Namespace, paths: builtins.list[str]) -> None:
+        """Create the folders at ``paths``, whose parents exist; in batched requests."""
+
+        requests = {}
+        for path in paths:
+            dirname, name = os.path.split(path)
+            parent = self._lookup_folder_by_path(dirname)
+            if not parent:
+                logger.error("Can't create {!r}; no parent folder", path)
+                continue
+
+            # https://developers.google.com/drive/api/v3/reference/files/create
+            parms: dict[str, Any] = {}
+            parms["supportsAllDrives"] = True
+            parms["fields"] = "*" if self.options.all_fields else self._FILE_ATTRS
+            parms["body"] = {
                 "name": name,
                 "mimeType": self._GOOGLE_MIMETYPE_FOLDER,
-                "fields": "id",
                 "parents": [parent["id"]],
-            },
-        }
+            }
 
-        if args.no_action:
-            logger.warning("Not running service.files().create({!r})", parms)
-            response: DriveItem = {"FAKE-FOLDER": "--no-action"}
-            response["PATH"] = os.path.join(parent["PATH"], name)
-            response["PARENT"] = parent
-            args.no_action += 1
-            response["id"] = "fake-id-{}".format(args.no_action)
-            return response
-
-        logger.info("service.files().create({!r})", parms)
-        response = self.service.files().create(**parms).execute()
-        logger.debug("response {!r}", response)
-
-        # Update cache
-        file_id: str = response["id"]
-        folder = self._get_item_by_id(file_id)
-        folder["PATH"] = os.path.join(parent["PATH"], folder["name"])
-        folder["PARENT"] = parent
-        self._add_folder(folder)
-
-        return folder
+            if args.no_action:
+                logger.warning("Not running service.files().create({!r})", parms)
+                args.no_action += 1
+                # not added to `all_folders`; only found by `_lookup_folder_by_path`.
+                self._folders_by_path[path] = {
+                    "FAKE-FOLDER": "--no-action",
+                    "id": "fake-id-{}".format(args.no_action),
+                    "name": name,
+                    "PATH": path,
+                    "PARENT": parent,
+                }
+                continue
+
+            logger.debug("service.files().create({!r})", parms)
+            requests[path] = self.service.files().create(**parms)
+
+        responses, errors = BatchExecutor(self.service).execute(requests)
+
+        for path, exception in errors.items():
+            logger.error("{!r} {}", path, exception)
+
+        for path, folder in responses.items():
+            logger.trace("response {!r}", folder)
+            folder["PARENT"] = self._lookup_folder_by_path(os.path.dirname(path))
+            folder["PATH"] = path
+            self._add_folder(folder)
 
     def download(
         self, args: Namespace, path: str, rename: str | None = None
@@ -523,7 +1104,7 @@ class GoogleDriveAPI:  # noqa: PLR0902
                 target_filename = root + "(" + str(itemno + 1) + ")" + ext
 
             # https://developers.google.com/drive/api/v3/reference/files/export
-            parms: dict[str, str] = {
+            parms: dict[str, Any] = {
                 "fileId": file["id"],
                 "mimeType": gmt["openxml"],
             }
@@ -539,6 +1120,7 @@ class GoogleDriveAPI:  # noqa: PLR0902
             # https://developers.google.com/drive/api/v3/reference/files/get
             parms = {
                 "fileId": file["id"],
+                "supportsAllDrives": True,
             }
 
             if args.no_action:
@@ -548,19 +1130,386 @@ class GoogleDriveAPI:  # noqa: PLR0902
             logger.debug("service.files().get_media({!r})", parms)
             request = self.service.files().get_media(**parms)
         logger.debug("request {!r}", request)
-        logger.info("Downloading {!r} -> {!r}", path, target_filename)
 
-        with open(target_filename, "wb") as fh:
-            downloader = MediaIoBaseDownload(fh, request)
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-                logger.debug("Download progress {}%", int(status.progress() * 100))
+        key = ContentCache.key(file, parms.get("mimeType"))
+        if args.cache and self.cache.get(key, target_filename, args.hardlink):
+            logger.info("Copied {!r} -> {!r} from cache", path, target_filename)
+            return target_filename
+
+        logger.info("Downloading {!r} -> {!r}", path, target_filename)
+        if not self._fetch_file(file, request, target_filename):
+            return None
 
+        if args.cache:
+            self.cache.put(key, target_filename, file)
         return target_filename
 
-    # Too many branches; upload handles many mime-type and error conditions inline.
-    def upload(self, args: Namespace, file: Any) -> DriveItem:  # noqa: PLR0912
+    def _fetch_file(self, file: DriveItem, request: Any, target_filename: str) -> bool:
+        """Execute media ``request`` for ``file`` into ``target_filename``; reporting progress."""
+
+        size = int(file["size"]) if "size" in file else None
+        self.progress.expect(1, size or 0)
+        transfer = self.progress.start(file["name"], size)
+        sizer = self._chunk_sizer()
+        ok = False
+        try:
+            ok = self._fetch(
+                request, target_filename, file.get("md5Checksum"), transfer, sizer, size
+            )
+        finally:
+            transfer.finish(ok)
+            self._record_chunks(sizer)
+        return ok
+
+    # Too many arguments; each is an optional facet of the transfer.
+    @classmethod
+    def _fetch(  # noqa: PLR0913, PLR0917
+        cls,
+        request: Any,
+        target_filename: str,
+        md5: str | None = None,
+        transfer: Transfer | None = None,
+        sizer: ChunkSizer | None = None,
+        size: int | None = None,
+    ) -> bool:
+        """Execute media ``request``, atomically replacing ``target_filename`` with the content.
+
+        The content is streamed into a partial file beside ``target_filename``,
+        computing its md5 on the fly. If that matches ``md5`` (when given), the
+        partial file is renamed to ``target_filename``; otherwise, it's removed.
+        A partial file of the same version, left by an interrupted transfer,
+        is resumed from its length; or, if already ``size`` bytes (when given),
+        verified and renamed without a request, else restarted. Progress is
+        reported to ``transfer``, and chunks are sized by ``sizer``, if given.
+        Return True if successful.
+        """
+
+        dirname, basename = os.path.split(target_filename)
+        version = "." + md5[:8] if md5 else ""
+        partial = os.path.join(dirname, "." + basename + version + ".partial")
+
+        writer = HashingWriter()
+        offset = 0
+        if md5 and os.path.exists(partial):
+            # only content with an md5 is resumed; it can be verified.
+            with open(partial, "rb") as fh:
+                while chunk := fh.read(1 << 20):
+                    writer.md5.update(chunk)
+                    offset += len(chunk)
+
+            # interrupted before the rename; there's nothing left to request.
+            if size is not None and offset >= size:
+                if offset == size and writer.md5.hexdigest() == md5:
+                    logger.info("Completing {!r} from {!r}", target_filename, partial)
+                    os.replace(partial, target_filename)
+                    return True
+                logger.warning("Restarting {!r}; can't verify {!r}", target_filename, partial)
+                writer = HashingWriter()
+                offset = 0
+            else:
+                logger.info("Resuming {!r} at {} bytes", target_filename, offset)
+
+        with open(partial, "ab" if offset else "wb") as fh:
+            writer.fh = fh
+            cls._copy_media(request, writer, offset, transfer, sizer)
+
+        if md5 and writer.md5.hexdigest() != md5:
+            logger.error(
+                "Checksum mismatch {!r}; got {!r}, expecting {!r}",
+                target_filename,
+                writer.md5.hexdigest(),
+                md5,
+            )
+            os.remove(partial)
+            return False
+
+        os.replace(partial, target_filename)
+        return True
+
+    @staticmethod
+    def _copy_media(
+        request: Any,
+        fh: Any,
+        offset: int = 0,
+        transfer: Transfer | None = None,
+        sizer: ChunkSizer | None = None,
+    ) -> None:
+        """Execute media ``request``, writing the content, from ``offset``, to ``fh``.
+
+        Each chunk written is reported to ``transfer``, if given. Chunks are sized,
+        and retried, by ``sizer``; by default, a fixed ``DEFAULT_CHUNK_SIZE``.
+        """
+
+        if sizer is None:
+            sizer = ChunkSizer(DEFAULT_CHUNK_SIZE, DEFAULT_CHUNK_SIZE, DEFAULT_CHUNK_SIZE)
+        downloader = MediaIoBaseDownload(fh, request)
+        # there is no public interface to request a range; the next chunk starts here.
+        downloader._progress = offset  # noqa: SLF001
+
+        def chunk(size: int) -> tuple[Any, bool]:
+            # nor to change the chunk size of a download in progress.
+            downloader._chunksize = size  # noqa: SLF001
+            result: tuple[Any, bool] = downloader.next_chunk()
+            return result
+
+        done = False
+        while not done:
+            status, done = sizer.next_chunk(chunk, lambda: downloader._progress)  # noqa: SLF001
+            logger.debug("Download progress {}%", int(status.progress() * 100))
+            if transfer:
+                transfer.update(status.resumable_progress)
+
+    def _media_request(self, file: DriveItem) -> Any:
+        """Return request for the content of ``file``; exporting google docs to openxml."""
+
+        gmt = self._GOOGLE_MIMETYPES.get(file["mimeType"])
+        if gmt:
+            # https://developers.google.com/drive/api/v3/reference/files/export
+            parms = {"fileId": file["id"], "mimeType": gmt["openxml"]}
+            logger.debug("service.files().export_media({!r})", parms)
+            return self.service.files().export_media(**parms)
+
+        # https://developers.google.com/drive/api/v3/reference/files/get
+        parms = {"fileId": file["id"], "supportsAllDrives": True}
+        logger.debug("service.files().get_media({!r})", parms)
+        return self.service.files().get_media(**parms)
+
+    def fetch_range(self, file: DriveItem, start: int, end: int) -> bytes:
+        """Return bytes ``start`` up to (not including) ``end`` of binary ``file``."""
+
+        # https://developers.google.com/drive/api/guides/manage-downloads#partial_download
+        parms = {"fileId": file["id"], "supportsAllDrives": True}
+        logger.debug("service.files().get_media({!r}) bytes {}-{}", parms, start, end - 1)
+        request = self.service.files().get_media(**parms)
+        request.headers["range"] = f"bytes={start}-{end - 1}"
+
+        # one chunk; reported, and paced per any `--bwlimit`, when it's done.
+        transfer = self.progress.start(file["name"], end - start)
+        ok = False
+        try:
+            content: bytes = request.execute(num_retries=self._NUM_RETRIES)
+            transfer.update(len(content))
+            ok = True
+        finally:
+            transfer.finish(ok)
+        return content
+
+    def get_files(self, path: str) -> Generator[DriveItem, None, None]:
+        """Generate the files (not folders) at ``path``; there may be several with one name."""
+
+        path = self._normalize_drive_path(path)
+        nitems = 0
+        for item in self._get_items_at_path(path):
+            if self.is_folder(item):
+                logger.error("IsADirectoryError {!r}", path)
+            else:
+                nitems += 1
+                yield item
+
+        if not nitems:
+            logger.error("FileNotFoundError {!r}", path)
+
+    def open_media(self, file: DriveItem) -> BinaryIO:
+        """Return a read-only, buffered, file-like stream of the content of ``file``."""
+
+        return io.BufferedReader(MediaReader(self._media_request(file)))
+
+    def download_to(self, file: DriveItem, fh: Any) -> None:
+        """Write the content of ``file`` to caller-supplied, writable, file-like ``fh``."""
+
+        logger.info("Downloading {!r}", file["PATH"])
+        transfer = self.progress.start(
+            file["name"], int(file["size"]) if "size" in file else None
+        )
+        sizer = self._chunk_sizer()
+        ok = False
+        try:
+            self._copy_media(self._media_request(file), fh, transfer=transfer, sizer=sizer)
+            ok = True
+        finally:
+            transfer.finish(ok)
+            self._record_chunks(sizer)
+
+    def download_file(self, args: Namespace, file: DriveItem, target_filename: str) -> None:
+        """Copy binary (not google doc) ``file`` from google drive to ``target_filename``."""
+
+        # https://developers.google.com/drive/api/v3/reference/files/get
+        parms = {"fileId": file["id"], "supportsAllDrives": True}
+
+        if args.no_action:
+            logger.warning("Not running service.files().get_media({!r})", parms)
+            return
+
+        logger.info("Downloading {!r} -> {!r}", file["PATH"], target_filename)
+        logger.debug("service.files().get_media({!r})", parms)
+        request = self.service.files().get_media(**parms)
+        if not self._fetch_file(file, request, target_filename):
+            raise ValueError(f"Checksum mismatch {target_filename!r}")
+
+    def create_file(
+        self, args: Namespace, pathname: str, name: str, folder: DriveItem
+    ) -> DriveItem:
+        """Upload local ``pathname`` as a new file ``name`` in ``folder``; as is, no conversion."""
+
+        # https://developers.google.com/drive/api/v3/reference/files/create
+        parms: dict[str, Any] = {}
+        parms["supportsAllDrives"] = True
+        parms["media_body"] = MediaFileUpload(
+            pathname, chunksize=self._UPLOAD_CHUNKSIZE, resumable=True
+        )
+        parms["fields"] = self._FILE_ATTRS
+        parms["body"] = {"name": name, "parents": [folder["id"]]}
+
+        response: DriveItem
+        if args.no_action:
+            logger.warning("Not running service.files().create({!r})", parms)
+            response = {"FAKE-FILE": "--no-action", "name": name}
+        else:
+            logger.info("Uploading {!r} -> {!r}", pathname, os.path.join(folder["PATH"], name))
+            logger.debug("service.files().create({!r})", parms)
+            response = self._upload_file(self.service.files().create(**parms), pathname)
+            logger.trace("response {!r}", response)
+
+        response["PATH"] = os.path.join(folder["PATH"], name)
+        response["PARENT"] = folder
+        return response
+
+    def update_file(self, args: Namespace, file: DriveItem, pathname: str) -> DriveItem:
+        """Replace the content of ``file`` with that of local ``pathname``."""
+
+        # https://developers.google.com/drive/api/v3/reference/files/update
+        parms: dict[str, Any] = {}
+        parms["supportsAllDrives"] = True
+        parms["fileId"] = file["id"]
+        parms["media_body"] = MediaFileUpload(
+            pathname, chunksize=self._UPLOAD_CHUNKSIZE, resumable=True
+        )
+        parms["fields"] = self._FILE_ATTRS
+
+        response: DriveItem
+        if args.no_action:
+            logger.warning("Not running service.files().update({!r})", parms)
+            response = dict(file)
+        else:
+            logger.info("Updating {!r} <- {!r}", file["PATH"], pathname)
+            logger.debug("service.files().update({!r})", parms)
+            response = self._upload_file(self.service.files().update(**parms), pathname)
+            logger.trace("response {!r}", response)
+
+        response["PATH"] = file["PATH"]
+        response["PARENT"] = file.get("PARENT")
+        return response
+
+    def _upload_file(self, request: Any, pathname: str) -> DriveItem:
+        """Execute resumable upload ``request``, of local ``pathname``; reporting progress."""
+
+        transfer = self.progress.start(os.path.basename(pathname), os.path.getsize(pathname))
+        ok = False
+        try:
+            response = self._execute_upload(request, transfer)
+            ok = True
+        finally:
+            transfer.finish(ok)
+        return response
+
+    def move_item(
+        self, args: Namespace, item: DriveItem, folder: DriveItem, name: str
+    ) -> DriveItem:
+        """Move ``item`` into ``folder``, as ``name``."""
+
+        parms = self._move_parms(item, folder, name)
+
+        response: DriveItem
+        if args.no_action:
+            logger.warning("Not running service.files().update({!r})", parms)
+            response = dict(item)
+        else:
+            logger.info("Moving {!r} -> {!r}", item["PATH"], os.path.join(folder["PATH"], name))
+            logger.debug("service.files().update({!r})", parms)
+            response = self.service.files().update(**parms).execute()
+            logger.trace("response {!r}", response)
+
+        response["PATH"] = os.path.join(folder["PATH"], name)
+        response["PARENT"] = folder
+        return response
+
+    def _move_parms(self, item: DriveItem, folder: DriveItem, name: str) -> dict[str, Any]:
+        """Return parms of the request to move ``item`` into ``folder``, as ``name``."""
+
+        # https://developers.google.com/drive/api/v3/reference/files/update
+        parms: dict[str, Any] = {}
+        parms["supportsAllDrives"] = True
+        parms["fileId"] = item["id"]
+        parms["fields"] = self._FILE_ATTRS
+        parents = item.get("parents") or []
+        if folder["id"] not in parents[:1]:
+            parms["addParents"] = folder["id"]
+            if parents:
+                parms["removeParents"] = parents[0]
+        if name != item["name"]:
+            parms["body"] = {"name": name}
+
+        return parms
+
+    def trash(self, args: Namespace, item: DriveItem) -> None:
+        """Move ``item`` to the trash."""
+
+        # https://developers.google.com/drive/api/v3/reference/files/update
+        parms: dict[str, Any] = {
+            "fileId": item["id"],
+            "supportsAllDrives": True,
+            "body": {"trashed": True},
+        }
+
+        if args.no_action:
+            logger.warning("Not running service.files().update({!r})", parms)
+            return
+
+        logger.info("Trashing {!r}", item["PATH"])
+        logger.debug("service.files().update({!r})", parms)
+        response = self.service.files().update(**parms).execute()
+        logger.trace("response {!r}", response)
+
+    def upload_folder_path(self, args: Namespace, file: Any) -> str:
+        """Return the (normalized) path of the folder that ``upload`` puts ``file`` in."""
+
+        target_folder_pathname: str = (
+            args.target_folder if args.target_folder else self.root_folder["PATH"]
+        )
+
+        dirname = os.path.dirname(file.pathname)
+        if args.prog != "uploadlist" and dirname:
+            target_folder_pathname = os.path.join(target_folder_pathname, dirname)
+
+        return self._normalize_drive_path(target_folder_pathname)
+
+    def find_upload(self, args: Namespace, file: Any) -> DriveItem | None:
+        """Return the drive file that ``upload`` of ``file`` would have created, if it exists.
+
+        That is, a file of the same name in the target folder; e.g., uploaded by an
+        interrupted run. It must have the same content (by md5); or, if ``upload``
+        would convert ``file`` to a google doc, which has no md5, that mimeType.
+        """
+
+        folder = self._lookup_folder_by_path(self.upload_folder_path(args, file))
+        if not folder or args.add_timestamp:
+            return None
+
+        name = os.path.basename(file.pathname)
+        mimetype = self._convert_mimetype(args, file.pathname, name)
+        if mimetype and self._GOOGLE_MIMETYPES.get(mimetype, {}).get("google") == mimetype:
+            match = {"mimeType": mimetype}
+        else:
+            match = {"md5Checksum": self.md5sum(file.pathname)}
+
+        for item in self._search(folder, name, files_only=True):
+            if all(item.get(k) == v for k, v in match.items()):
+                item["PATH"] = os.path.join(folder["PATH"], item["name"])
+                item["PARENT"] = folder
+                return item
+        return None
+
+    def upload(self, args: Namespace, file: Any) -> DriveItem:
         """Upload single regular file.
 
              Any looping or walking of the filesystem is for the caller to do.
@@ -580,60 +1529,109 @@ class GoogleDriveAPI:  # noqa: PLR0902
                  gdrive://folder/subdir/2013-05/file3.jpg
         """
 
-        # assert file.isfile
+        return self.transfer_upload(args, self.classify_upload(args, file))
 
-        target_folder_pathname: str = (
-            args.target_folder if args.target_folder else self.root_folder["PATH"]
-        )
-
-        dirname, target_basename = os.path.split(file.pathname)
+    def classify_upload(self, args: Namespace, file: Any) -> DriveItem:
+        """Return the plan to ``upload`` ``file``; all that's decided locally, without the drive.
 
-        if args.command != "uploadlist" and dirname:
-            target_folder_pathname = os.path.join(target_folder_pathname, dirname)
+        A dict of the ``file``, its target ``folder_path``, ``name`` and ``PATH``,
+        the ``mimeType`` to convert it to, if any, the ``size`` of its content
+        and, with ``--dedupe``, its ``md5Checksum``. This is the disk-bound part
+        of an upload; see ``resolve_upload_folders`` and ``transfer_upload``.
+        """
 
+        folder_path = self.upload_folder_path(args, file)
+        name = os.path.basename(file.pathname)
         if args.add_timestamp:
-            target_basename = str(int(time.time())) + "-" + target_basename
-        target_pathname = os.path.join(target_folder_pathname, target_basename)
+            name = str(int(time.time())) + "-" + name
+
+        job: DriveItem = {
+            "file": file,
+            "folder_path": folder_path,
+            "name": name,
+            "PATH": os.path.join(folder_path, name),
+            "mimeType": self._convert_mimetype(args, file.pathname, name),
+        }
+
+        job["size"] = os.path.getsize(file.pathname)
+        if args.dedupe:
+            job["md5Checksum"] = self.md5sum(file.pathname)
 
-        target_folder = self._lookup_folder_by_path(target_folder_pathname)
+        self.progress.expect(1, job["size"])
+        return job
+
+    def _convert_mimetype(self, args: Namespace, pathname: str, name: str) -> str | None:
+        """Return the google mimetype to convert ``pathname`` to, per ``--convert``, or None."""
+
+        if not args.convert:
+            return None
+
+        _, extension = os.path.splitext(name)
+        gmt = self._GOOGLE_MIMETYPES.get(extension)
+        if gmt:
+            logger.debug(
+                "converting to google mimetype {!r} for ext {!r}", gmt["google"], extension
+            )
+            return gmt["google"]
+
+        try:
+            # Import deferred; `magic` is optional and may not be installed.
+            import magic  # noqa: PLC0415
+
+            # `/usr/bin/file file | grep -q ASCII`
+            with open(pathname, "rb") as fh:
+                magic_string = magic.from_buffer(fh.read(1024))
+            if magic_string.find("ASCII") >= 0:
+                return "text/csv" if name.endswith(".csv") else "text/plain"
+        # magic detection is best-effort; fall back to default mime type on any error.
+        except Exception:  # noqa: PLW0703
+            pass
+
+        return None
+
+    def resolve_upload_folders(
+        self, args: Namespace, jobs: builtins.list[DriveItem]
+    ) -> builtins.list[DriveItem]:
+        """Set the ``PARENT`` folder of each of ``jobs``; creating any missing, in batches."""
+
+        folders = self.create_folders(args, {x["folder_path"] for x in jobs})
+        for job in jobs:
+            job["PARENT"] = folders.get(job["folder_path"])
+        return jobs
+
+    def transfer_upload(self, args: Namespace, job: DriveItem) -> DriveItem:
+        """Upload the file of ``job``, from ``classify_upload``; the network-bound part."""
+
+        file = job["file"]
+        target_pathname = job["PATH"]
+        target_basename = job["name"]
+
+        target_folder = job.get("PARENT") or self._lookup_folder_by_path(job["folder_path"])
         if not target_folder:
-            target_folder = self.makedirs(args, target_folder_pathname)
+            target_folder = self.makedirs(args, job["folder_path"])
+
+        if args.dedupe:
+            deduped = self._dedupe(args, job, target_folder)
+            if deduped:
+                self.progress.skip(job["size"])
+                return deduped
 
         # https://developers.google.com/drive/api/v3/reference/files/create\#request-body
         parms: dict[str, Any] = {}
-        parms["media_body"] = MediaFileUpload(file.pathname)
+        parms["supportsAllDrives"] = True
+        size = job["size"]
+        parms["media_body"] = MediaFileUpload(
+            file.pathname,
+            chunksize=self._UPLOAD_CHUNKSIZE,
+            resumable=size > self._UPLOAD_CHUNKSIZE,
+        )
         parms["fields"] = "*" if self.options.all_fields else self._FILE_ATTRS
         parms["body"] = {}
         parms["body"]["name"] = target_basename
         if target_folder:
             parms["body"]["parents"] = [target_folder["id"]]
-
-        if args.convert:
-            _, extension = os.path.splitext(target_basename)
-            gmt = self._GOOGLE_MIMETYPES.get(extension)
-            if gmt:
-                parms["body"]["mimeType"] = gmt["google"]
-                logger.debug(
-                    "converting to google mimetype {!r} for ext {!r}",
-                    parms["body"]["mimeType"],
-                    extension,
-                )
-            else:
-                try:
-                    # Import deferred; `magic` is optional and may not be installed.
-                    import magic  # noqa: PLC0415
-
-                    # `/usr/bin/file file | grep -q ASCII`
-                    # SIM115: open() without context manager; read(1024) is a one-shot probe.
-                    magic_string = magic.from_buffer(open(file).read(1024))  # noqa: SIM115
-                    if magic_string.find("ASCII") >= 0:
-                        if target_basename.endswith(".csv"):
-                            parms["body"]["mimeType"] = "text/csv"
-                        else:
-                            parms["body"]["mimeType"] = "text/plain"
-                # magic detection is best-effort; fall back to default mime type on any error.
-                except Exception:  # noqa: PLW0703
-                    pass
+        if job["mimeType"]:
+            parms["body"]["mimeType"] = job["mimeType"]
 
         response: DriveItem
         if args.no_action:
@@ -643,19 +1641,221 @@ class GoogleDriveAPI:  # noqa: PLR0902
             logger.info("Uploading {!r}", target_pathname)
             logger.debug("service.files().create({!r})", parms)
 
+            transfer = self.progress.start(target_basename, size)
             try:
-                response = (
-                    self.service.files().create(**parms).execute()
-                )  # Catch broad exceptions; upload errors are logged and returned as an error dict.
+                response = self._execute_upload(self.service.files().create(**parms), transfer)
+            # Catch broad exceptions; upload errors are logged and returned as an error dict.
             except Exception as e:  # noqa: PLW0703
                 logger.error("{!r} {}", target_pathname, e)
                 response = {"ERROR": str(e)}
+            transfer.finish("ERROR" not in response)
 
         logger.trace("response {!r}", response)
         response["PATH"] = target_pathname
         response["PARENT"] = target_folder
+
+        if "ERROR" not in response:
+            self._count_upload(file.pathname, response)
         return response  # https://developers.google.com/drive/api/v3/reference/files\#resource
 
+    def upload_stream(
+        self,
+        args: Namespace,
+        stream: Any,
+        path: str,
+        chunksize: int,
+        mimetype: str | None = None,
+    ) -> DriveItem:
+        """Upload the content of binary ``stream`` to new file ``path``.
+
+        ``stream`` need not be seekable, and its size need not be known; it is
+        sent in resumable chunks of up to ``chunksize`` bytes as it is read, so
+        the upload overlaps whatever is producing the stream. The content is
+        of ``mimetype``; by default, ``args.mimetype``.
+        """
+
+        path = self._normalize_drive_path(path)
+        dirname, basename = os.path.split(path)
+
+        target_folder = self._lookup_folder_by_path(dirname) or self.makedirs(args, dirname)
+        assert target_folder is not None
+
+        # https://developers.google.com/drive/api/guides/manage-uploads#resumable
+        parms: dict[str, Any] = {}
+        parms["supportsAllDrives"] = True
+        parms["media_body"] = StreamUpload(stream, mimetype or args.mimetype, chunksize)
+        parms["fields"] = "*" if self.options.all_fields else self._FILE_ATTRS
+        parms["body"] = {"name": basename, "parents": [target_folder["id"]]}
+
+        response: DriveItem | None
+        if args.no_action:
+            logger.warning("Not running service.files().create({!r})", parms)
+            response = {"FAKE-FILE": "--no-action"}
+        else:
+            logger.info("Uploading stream -> {!r}", path)
+            logger.debug("service.files().create({!r})", parms)
+            transfer = self.progress.start(basename)
+            ok = False
+            try:
+                response = self._execute_upload(
+                    self.service.files().create(**parms), transfer, maximum=chunksize
+                )
+                ok = True
+            finally:
+                transfer.finish(ok)
+            logger.trace("response {!r}", response)
+
+        response["PATH"] = path
+        response["PARENT"] = target_folder
+        return response
+
+    def _execute_upload(
+        self, request: Any, transfer: Transfer, maximum: int | None = None
+    ) -> DriveItem:
+        """Execute upload ``request``; in chunks, if resumable, reporting each to ``transfer``.
+
+        Chunks are sized by a `ChunkSizer`, of no more than ``maximum`` bytes, if given.
+        """
+
+        def chunk(size: int) -> tuple[Any, DriveItem | None]:
+            # there is no public interface to change the chunk size of an upload in progress.
+            request.resumable._chunksize = size  # noqa: SLF001
+            result: tuple[Any, DriveItem | None] = request.next_chunk()
+            return result
+
+        response: DriveItem | None = None
+        if not request.resumable:
+            response = request.execute(num_retries=self._NUM_RETRIES)
+        else:
+            sizer = self._chunk_sizer(maximum)
+            try:
+                while response is None:
+                    status, response = sizer.next_chunk(
+                        chunk, lambda: request.resumable_progress
+                    )
+                    if status:
+                        logger.debug("Upload progress {} bytes", status.resumable_progress)
+                        transfer.update(status.resumable_progress)
+            finally:
+                self._record_chunks(sizer)
+
+        # the last chunk has no status; (a stream's size is known only from the response).
+        transfer.update(transfer.size or int(response.get("size", transfer.done)))
+        return response
+
+    def _chunk_sizer(self, maximum: int | None = None) -> ChunkSizer:
+        """Return a `ChunkSizer` for a new transfer, per ``--min/max-chunk-size``.
+
+        It starts at the size last chosen for any transfer, capped by ``maximum``
+        (if given), and by a bandwidth limit, which paces whole chunks.
+        """
+
+        if maximum is None:
+            maximum = self.options.max_chunk_size
+        if self.progress.bwlimit:
+            maximum = min(maximum, self._UPLOAD_CHUNKSIZE)
+        return ChunkSizer(
+            min(self._chunk_size, maximum),
+            self.options.min_chunk_size,
+            maximum,
+            self._NUM_RETRIES,
+        )
+
+    def _record_chunks(self, sizer: ChunkSizer) -> None:
+        """Record the chunk sizes and errors of a finished transfer, and its last size."""
+
+        self._chunk_size = sizer.size
+        self.progress.add_chunks(sizer.sizes, sizer.errors)
+
+    def count_uploads(self, nfiles: int, nbytes: int) -> None:
+        """Add ``nfiles``, of ``nbytes`` in all, uploaded other than one by one, to ``upload_stats``.
+
+        E.g., the members of a bundle.
+        """
+
+        with self._lock:
+            self.upload_stats["uploaded_files"] += nfiles
+            self.upload_stats["uploaded_bytes"] += nbytes
+
+    def _count_upload(self, pathname: str, response: DriveItem) -> None:
+        """Update ``upload_stats`` and the content index after uploading ``pathname``."""
+
+        with self._lock:
+            self.upload_stats["uploaded_files"] += 1
+            self.upload_stats["uploaded_bytes"] += os.path.getsize(pathname)
+
+            md5 = response.get("md5Checksum")
+            corpus = self._corpus(response)
+            if md5 and corpus is not None and self._items_by_md5 is not None:
+                self._items_by_md5.setdefault((corpus, md5), response)
+
+    def _dedupe(
+        self,
+        args: Namespace,
+        job: DriveItem,
+        target_folder: DriveItem | None,
+    ) -> DriveItem | None:
+        """Don't upload the file of ``job`` if its content is already on the drive.
+
+        Either skip it, or create a shortcut to the existing file, per ``args.dedupe``.
+        Only the user's own copies, in the target's corpus (``My Drive`` or the
+        shared drive), count. No shortcut is created if the target name exists.
+        Return None if the content is not already on the drive.
+        """
+
+        size = job["size"]
+        corpus = target_folder.get("driveId", "") if target_folder else ""
+        existing = self._lookup_file_by_content(job["md5Checksum"], size, corpus)
+        if not existing:
+            return None
+
+        target_basename = job["name"]
+
+        target_pathname = os.path.join(
+            target_folder["PATH"] if target_folder else self.root_folder["PATH"],
+            target_basename,
+        )
+
+        response: DriveItem
+        if args.dedupe == "skip":
+            logger.info("Skipping {!r}; same content as {!r}", target_pathname, existing["PATH"])
+            response = {"DEDUPED": existing["id"]}
+        elif existing["PATH"] == target_pathname or any(
+            self._search(target_folder or self.root_folder, target_basename)
+        ):
+            logger.info("Not linking {!r}; it already exists", target_pathname)
+            response = {"DEDUPED": existing["id"]}
+        else:
+            # https://developers.google.com/drive/api/v3/shortcuts
+            parms: dict[str, Any] = {}
+            parms["supportsAllDrives"] = True
+            parms["fields"] = "*" if self.options.all_fields else self._FILE_ATTRS
+            parms["body"] = {
+                "name": target_basename,
+                "mimeType": self._GOOGLE_MIMETYPE_SHORTCUT,
+                "shortcutDetails": {"targetId": existing["id"]},
+            }
+            if target_folder:
+                parms["body"]["parents"] = [target_folder["id"]]
+
+            if args.no_action:
+                logger.warning("Not running service.files().create({!r})", parms)
+                response = {"DEDUPED": existing["id"]}
+            else:
+                logger.info("Linking {!r} -> {!r}", target_pathname, existing["PATH"])
+                logger.debug("service.files().create({!r})", parms)
+                response = self.service.files().create(**parms).execute()
+                logger.trace("response {!r}", response)
+                response["DEDUPED"] = existing["id"]
+
+        with self._lock:
+            self.upload_stats["deduped_files"] += 1
+            self.upload_stats["deduped_bytes"] += size
+
+        response["PATH"] = target_pathname
+        response["PARENT"] = target_folder
+        return response
+
     def rename(self, args: Namespace, oldpath: str, newpath: str) -> None:
         """Docstring."""
 
@@ -689,6 +1889,7 @@ class GoogleDriveAPI:  # noqa: PLR0902
 
         assert target_folder is not None
         parms: dict[str, Any] = {}
+        parms["supportsAllDrives"] = True
         parms["fileId"] = old["id"]
         parms["addParents"] = target_folder["id"]
         parms["removeParents"] = old["PARENT"]["id"]
@@ -705,6 +1906,375 @@ class GoogleDriveAPI:  # noqa: PLR0902
             response = self.service.files().update(**parms).execute()
             logger.trace("response {!r}", response)
 
+    def rename_many(
+        self,
+        args: Namespace,
+        renames: Iterable[tuple[str, str]],
+        in_doubt: Collection[tuple[str, str]] = (),
+    ) -> builtins.list[DriveItem]:
+        """Rename (or move) each ``(oldpath, newpath)`` of ``renames``, in batched requests.
+
+        Renames are done in order; in waves (see ``_rename_waves``), so one that
+        depends on an earlier rename, e.g., of a folder, and then of something in
+        it, is validated and done only after the earlier's batch is done. Within
+        each wave, validate all the sources and targets first (see
+        ``_live_items_by_path``); each source must exist, and each target must not
+        exist (nor be the target of another rename). Missing target folders are
+        created with ``create_folders``. Return a result for each rename; a dict of
+        ``src``, ``target``, the ``id`` of the item and, if it failed, ``error``. A
+        rename ``in_doubt`` (e.g., one journaled ``pending`` by an interrupted run)
+        whose source is gone, and target exists, is taken to have been done already.
+        """
+
+        renames = builtins.list(renames)
+        results: dict[int, DriveItem] = {}
+        gone: set[str] = set()
+        taken: set[str] = set()
+
+        for wave in self._rename_waves(renames):
+            wave_results, valid = self._validate_renames(
+                [renames[x] for x in wave], in_doubt, gone, taken
+            )
+            results.update(zip(wave, wave_results, strict=True))
+            self._rename_valid(args, wave_results, valid)
+
+        return [results[x] for x in range(len(renames))]
+
+    def _rename_waves(
+        self, renames: builtins.list[tuple[str, str]]
+    ) -> builtins.list[builtins.list[int]]:
+        """Return the indexes of ``renames`` in waves; each to be done after the one before.
+
+        A rename goes in the wave after that of the last earlier rename whose source
+        or target is at, above or beneath its own source or target.
+        """
+
+        at: dict[str, int] = {}  # wave of the last rename at each path.
+        beneath: dict[str, int] = {}  # wave of the last rename beneath each path.
+        waves: builtins.list[builtins.list[int]] = []
+
+        for index, rename in enumerate(renames):
+            paths = [self._normalize_drive_path(x) for x in rename]
+            wave = 0
+            for path in paths:
+                wave = max(wave, beneath.get(path, -1) + 1)
+                node = path
+                while True:
+                    wave = max(wave, at.get(node, -1) + 1)
+                    if node == os.path.dirname(node):
+                        break
+                    node = os.path.dirname(node)
+
+            for path in paths:
+                at[path] = wave
+                node = path
+                while node != os.path.dirname(node):
+                    node = os.path.dirname(node)
+                    beneath[node] = max(beneath.get(node, wave), wave)
+
+            if wave == len(waves):
+                waves.append([])
+            waves[wave].append(index)
+
+        return waves
+
+    def _rename_valid(
+        self,
+        args: Namespace,
+        results: builtins.list[DriveItem],
+        valid: builtins.list[tuple[DriveItem, DriveItem]],
+    ) -> None:
+        """Do the ``valid`` renames, of ``_validate_renames``, in batched requests."""
+
+        folders = self.create_folders(args, {os.path.dirname(x["target"]) for x, _ in valid})
+
+        requests = {}
+        for result, old in valid:
+            newhead, newtail = os.path.split(result["target"])
+            folder = folders.get(newhead)
+            if not folder:
+                result["error"] = "Can't create target folder"
+                continue
+
+            parms = self._move_parms(old, folder, newtail)
+            if args.no_action:
+                logger.warning("Not running service.files().update({!r})", parms)
+                continue
+
+            logger.debug("service.files().update({!r})", parms)
+            requests[result["src"]] = self.service.files().update(**parms)
+
+        done = self._execute_mutations(
+            requests, {x["src"]: x for x in results if "error" not in x}, "Renamed"
+        )
+        for result, old in valid:
+            if result["src"] in done:
+                old["parents"] = [folders[os.path.dirname(result["target"])]["id"]]
+                self._move_indexed(result["src"], result["target"])
+
+    def _validate_renames(
+        self,
+        renames: Iterable[tuple[str, str]],
+        in_doubt: Collection[tuple[str, str]],
+        gone: set[str],
+        taken: set[str],
+    ) -> tuple[builtins.list[DriveItem], builtins.list[tuple[DriveItem, DriveItem]]]:
+        """Return a result for each of ``renames``; and (result, item) of those to be done.
+
+        ``gone`` and ``taken`` are the paths renamed from, and to, by earlier
+        renames (of earlier waves); updated with those of ``renames`` to be done.
+        """
+
+        renames = builtins.list(renames)
+        normalized = [
+            (self._normalize_drive_path(x), self._normalize_drive_path(y)) for x, y in renames
+        ]
+        by_path = self._live_items_by_path([x for x, _ in normalized], lookup=True)
+        by_path |= self._live_items_by_path([x for _, x in normalized])
+
+        results: builtins.list[DriveItem] = []
+        valid: builtins.list[tuple[DriveItem, DriveItem]] = []
+
+        for rename, (src, target) in zip(renames, normalized, strict=True):
+            result = {"src": src, "target": target}
+            results.append(result)
+            old = by_path.get(result["src"])
+            if (
+                not old
+                and rename in in_doubt
+                and result["target"] in by_path
+                and result["target"] not in taken
+            ):
+                logger.info("Already renamed {!r} -> {!r}", result["src"], result["target"])
+                result["id"] = by_path[result["target"]]["id"]
+            elif not old:
+                result["error"] = "Can't find source"
+            elif result["src"] in gone:
+                result["error"] = "Source already renamed"
+            elif result["target"] in by_path or result["target"] in taken:
+                result["error"] = "Target already exists"
+            else:
+                result["id"] = old["id"]
+                gone.add(result["src"])
+                taken.discard(result["src"])
+                taken.add(result["target"])
+                gone.discard(result["target"])
+                valid.append((result, old))
+
+        for result in results:
+            if "error" in result:
+                logger.error("{!r} {}", result["src"], result["error"])
+
+        return results, valid
+
+    def trash_many(self, args: Namespace, paths: Iterable[str]) -> builtins.list[DriveItem]:
+        """Move the items at ``paths`` to the trash, in batched requests.
+
+        Validate all ``paths`` first (see ``_live_items_by_path``). Return a result
+        for each path; a dict of ``src`` and, if it failed, ``error``.
+        """
+
+        normalized = [self._normalize_drive_path(x) for x in paths]
+        by_path = self._live_items_by_path(normalized, lookup=True)
+        results: builtins.list[DriveItem] = []
+        requests = {}
+        sources: set[str] = set()
+
+        for path in normalized:
+            result = {"src": path}
+            results.append(result)
+            item = by_path.get(result["src"])
+            if not item or result["src"] in sources:
+                result["error"] = "Can't find source" if not item else "Source already trashed"
+                logger.error("{!r} {}", result["src"], result["error"])
+                continue
+            sources.add(result["src"])
+
+            # https://developers.google.com/drive/api/v3/reference/files/update
+            parms: dict[str, Any] = {}
+            parms["supportsAllDrives"] = True
+            parms["fileId"] = item["id"]
+            parms["fields"] = "id"
+            parms["body"] = {"trashed": True}
+
+            if args.no_action:
+                logger.warning("Not running service.files().update({!r})", parms)
+                continue
+
+            logger.debug("service.files().update({!r})", parms)
+            requests[result["src"]] = self.service.files().update(**parms)
+
+        done = self._execute_mutations(
+            requests, {x["src"]: x for x in results if "error" not in x}, "Trashed"
+        )
+        for path in done:
+            self._move_indexed(path, None)
+        return results
+
+    def _index_by_path(self) -> dict[str, DriveItem]:
+        """Return map of ``PATH`` to item, of the cached index; (see ``get_index``).
+
+        The map is kept up to date with the changes made by ``rename_many`` and
+        ``trash_many``; so, unlike the cached index, it needn't be rebuilt after each.
+        """
+
+        if self._by_path is None:
+            self._by_path = {}
+            for item in self.get_index().items:
+                self._by_path.setdefault(item["PATH"], item)
+        return self._by_path
+
+    def _live_items_by_path(
+        self, paths: Iterable[str], lookup: bool = False
+    ) -> dict[str, DriveItem]:
+        """Return map of each of ``paths`` to the item at it now, if any.
+
+        Items are found in the cached index, which may be stale; so each is fetched
+        again, by ``id``, and kept only if it's still at its ``PATH``; (not trashed,
+        with the same name, in the folder at the same ``PATH``). With ``lookup``, any
+        path not found so (e.g., of an item created since the index was cached) is
+        looked up by searching its folder. The map of ``_index_by_path`` is updated
+        with what's found.
+        """
+
+        by_path = self._index_by_path()
+        paths = set(paths)
+        candidates = {x: by_path[x] for x in paths if x in by_path}
+        fetched = self._get_items_by_id({x["id"] for x in candidates.values()})
+
+        found: dict[str, DriveItem] = {}
+        for path, candidate in candidates.items():
+            item = fetched.get(candidate["id"])
+            folder = self._lookup_folder_by_path(os.path.dirname(path))
+            if (
+                item
+                and folder
+                and not item.get("trashed")
+                and item["name"] == os.path.basename(path)
+                and (item.get("parents") or [])[:1] == [folder["id"]]
+            ):
+                found[path] = item | {"PATH": path, "PARENT": folder}
+            else:
+                logger.debug("Index is stale at {!r}", path)
+
+        for path in paths - found.keys():
+            item = next(self._get_items_at_path(path), None) if lookup else None
+            if item:
+                found[path] = item
+            else:
+                by_path.pop(path, None)
+
+        by_path |= found
+        return found
+
+    def _move_indexed(self, path: str, newpath: str | None) -> None:
+        """Move the item at ``path``, and any beneath it, to ``newpath``; or remove if None.
+
+        Both the map of ``_index_by_path`` and the crawled folders are updated.
+        """
+
+        assert self._by_path is not None
+        prefix = path + os.path.sep
+        moving = [path] + [x for x in self._by_path if x.startswith(prefix)]
+        folders = [
+            (x, x["PATH"])
+            for x in (self._items_by_id or {}).values()
+            if x["PATH"] == path or x["PATH"].startswith(prefix)
+        ]
+
+        for oldpath in moving:
+            item = self._by_path.pop(oldpath)
+            if newpath is not None:
+                item["PATH"] = newpath + oldpath[len(path) :]
+                self._by_path[item["PATH"]] = item
+
+        if newpath is not None:
+            self._by_path[newpath]["name"] = os.path.basename(newpath)
+
+        # and the folders; so later lookups, e.g., of a later wave of renames, find
+        # them, and what's beneath them, at their new paths.
+        for folder, oldpath in folders:
+            if newpath is None:
+                assert self._items_by_id is not None
+                del self._items_by_id[folder["id"]]
+                continue
+            folder["PATH"] = newpath + oldpath[len(path) :]
+            if folder["PATH"] == newpath:
+                folder["name"] = os.path.basename(newpath)
+                folder["PARENT"] = self._lookup_folder_by_path(os.path.dirname(newpath))
+                if folder["PARENT"]:
+                    folder["parents"] = [folder["PARENT"]["id"]]
+        if folders:
+            self._sort_folders()
+
+    def _execute_mutations(
+        self, requests: dict[str, Any], results: dict[str, DriveItem], verb: str
+    ) -> builtins.list[str]:
+        """Execute ``requests``, map of path to request; recording errors in ``results``.
+
+        Return the paths of the requests that succeeded. The cached index is
+        discarded if anything changed.
+        """
+
+        responses, errors = BatchExecutor(self.service).execute(requests)
+
+        for path, exception in errors.items():
+            logger.error("{!r} {}", path, exception)
+            results[path]["error"] = str(exception)
+
+        for path in responses:
+            result = results[path]
+            logger.info(
+                "{} {!r}{}",
+                verb,
+                path,
+                f" -> {result['target']!r}" if "target" in result else "",
+            )
+
+        if responses:
+            DriveIndex.discard()
+
+        return builtins.list(responses)
+
+    def get_start_page_token(self) -> str:
+        """Return token for listing changes made from now on."""
+
+        # https://developers.google.com/drive/api/v3/reference/changes/getStartPageToken
+        logger.debug("service.changes().getStartPageToken()")
+        response = self.service.changes().getStartPageToken().execute()
+        logger.trace("response {!r}", response)
+
+        return str(response["startPageToken"])
+
+    def list_changes(self, page_token: str) -> DriveItem:
+        """Return one page of changes made since ``page_token``.
+
+        The response has either a ``nextPageToken``, for the next page, or, when
+        there are no more changes, a ``newStartPageToken``, for future changes.
+        """
+
+        # https://developers.google.com/drive/api/v3/reference/changes/list
+        parms: dict[str, Any] = {}
+        parms["pageToken"] = page_token
+        parms["pageSize"] = self._PAGE_SIZE
+        parms["includeRemoved"] = True
+        parms["includeItemsFromAllDrives"] = True
+        parms["supportsAllDrives"] = True
+        parms["fields"] = (
+            "*"
+            if self.options.all_fields
+            else "nextPageToken, newStartPageToken, "
+            "changes(changeType, fileId, removed, time, file({}, trashed))".format(
+                self._FILE_ATTRS
+            )
+        )
+
+        logger.debug("service.changes().list({!r})", parms)
+        response: DriveItem = self.service.changes().list(**parms).execute()
+        logger.trace("response {!r}", response)
+
+        return response
+
     def about(self) -> DriveItem:
         """Get and return information about the google user and drive."""
 
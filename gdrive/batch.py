@@ -0,0 +1,124 @@
+"""Batched execution of Google Drive requests."""
+
+import random
+import time
+from http import HTTPStatus
+from typing import Any
+
+from googleapiclient.errors import HttpError  # type: ignore[import-untyped]
+from loguru import logger
+
+__all__ = ["BatchExecutor", "is_retryable"]
+
+DriveItem = dict[str, Any]
+
+# Status codes of sub-requests worth retrying; rate limits, and transient server errors.
+_RETRY_STATUS = {
+    HTTPStatus.FORBIDDEN,
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+}
+
+
+def is_retryable(exception: Exception) -> bool:
+    """Return True if the request that failed with `exception` may succeed if retried."""
+
+    if not isinstance(exception, HttpError):
+        return False
+    if exception.resp.status == HTTPStatus.FORBIDDEN:
+        # only rate limits; not permissions.
+        return "rateLimitExceeded" in str(exception.content)
+    return exception.resp.status in _RETRY_STATUS
+
+
+class BatchExecutor:
+    """Execute many drive requests, up to ``BATCH_SIZE`` per HTTP request.
+
+    See https://developers.google.com/drive/api/v3/batch
+
+    Each request has its own result; when some of a batch fail with a rate limit
+    or transient error, only those are retried, with randomized exponential
+    backoff. ``stats`` counts the ``batches``, ``requests`` and ``retries`` sent.
+    """
+
+    # Maximum number of requests in one batch request.
+    BATCH_SIZE = 100
+
+    def __init__(self, service: Any, retries: int = 5) -> None:
+        """Execute requests through drive `service`, retrying failures up to `retries` times."""
+
+        self.service = service
+        self.retries = retries
+        self.stats = {"batches": 0, "requests": 0, "retries": 0}
+
+    def execute(
+        self, requests: dict[str, Any]
+    ) -> tuple[dict[str, DriveItem], dict[str, Exception]]:
+        """Execute `requests`, a map of request id to request.
+
+        Return map of request id to response, of the requests that succeeded; and
+        map of request id to exception, of those that failed (after any retries).
+        If a whole batch fails, its requests answered before the failure keep
+        their results; the rest fail with the batch's exception.
+        """
+
+        responses: dict[str, DriveItem] = {}
+        errors: dict[str, Exception] = {}
+
+        pending = list(requests)
+        for attempt in range(self.retries + 1):
+            if attempt:
+                delay = 2**attempt * random.uniform(0.5, 1.0)
+                logger.debug("Retrying {} requests in {:.1f}s", len(pending), delay)
+                self.stats["retries"] += len(pending)
+                time.sleep(delay)
+
+            for request_id in pending:
+                errors.pop(request_id, None)
+
+            for start in range(0, len(pending), self.BATCH_SIZE):
+                self._execute_batch(
+                    {x: requests[x] for x in pending[start : start + self.BATCH_SIZE]},
+                    responses,
+                    errors,
+                )
+
+            pending = [x for x in pending if x in errors and is_retryable(errors[x])]
+            if not pending:
+                break
+
+        return responses, errors
+
+    def _execute_batch(
+        self,
+        requests: dict[str, Any],
+        responses: dict[str, DriveItem],
+        errors: dict[str, Exception],
+    ) -> None:
+        """Execute `requests` in one batch; adding their results to `responses` and `errors`."""
+
+        def callback(request_id: str, response: DriveItem, exception: Exception | None) -> None:
+            if exception is not None:
+                errors[request_id] = exception
+            else:
+                responses[request_id] = response
+
+        batch = self.service.new_batch_http_request(callback=callback)
+        for request_id, request in requests.items():
+            batch.add(request, request_id=request_id)
+
+        logger.debug("service.new_batch_http_request() of {} requests", len(requests))
+        try:
+            batch.execute()
+        # Catch broad exceptions; a failure of the batch itself, e.g., of its transport,
+        # is the error of each of its requests not yet answered.
+        except Exception as e:  # noqa: PLW0703
+            logger.warning("Batch of {} requests failed: {}", len(requests), e)
+            for request_id in requests:
+                if request_id not in responses and request_id not in errors:
+                    errors[request_id] = e
+        self.stats["batches"] += 1
+        self.stats["requests"] += len(requests)
@@ -0,0 +1,184 @@
+"""Bundles of small files; tar archives, with a manifest of the offset of each member."""
+
+import io
+import os
+import tarfile
+from collections.abc import Generator, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+import xdg
+
+__all__ = [
+    "MANIFEST_SUFFIX",
+    "Bundle",
+    "IterStream",
+    "coalesce",
+    "decode_segment",
+    "manifest_path",
+    "zstd",
+]
+
+# Drive (and local) name of the manifest of bundle ``NAME`` is ``NAME + MANIFEST_SUFFIX``.
+MANIFEST_SUFFIX = ".manifest.json"
+
+# Fields of each member in a manifest.
+_FIELDS = ["name", "offset", "length", "size", "mtime"]
+
+
+def manifest_path(name: str) -> Path:
+    """Return the path of the local copy of the manifest of bundle `name`."""
+
+    return xdg.xdg_data_home() / "gdrive" / "bundles" / (name + MANIFEST_SUFFIX)
+
+
+def zstd() -> Any:
+    """Return the `zstandard` module; an optional dependency.
+
+    Raise RuntimeError if it's not installed.
+    """
+
+    try:
+        # Import deferred; `zstandard` is optional and may not be installed.
+        import zstandard  # type: ignore[import-not-found,unused-ignore]  # noqa: PLC0415
+    except ImportError:
+        raise RuntimeError("zstd compression requires `pip install zstandard`") from None
+    return zstandard
+
+
+class Bundle:
+    """A tar archive of files, made of one independent segment per member.
+
+    Each segment is a member's tar header(s), content and padding; or, if
+    compressed, all that as one zstd frame. Segments concatenate to a valid
+    ``.tar`` (or ``.tar.zst``), and any one can be fetched by its byte range,
+    and decoded, alone. The ``manifest`` records the ``offset`` and ``length``
+    of each member's segment.
+    """
+
+    def __init__(self, name: str, compression: str | None = None) -> None:
+        """Start bundle `name`; compressed with `compression` (``zstd``), if given."""
+
+        self.name = name
+        self.compression = compression
+        self.members: list[list[Any]] = []
+        self.offset = 0
+        self._compressor = zstd().ZstdCompressor() if compression == "zstd" else None
+
+    def segments(self, files: Iterable[tuple[str, str]]) -> Generator[bytes, None, None]:
+        """Generate the segments of `files`, each ``(pathname, arcname)``, then the end of archive.
+
+        Each member is recorded in the manifest as its segment is generated.
+        """
+
+        for pathname, arcname in files:
+            with open(pathname, "rb") as fh:
+                data = fh.read()
+            info = tarfile.TarInfo(arcname)
+            info.size = len(data)
+            stats = os.stat(pathname)
+            info.mtime = int(stats.st_mtime)
+            info.mode = stats.st_mode & 0o7777
+
+            segment = self._encode(
+                info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+                + data
+                + bytes(-len(data) % tarfile.BLOCKSIZE)
+            )
+            self.members.append([arcname, self.offset, len(segment), info.size, info.mtime])
+            self.offset += len(segment)
+            yield segment
+
+        # two zero blocks end a tar archive.
+        segment = self._encode(bytes(2 * tarfile.BLOCKSIZE))
+        self.offset += len(segment)
+        yield segment
+
+    def _encode(self, data: bytes) -> bytes:
+        """Return `data`, compressed as one frame if compressing."""
+
+        return self._compressor.compress(data) if self._compressor else data
+
+    def manifest(self) -> dict[str, Any]:
+        """Return the manifest of this bundle."""
+
+        return {
+            "bundle": self.name,
+            "compression": self.compression,
+            "size": self.offset,
+            "fields": _FIELDS,
+            "members": self.members,
+        }
+
+    @staticmethod
+    def members_of(manifest: dict[str, Any]) -> list[dict[str, Any]]:
+        """Return the members of `manifest`, each as a dict of its fields."""
+
+        return [dict(zip(manifest["fields"], x, strict=True)) for x in manifest["members"]]
+
+
+def decode_segment(data: bytes, compression: str | None) -> tuple[tarfile.TarInfo, bytes]:
+    """Return the tar header, and content, of the member in segment `data`."""
+
+    if compression == "zstd":
+        data = zstd().ZstdDecompressor().decompress(data)
+
+    # the segment is a complete archive of one member, but for the end of archive.
+    with tarfile.open(fileobj=io.BytesIO(data + bytes(2 * tarfile.BLOCKSIZE))) as tar:
+        info = tar.next()
+        assert info is not None
+        fh = tar.extractfile(info)
+        assert fh is not None
+        return info, fh.read()
+
+
+def coalesce(
+    members: Iterable[dict[str, Any]], max_gap: int
+) -> Iterator[tuple[int, int, list[dict[str, Any]]]]:
+    """Generate ``(start, end, members)`` byte ranges that fetch `members` with fewest requests.
+
+    Members whose segments are no more than `max_gap` bytes apart share a range.
+    """
+
+    start, end = 0, 0
+    group: list[dict[str, Any]] = []
+    for member in sorted(members, key=lambda x: int(x["offset"])):
+        offset = member["offset"]
+        if group and offset - end > max_gap:
+            yield start, end, group
+            group = []
+        if not group:
+            start = end = offset
+        end = max(end, offset + member["length"])
+        group.append(member)
+    if group:
+        yield start, end, group
+
+
+class IterStream(io.RawIOBase):
+    """Read-only stream of the content of an iterable of bytes; e.g., `Bundle.segments`."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        """Prepare to read `chunks`, as they are generated."""
+
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        """Return True; this stream is readable."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Read up to ``len(buffer)`` bytes into `buffer`; return number of bytes read."""
+
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = memoryview(chunk)
+
+        nbytes = min(len(buffer), len(self._pending))
+        buffer[:nbytes] = self._pending[:nbytes]
+        self._pending = self._pending[nbytes:]
+        return nbytes
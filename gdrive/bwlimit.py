@@ -0,0 +1,95 @@
+"""Limit the bandwidth of all transfers, per a time-of-day schedule."""
+
+import bisect
+import threading
+import time
+from collections.abc import Callable
+
+from gdrive.units import parse_size
+
+__all__ = ["BandwidthLimit", "parse_schedule"]
+
+# Seconds of the rate that may be sent in a burst, after idling.
+_BURST = 1.0
+
+# Longest sleep before re-reading the schedule; so a new window takes effect promptly.
+_MAX_SLEEP = 1.0
+
+
+def parse_schedule(text: str) -> list[tuple[int, int | None]]:
+    """Return the schedule in `text`, as ``(minute-of-day, rate)``, sorted by minute.
+
+    `text` is either a rate, e.g., ``5M`` (bytes per second), or space-separated
+    ``HH:MM,RATE`` windows, each in effect until the next, e.g., ``08:00,5M 18:00,off``.
+    A rate of ``off`` (or ``0``) is unlimited. Raise ValueError if `text` is invalid;
+    (so that it may be used as an `argparse` ``type``).
+    """
+
+    windows: list[tuple[int, int | None]] = []
+    for word in text.split():
+        start, sep, rate = word.rpartition(",")
+        if not sep and len(text.split()) == 1:
+            start = "00:00"
+        try:
+            start_time = time.strptime(start, "%H:%M")
+        except ValueError:
+            raise ValueError(f"Invalid time {start!r} in {text!r}") from None
+
+        nbytes = None if rate.lower() == "off" else parse_size(rate)
+        windows.append((start_time.tm_hour * 60 + start_time.tm_min, nbytes or None))
+
+    if not windows:
+        raise ValueError(f"Invalid schedule {text!r}")
+    return sorted(windows)
+
+
+class BandwidthLimit:
+    """Token bucket limiting the bytes per second of all transfers, by all workers.
+
+    Each worker calls `consume` with the bytes of each chunk it has sent or
+    received; it sleeps while the bucket is in debt. The rate is read from the
+    schedule on each call, so a running transfer follows its windows.
+    """
+
+    def __init__(
+        self,
+        schedule: list[tuple[int, int | None]],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Limit bandwidth per `schedule`, from `parse_schedule`."""
+
+        self.schedule = schedule
+        self._minutes = [x[0] for x in schedule]
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = 0.0
+        self._last = clock()
+
+    def rate(self) -> int | None:
+        """Return the bytes per second allowed now, or None if unlimited."""
+
+        now = time.localtime()
+        minute = now.tm_hour * 60 + now.tm_min
+        # before the first window of the day, the last window of yesterday is in effect.
+        n = bisect.bisect_right(self._minutes, minute) - 1
+        return self.schedule[n][1]
+
+    def consume(self, nbytes: int) -> None:
+        """Take `nbytes` from the bucket; sleeping until it's no longer in debt."""
+
+        while True:
+            rate = self.rate()
+            with self._lock:
+                now = self._clock()
+                if rate is None:
+                    self._tokens = 0.0
+                else:
+                    self._tokens = min(self._tokens + (now - self._last) * rate, rate * _BURST)
+                self._last = now
+                if nbytes:
+                    self._tokens -= nbytes
+                    nbytes = 0
+                if rate is None or self._tokens >= 0:
+                    return
+                delay = min(-self._tokens / rate, _MAX_SLEEP)
+            time.sleep(delay)
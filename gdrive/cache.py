@@ -0,0 +1,148 @@
+"""Local cache of downloaded Google Drive content."""
+
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+__all__ = ["ContentCache"]
+
+DriveItem = dict[str, Any]
+
+
+class ContentCache:
+    """Cache of downloaded (and exported) content, with least-recently-used eviction.
+
+    Entries are keyed by file ``id``, version (``md5Checksum``, or ``modifiedTime``
+    for google docs, which have none) and export mimetype, so a changed file is
+    never served stale. Each entry's content is stored beside a small json
+    description of the drive file, for `gdrive cache --list`. An entry's mtime
+    is its last use.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        """Use cache in `directory`, holding no more than `max_bytes` of content."""
+
+        self.directory = directory / "content"
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(file: DriveItem, export_mimetype: str | None = None) -> str:
+        """Return cache key of `file`, as exported to `export_mimetype`."""
+
+        version = file.get("md5Checksum") or file["modifiedTime"]
+        text = "\0".join([file["id"], version, export_mimetype or ""])
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """Return pathname of the content of entry `key`."""
+        return self.directory / key[:2] / key
+
+    def get(self, key: str, target_filename: str, hardlink: bool = False) -> bool:
+        """Copy (or `hardlink`) entry `key` to `target_filename`; return False if not cached.
+
+        The copy is made beside `target_filename`, then renamed over it; so an
+        interrupted copy never leaves it truncated.
+        """
+
+        path = self._path(key)
+        if not path.exists():
+            return False
+
+        logger.debug("Cache hit {!r} -> {!r}", str(path), target_filename)
+        os.utime(path)  # mark as recently used.
+
+        dirname, basename = os.path.split(target_filename)
+        tmp = os.path.join(dirname, "." + basename + ".tmp")
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+
+        if hardlink:
+            try:
+                os.link(path, tmp)
+                os.replace(tmp, target_filename)
+                return True
+            except OSError as e:  # e.g., across filesystems.
+                logger.debug("Can't link {!r}: {}", str(path), e)
+
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, target_filename)
+        return True
+
+    def put(self, key: str, filename: str, file: DriveItem) -> None:
+        """Add a copy of local `filename`, the content of drive `file`, as entry `key`.
+
+        Content larger than the whole cache isn't added; it would only be evicted.
+        """
+
+        size = os.path.getsize(filename)
+        if size > self.max_bytes:
+            logger.debug("Not caching {!r}; {} bytes is too large", file.get("PATH"), size)
+            return
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = path.with_name(key + ".tmp")
+        shutil.copyfile(filename, tmp)
+        os.replace(tmp, path)
+
+        info = {
+            x: file.get(x) for x in ("id", "PATH", "mimeType", "modifiedTime", "md5Checksum")
+        }
+        path.with_suffix(".json").write_text(json.dumps(info), encoding="utf-8")
+        logger.debug("Cached {!r} as {!r}", file.get("PATH"), str(path))
+
+        self.evict()
+
+    def entries(self) -> Generator[tuple[Path, os.stat_result, DriveItem], None, None]:
+        """Generate (path, stat, description) of each entry."""
+
+        if not self.directory.exists():
+            return
+
+        for subdir in self.directory.iterdir():
+            for path in subdir.iterdir():
+                if path.suffix:
+                    continue  # .json or .tmp
+                try:
+                    info = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    info = {}
+                yield path, path.stat(), info
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """Remove least-recently-used entries until no more than `max_bytes` remain.
+
+        Return number of bytes removed.
+        """
+
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self.entries(), key=lambda _: _[1].st_mtime)
+        total = sum(x[1].st_size for x in entries)
+
+        removed = 0
+        for path, stats, info in entries:
+            if total - removed <= limit:
+                break
+            logger.debug("Evicting {!r} {!r}", str(path), info.get("PATH"))
+            self._remove(path)
+            removed += stats.st_size
+
+        return removed
+
+    def clear(self) -> int:
+        """Remove all entries; return number of bytes removed."""
+
+        return self.evict(0)
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        """Remove the entry at `path`."""
+        path.unlink(missing_ok=True)
+        path.with_suffix(".json").unlink(missing_ok=True)
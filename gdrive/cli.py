@@ -6,6 +6,9 @@ from typing import Any
 from libcli import BaseCLI
 
 from gdrive.api import GoogleDriveAPI
+from gdrive.bwlimit import parse_schedule
+from gdrive.progress import MODES
+from gdrive.units import parse_size
 
 __all__ = ["GoogleDriveCLI"]
 
@@ -44,6 +47,65 @@ class GoogleDriveCLI(BaseCLI):
             help="use parms['fields'] = '*' (be verbose)",
         )
 
+        self.parser.add_argument(
+            "--no-shared-drives",
+            dest="shared_drives",
+            action="store_false",
+            help="ignore shared drives; crawl only `My Drive` and `Shared with me`",
+        )
+
+        self.parser.add_argument(
+            "--crawl-partitions",
+            type=int,
+            default=1,
+            metavar="N",
+            help="crawl each drive as `N` concurrent `modifiedTime` ranges (default: `%(default)s`)",
+        )
+
+        self.parser.add_argument(
+            "--cache-size",
+            type=parse_size,
+            default="1G",
+            metavar="SIZE",
+            help="limit the cache of downloaded content to `SIZE` bytes (default: `%(default)s`)",
+        )
+
+        self.parser.add_argument(
+            "--min-chunk-size",
+            type=parse_size,
+            default="256K",
+            metavar="SIZE",
+            help="adapt the chunks of resumable transfers to no less than `SIZE` bytes "
+            "(default: `%(default)s`)",
+        )
+
+        self.parser.add_argument(
+            "--max-chunk-size",
+            type=parse_size,
+            default="64M",
+            metavar="SIZE",
+            help="adapt the chunks of resumable transfers to no more than `SIZE` bytes "
+            "(default: `%(default)s`)",
+        )
+
+        self.parser.add_argument(
+            "--progress",
+            choices=MODES,
+            default="auto",
+            help="report transfer progress as a status line (`tty`), as json records on "
+            "stderr (`json`), or not at all (`none`); `auto` is `tty` on a terminal, "
+            "else `json` (default: `%(default)s`)",
+        )
+
+        self.parser.add_argument(
+            "--bwlimit",
+            type=parse_schedule,
+            metavar="SCHEDULE",
+            help="limit all transfers to a total of `RATE` bytes per second; either one "
+            "`RATE` (e.g., `5M`), or `HH:MM,RATE` windows of the day, each in effect until "
+            "the next, (e.g., `08:00,5M 18:00,off`)",
+        )
+
     def main(self) -> None:
         """Command line interface entry point (method)."""
 
@@ -52,7 +114,10 @@ class GoogleDriveCLI(BaseCLI):
             self.parser.exit(2, "error: Missing COMMAND\n")
 
         self.api = GoogleDriveAPI(self.options)
-        self.options.cmd()
+        try:
+            self.options.cmd()
+        finally:
+            self.api.progress.close()
 
 
 def main(args: list[str] | None = None) -> None:
@@ -1,6 +1,7 @@
 """Google Drive Commands."""
 
 from argparse import ArgumentParser, _ArgumentGroup
+from collections.abc import Iterable
 from typing import Any, TypeVar
 
 from libcli import BaseCmd
@@ -8,6 +9,12 @@ from loguru import logger
 from rich.pretty import pprint as rich_pretty_print
 
 from gdrive.cli import GoogleDriveCLI
+from gdrive.journal import Journal
+from gdrive.lanes import SMALL_FILE_SIZE
+from gdrive.output import FORMATS, ItemWriter
+from gdrive.query import build_query, parse_time, quote
+from gdrive.since import HighWaterMark, parse_since
+from gdrive.units import format_size, parse_size
 
 Parser = TypeVar("Parser", ArgumentParser, _ArgumentGroup)
 
@@ -40,6 +47,55 @@ class GoogleDriveCmd(BaseCmd):
         assert isinstance(self.options.limit, int)
         return self.options.limit < 0
 
+    def add_jobs_option(self, parser: Parser) -> None:
+        """Add `--jobs` to the given `parser`."""
+
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=4,
+            metavar="N",
+            help="run `N` transfers of small files concurrently (default: `%(default)s`)",
+        )
+
+        parser.add_argument(
+            "--large-jobs",
+            type=int,
+            default=2,
+            metavar="N",
+            help="run `N` transfers of large files (over {}B) concurrently, "
+            "beside the small (default: `%(default)s`)".format(format_size(SMALL_FILE_SIZE)),
+        )
+
+    def add_no_action_option(self, parser: Parser, text: str = "don't change anything") -> None:
+        """Add `--no-action` to the given `parser`, with help `text`."""
+
+        parser.add_argument(
+            "-n",
+            "--no-action",
+            action="count",
+            default=0,
+            help=text,
+        )
+
+    def add_restart_option(self, parser: Parser) -> None:
+        """Add `--restart` to the given `parser`; of a command with a `Journal`."""
+
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="discard the journal of a previous run of this list, and start over",
+        )
+
+    def open_journal(self) -> Journal:
+        """Return the journal of `--listfile`; read-only with `--no-action`."""
+
+        journal = Journal(self.options.listfile, readonly=bool(self.options.no_action))
+        if self.options.restart:
+            journal.discard()
+        return journal
+
     def add_pretty_print_option(self, parser: Parser) -> None:
         """Add `--pretty-print` to the given `parser`."""
 
@@ -55,6 +111,177 @@ class GoogleDriveCmd(BaseCmd):
 
         rich_pretty_print(obj, **kwargs)
 
+    def add_format_option(self, parser: Parser) -> None:
+        """Add `--format` to the given `parser`."""
+
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="write items in a machine-readable format",
+        )
+
+    def add_fields_option(self, parser: Parser) -> None:
+        """Add `--fields` to the given `parser`."""
+
+        parser.add_argument(
+            "--fields",
+            metavar="FIELDS",
+            help="comma-separated list of fields to write with `--format`; e.g., `PATH,id,mimeType`",
+        )
+
+    def write_items(self, items: Iterable[dict[str, Any]]) -> None:
+        """Write `items` in the `--format` selected on the command line."""
+
+        fields = self.options.fields.split(",") if self.options.fields else None
+        with ItemWriter(self.options.format, fields) as writer:
+            for item in items:
+                if self.check_limit():
+                    break
+                writer.write(item)
+
+    def add_dedupe_option(self, parser: Parser) -> None:
+        """Add `--dedupe` to the given `parser`."""
+
+        parser.add_argument(
+            "--dedupe",
+            nargs="?",
+            const="skip",
+            choices=["skip", "shortcut"],
+            help="don't upload content already on the drive (matched by md5 and size); "
+            "`skip` it (the default), or create a `shortcut` to the existing file",
+        )
+
+    def print_upload_summary(self) -> None:
+        """Print counters collected by `GoogleDriveAPI.upload`."""
+
+        stats = self.cli.api.upload_stats
+        print(
+            str.format(
+                "uploaded {:d} files ({:d} bytes); deduplicated {:d} files ({:d} bytes)",
+                stats["uploaded_files"],
+                stats["uploaded_bytes"],
+                stats["deduped_files"],
+                stats["deduped_bytes"],
+            )
+        )
+
+    def print_batch_summary(self, verb: str, results: list[dict[str, Any]]) -> None:
+        """Print counts of the `results` of a batch of changes, that were `verb`."""
+
+        failed = sum(1 for x in results if "error" in x)
+        if self.options.no_action:
+            print(f"{verb} 0 items; (--no-action); {failed:d} failed")
+        else:
+            print(f"{verb} {len(results) - failed:d} items; {failed:d} failed")
+
+    def add_filter_options(self, parser: Parser) -> None:
+        """Add the item filters of `build_query`, and `--min-size`, to the given `parser`."""
+
+        group = parser.add_argument_group(
+            "filters", "only items matching all filters given are listed, by the drive's search"
+        )
+
+        group.add_argument(
+            "--mime",
+            action="append",
+            metavar="TYPE",
+            help="with mime-type `TYPE`; e.g., `image/*` (may be repeated; any matches)",
+        )
+
+        group.add_argument(
+            "--name-contains",
+            metavar="TEXT",
+            help="with a name containing `TEXT`; (the drive matches prefixes of words)",
+        )
+
+        group.add_argument(
+            "--modified-after",
+            type=parse_time,
+            metavar="TIME",
+            help="modified after `TIME`; a date-time, e.g., `2024-06-01`, or ago, e.g., `7d`",
+        )
+
+        group.add_argument(
+            "--modified-before",
+            type=parse_time,
+            metavar="TIME",
+            help="modified before `TIME`",
+        )
+
+        group.add_argument(
+            "--owner",
+            metavar="EMAIL",
+            help="owned by `EMAIL`",
+        )
+
+        group.add_argument(
+            "--min-size",
+            type=parse_size,
+            metavar="SIZE",
+            help="files of at least `SIZE` bytes; e.g., `10M` (filtered locally; "
+            "folders are not filtered)",
+        )
+
+    def add_since_option(self, parser: Parser) -> None:
+        """Add `--since` to the given `parser`."""
+
+        parser.add_argument(
+            "--since",
+            type=parse_since,
+            metavar="TIME",
+            help="only files modified since `TIME`, like `--modified-after`, or since the "
+            "last run with `--since`, `@lastrun`; the time of each complete run with "
+            "`--since` is recorded, per account. Paths are resolved with the index "
+            "cached by `find`, if any; (see `find --refresh`)",
+        )
+
+    def open_mark(self, scope: str) -> HighWaterMark | None:
+        """Return the high-water mark of this run of `scope`, if `--since`; else None."""
+
+        if not self.options.since:
+            return None
+
+        account = self.cli.api.about()["user"]["emailAddress"]
+        return HighWaterMark(account, scope, self.options.since)
+
+    def save_mark(self, mark: HighWaterMark | None) -> None:
+        """Save `mark`, if any; unless `--limit` cut the listing short."""
+
+        if mark and not (self.options.limit is not None and self.options.limit < 0):
+            mark.save()
+
+    def build_query(self, mark: HighWaterMark | None = None) -> str:
+        """Return the query of the filters of `add_filter_options`; and of any `mark`."""
+
+        terms = [build_query(self.options)]
+        if mark and mark.since:
+            terms.append("modifiedTime > " + quote(mark.since))
+        return " and ".join(x for x in terms if x)
+
+    def filter_items(self, items: Iterable[dict[str, Any]]) -> Iterable[dict[str, Any]]:
+        """Return `items` filtered by any `--min-size`, which the drive can't search.
+
+        Folders, which have no size, are not filtered.
+        """
+
+        if not self.options.min_size:
+            return items
+
+        is_folder = self.cli.api.is_folder
+        return (
+            x for x in items if is_folder(x) or int(x.get("size", 0)) >= self.options.min_size
+        )
+
+    def add_human_readable_option(self, parser: Parser) -> None:
+        """Add `--human-readable` to the given `parser`."""
+
+        parser.add_argument(
+            "-k",
+            "--human-readable",
+            action="store_true",
+            help="print sizes in powers of 1024; e.g., `1.5M`",
+        )
+
     def add_long_listing_option(self, parser: Parser) -> None:
         """Add `--long-listing` to the given `parser`."""
 
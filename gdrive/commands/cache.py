@@ -0,0 +1,76 @@
+"""Drive `cache` command module."""
+
+import time
+
+from gdrive.commands import GoogleDriveCmd
+from gdrive.units import format_size
+
+
+class DriveCacheCmd(GoogleDriveCmd):
+    """Drive `cache` command class."""
+
+    def init_command(self) -> None:
+        """Initialize drive `cache` command."""
+
+        parser = self.add_subcommand_parser(
+            "cache",
+            help="inspect or clear the cache of downloaded content",
+            description="cache.description",
+        )
+
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument(
+            "--list",
+            action="store_true",
+            help="list cached files, least recently used first",
+        )
+        group.add_argument(
+            "--clear",
+            action="store_true",
+            help="remove all cached files",
+        )
+        group.add_argument(
+            "--evict",
+            action="store_true",
+            help="remove least recently used files to fit `--cache-size`",
+        )
+
+        self.add_human_readable_option(parser)
+
+    def run(self) -> None:
+        """Run drive `cache` command."""
+
+        cache = self.cli.api.cache
+        human = self.options.human_readable
+
+        if self.options.clear:
+            print("removed " + format_size(cache.clear(), human))
+            return
+
+        if self.options.evict:
+            print("removed " + format_size(cache.evict(), human))
+            return
+
+        entries = sorted(cache.entries(), key=lambda _: _[1].st_mtime)
+
+        if self.options.list:
+            for _, stats, info in entries:
+                print(
+                    str.format(
+                        "{:>10s} {:s} {:s}",
+                        format_size(stats.st_size, human),
+                        time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(stats.st_mtime)),
+                        info.get("PATH") or "?",
+                    )
+                )
+            return
+
+        print(
+            str.format(
+                "{:s}: {:d} files, {:s} of {:s}",
+                str(cache.directory),
+                len(entries),
+                format_size(sum(x[1].st_size for x in entries), human),
+                format_size(cache.max_bytes, human),
+            )
+        )
@@ -0,0 +1,37 @@
+"""Drive `cat` command module."""
+
+import sys
+
+from gdrive.commands import GoogleDriveCmd
+
+
+class DriveCatCmd(GoogleDriveCmd):
+    """Drive `cat` command class."""
+
+    def init_command(self) -> None:
+        """Initialize drive `cat` command."""
+
+        parser = self.add_subcommand_parser(
+            "cat",
+            help="write the content of files to standard output",
+            description="cat.description",
+        )
+
+        parser.add_argument(
+            "path",
+            metavar="PATH",
+            nargs="+",
+            help="file to write",
+        )
+
+    def run(self) -> None:
+        """Run drive `cat` command.
+
+        Content is streamed to `stdout` a chunk at a time, without temporary files.
+        """
+
+        sys.stdout.flush()
+        for path in self.options.path:
+            for item in self.cli.api.get_files(path):
+                self.cli.api.download_to(item, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
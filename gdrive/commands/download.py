@@ -17,6 +17,21 @@ class DriveDownloadCmd(GoogleDriveCmd):
             description="download.description",
         )
 
+        self.add_no_action_option(parser, "don't download anything")
+
+        parser.add_argument(
+            "--no-cache",
+            dest="cache",
+            action="store_false",
+            help="don't use or update the cache of downloaded content",
+        )
+
+        parser.add_argument(
+            "--hardlink",
+            action="store_true",
+            help="link cached content, rather than copy it; (don't modify the result)",
+        )
+
         parser.add_argument(
             "file",
             metavar="FILE",
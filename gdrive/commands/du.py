@@ -0,0 +1,96 @@
+"""Drive `du` command module."""
+
+import os
+
+from loguru import logger
+
+from gdrive.commands import GoogleDriveCmd
+from gdrive.units import format_size
+
+
+class DriveDuCmd(GoogleDriveCmd):
+    """Drive `du` command class."""
+
+    def init_command(self) -> None:
+        """Initialize drive `du` command."""
+
+        parser = self.add_subcommand_parser(
+            "du",
+            help="summarize space used by folders",
+            description="du.description",
+        )
+
+        parser.add_argument(
+            "--apparent-size",
+            action="store_true",
+            help="print `size` rather than `quotaBytesUsed`",
+        )
+
+        parser.add_argument(
+            "-d",
+            "--max-depth",
+            type=int,
+            metavar="N",
+            help="print totals for folders no more than `N` levels below `PATH`",
+        )
+
+        parser.add_argument(
+            "--sort",
+            choices=["path", "size", "count"],
+            default="path",
+            help="order of output (default: `%(default)s`)",
+        )
+
+        self.add_human_readable_option(parser)
+        self.add_limit_option(parser)
+
+        parser.add_argument(
+            "path",
+            metavar="PATH",
+            nargs="?",
+            default="/",
+            help="folder to summarize (default: `%(default)s`)",
+        )
+
+    def run(self) -> None:
+        """Run drive `du` command."""
+
+        api = self.cli.api
+        top = api.get_folder(self.options.path)
+        if not top:
+            logger.error("FileNotFoundError {!r}", self.options.path)
+            return
+
+        usage = api.folder_usage()
+        key = "size" if self.options.apparent_size else "quotaBytesUsed"
+        top_depth = top["PATH"].count(os.path.sep)
+        prefix = top["PATH"] + os.path.sep
+
+        folders = [
+            x
+            for x in api.all_folders
+            if (x is top or x["PATH"].startswith(prefix))
+            and (
+                self.options.max_depth is None
+                or x["PATH"].count(os.path.sep) - top_depth <= self.options.max_depth
+            )
+        ]
+
+        if self.options.sort == "size":
+            folders.sort(key=lambda _: -usage[_["id"]][key])
+        elif self.options.sort == "count":
+            folders.sort(key=lambda _: -(usage[_["id"]]["files"] + usage[_["id"]]["folders"]))
+
+        for folder in folders:
+            if self.check_limit():
+                break
+
+            totals = usage[folder["id"]]
+            print(
+                str.format(
+                    "{:<10s} {:>8d} {:s}",
+                    format_size(totals[key], self.options.human_readable),
+                    totals["files"] + totals["folders"],
+                    folder["PATH"],
+                )
+            )
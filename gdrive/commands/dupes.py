@@ -0,0 +1,79 @@
+"""Drive `dupes` command module."""
+
+from gdrive.commands import GoogleDriveCmd
+from gdrive.units import format_size, parse_size
+
+
+class DriveDupesCmd(GoogleDriveCmd):
+    """Drive `dupes` command class."""
+
+    def init_command(self) -> None:
+        """Initialize drive `dupes` command."""
+
+        parser = self.add_subcommand_parser(
+            "dupes",
+            help="report files with duplicate content",
+            description="dupes.description",
+        )
+
+        parser.add_argument(
+            "--min-size",
+            type=parse_size,
+            default=1,
+            metavar="SIZE",
+            help="ignore files smaller than `SIZE`; e.g., `10M` (default: `1`)",
+        )
+
+        self.add_human_readable_option(parser)
+        self.add_limit_option(parser)
+
+    def run(self) -> None:
+        """Run drive `dupes` command.
+
+        Crawl all files once, grouping them by ``md5Checksum``, then print the
+        sets of duplicates, largest reclaimable number of bytes first. Only the
+        first copy of each content is kept until a second is seen; so memory is
+        proportional to the number of distinct contents (and of duplicates).
+        """
+
+        # md5Checksum -> (size, quotaBytesUsed, PATH) of the first copy.
+        firsts: dict[str, tuple[int, int, str]] = {}
+        # md5Checksum -> [(quotaBytesUsed, PATH), ...] of each content with copies.
+        groups: dict[str, list[tuple[int, str]]] = {}
+
+        for item in self.cli.api.iter_files():
+            md5 = item.get("md5Checksum")
+            if not md5:
+                continue  # google docs, shortcuts, etc.
+
+            size = int(item.get("size", 0))
+            if size < self.options.min_size:
+                continue
+
+            quota = int(item.get("quotaBytesUsed", size))
+            if md5 not in firsts:
+                firsts[md5] = (size, quota, item["PATH"])
+            else:
+                groups.setdefault(md5, [firsts[md5][1:]]).append((quota, item["PATH"]))
+
+        # Keeping the largest copy, the rest may be reclaimed.
+        dupes = [
+            (sum(x[0] for x in group) - max(x[0] for x in group), md5, group)
+            for md5, group in groups.items()
+        ]
+
+        for reclaimable, md5, group in sorted(dupes, key=lambda _: (-_[0], _[1])):
+            if self.check_limit():
+                break
+
+            print(
+                str.format(
+                    "{:>8s} reclaimable; {:d} copies of {:s} {:s}",
+                    format_size(reclaimable, self.options.human_readable),
+                    len(group),
+                    format_size(firsts[md5][0], self.options.human_readable),
+                    md5,
+                )
+            )
+            for _, path in sorted(group, key=lambda _: _[1].lower()):
+                print("    " + path)
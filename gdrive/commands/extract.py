@@ -0,0 +1,125 @@
+"""Drive `extract` command module."""
+
+import fnmatch
+import json
+import os
+from typing import Any
+
+from loguru import logger
+
+from gdrive.bundle import MANIFEST_SUFFIX, Bundle, coalesce, decode_segment, manifest_path
+from gdrive.commands import GoogleDriveCmd
+
+
+class DriveExtractCmd(GoogleDriveCmd):
+    """Drive `extract` command class."""
+
+    # Members no more than this many bytes apart are fetched by one request.
+    _MAX_GAP = 1 << 20
+
+    def init_command(self) -> None:
+        """Initialize drive `extract` command."""
+
+        parser = self.add_subcommand_parser(
+            "extract",
+            help="extract members of a bundle, from `uploaddir --bundle`",
+            description="extract.description",
+        )
+
+        parser.add_argument(
+            "-C",
+            "--directory",
+            default=".",
+            metavar="DIR",
+            help="extract into `DIR` (default: `%(default)s`)",
+        )
+
+        parser.add_argument(
+            "--list",
+            action="store_true",
+            help="list the members, rather than extract them",
+        )
+
+        parser.add_argument(
+            "bundle",
+            metavar="BUNDLE",
+            help="drive pathname of the bundle",
+        )
+
+        parser.add_argument(
+            "member",
+            metavar="MEMBER",
+            nargs="*",
+            help="extract only members matching these glob patterns",
+        )
+
+    def run(self) -> None:
+        """Run drive `extract` command.
+
+        Members are fetched by byte range, using the bundle's manifest; those
+        near each other, by one request.
+        """
+
+        api = self.cli.api
+        files = list(api.get_files(self.options.bundle))
+        if not files:
+            return
+        bundle = files[0]
+
+        manifest = self._manifest(bundle)
+        members = [
+            x
+            for x in Bundle.members_of(manifest)
+            if not self.options.member
+            or any(fnmatch.fnmatchcase(x["name"], p) for p in self.options.member)
+        ]
+
+        if self.options.list:
+            for member in members:
+                print(str.format("{:>12d} {:s}", member["size"], member["name"]))
+            return
+
+        nrequests = 0
+        for start, end, group in coalesce(members, self._MAX_GAP):
+            content = api.fetch_range(bundle, start, end)
+            nrequests += 1
+            for member in group:
+                offset = member["offset"] - start
+                segment = content[offset : offset + member["length"]]
+                self._write(member, *decode_segment(segment, manifest["compression"]))
+
+        print(f"extracted {len(members):d} members in {nrequests:d} requests")
+
+    def _manifest(self, bundle: dict[str, Any]) -> dict[str, Any]:
+        """Return the manifest of `bundle`; the local copy, if any, else from the drive."""
+
+        local = manifest_path(bundle["name"])
+        if local.exists():
+            manifest: dict[str, Any] = json.loads(local.read_bytes())
+            if manifest.get("id") == bundle["id"]:
+                return manifest
+
+        api = self.cli.api
+        for item in api.get_files(bundle["PATH"] + MANIFEST_SUFFIX):
+            with api.open_media(item) as fh:
+                manifest = json.load(fh)
+            if manifest.get("id") == bundle["id"]:
+                return manifest
+
+        self.parser.error(f"No manifest of {bundle['PATH']!r}")
+
+    def _write(self, member: dict[str, Any], info: Any, content: bytes) -> None:
+        """Write the `content` of `member`, with tar header `info`, under `--directory`."""
+
+        name = os.path.normpath(member["name"])
+        if os.path.isabs(name) or name.startswith(".."):
+            logger.error("Not extracting {!r}; outside of {!r}", name, self.options.directory)
+            return
+
+        pathname = os.path.join(self.options.directory, name)
+        os.makedirs(os.path.dirname(pathname) or ".", exist_ok=True)
+        with open(pathname, "wb") as fh:
+            fh.write(content)
+        os.chmod(pathname, info.mode)
+        os.utime(pathname, (info.mtime, info.mtime))
+        logger.info("Extracted {!r}", pathname)
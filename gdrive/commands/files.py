@@ -18,12 +18,33 @@ class DriveFilesCmd(GoogleDriveCmd):
         group = parser.add_mutually_exclusive_group()
         self.add_long_listing_option(group)
         self.add_pretty_print_option(group)
+        self.add_format_option(group)
+        self.add_fields_option(parser)
         self.add_limit_option(parser)
+        self.add_filter_options(parser)
+        self.add_since_option(parser)
 
     def run(self) -> None:
         """Run drive `files` command."""
 
-        for file in self.cli.api.all_files:
+        api = self.cli.api
+        mark = self.open_mark("files")
+        query = self.build_query(mark)
+        files = self.filter_items(
+            sorted(
+                api.iter_files(query, folder_index=mark is not None),
+                key=lambda _: _["PATH"].lower(),
+            )
+            if query
+            else api.all_files
+        )
+
+        if self.options.format:
+            self.write_items(files)
+            self.save_mark(mark)
+            return
+
+        for file in files:
             if self.check_limit():
                 break
 
@@ -42,3 +63,5 @@ class DriveFilesCmd(GoogleDriveCmd):
                 )
             else:
                 print(file["PATH"])
+
+        self.save_mark(mark)
@@ -0,0 +1,169 @@
+"""Drive `find` command module."""
+
+import fnmatch
+import os
+import re
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from gdrive.commands import GoogleDriveCmd
+from gdrive.query import parse_time
+from gdrive.units import parse_size
+
+
+class DriveFindCmd(GoogleDriveCmd):
+    """Drive `find` command class."""
+
+    def init_command(self) -> None:
+        """Initialize drive `find` command."""
+
+        parser = self.add_subcommand_parser(
+            "find",
+            help="search for files and folders in a local snapshot of the drive",
+            description="find.description",
+        )
+
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument("--name", metavar="GLOB", help="name matches shell pattern `GLOB`")
+        group.add_argument("--iname", metavar="GLOB", help="like `--name`, ignoring case")
+
+        parser.add_argument(
+            "--regex",
+            metavar="REGEX",
+            type=re.compile,
+            help="`PATH` contains a match of regular expression `REGEX`",
+        )
+        parser.add_argument(
+            "--mime",
+            metavar="GLOB",
+            help="mimeType matches shell pattern `GLOB`; e.g., `image/*`",
+        )
+        parser.add_argument(
+            "--type",
+            choices=["f", "d"],
+            help="files (`f`) or folders (`d`) only",
+        )
+        parser.add_argument(
+            "--newer",
+            metavar="TIME",
+            type=parse_time,
+            help="modified at or after `TIME`; a date-time, e.g., `2024-06-01` or "
+            "`2024-06-01T12:00` (local, unless it has an offset), or ago, e.g., `7d`",
+        )
+        parser.add_argument(
+            "--older",
+            metavar="TIME",
+            type=parse_time,
+            help="modified before `TIME`",
+        )
+        parser.add_argument(
+            "--min-size",
+            metavar="SIZE",
+            type=parse_size,
+            help="size is at least `SIZE`; e.g., `10M`",
+        )
+        parser.add_argument(
+            "--max-size",
+            metavar="SIZE",
+            type=parse_size,
+            help="size is at most `SIZE`",
+        )
+        parser.add_argument(
+            "--refresh",
+            action="store_true",
+            help="crawl the drive to refresh the snapshot before searching",
+        )
+
+        group = parser.add_mutually_exclusive_group()
+        self.add_format_option(group)
+        self.add_fields_option(parser)
+        self.add_limit_option(parser)
+
+        parser.add_argument(
+            "path",
+            metavar="PATH",
+            nargs="?",
+            default="/",
+            help="folder to search (default: `%(default)s`)",
+        )
+
+    def run(self) -> None:
+        """Run drive `find` command.
+
+        Search the snapshot cached by the last `find --refresh` (or the first `find`),
+        without touching the network.
+        """
+
+        index = self.cli.api.get_index(self.options.refresh)
+        path = index.normalize_path(self.options.path)
+
+        pattern = self.options.name or self.options.iname
+        fragments = index.glob_fragments(pattern) if pattern else None
+        items = index.find(path, self._predicate(), fragments)
+
+        if self.options.format:
+            self.write_items(items)
+            return
+
+        for item in items:
+            if self.check_limit():
+                break
+            filename = item["PATH"]
+            if self.cli.api.is_folder(item):
+                filename += os.path.sep
+            print(filename)
+
+    def _predicate(self) -> Callable[[dict[str, Any]], bool]:
+        """Return function to test an item against the command line options."""
+
+        options = self.options
+        is_folder = self.cli.api.is_folder
+        newer = self._utc(options.newer) if options.newer else None
+        older = self._utc(options.older) if options.older else None
+
+        # Too many returns; one per predicate, cheapest first.
+        def _predicate(item: dict[str, Any]) -> bool:  # noqa: PLR0911
+            if options.name and not fnmatch.fnmatchcase(item["name"], options.name):
+                return False
+            if options.iname and not fnmatch.fnmatchcase(
+                item["name"].lower(), options.iname.lower()
+            ):
+                return False
+            if options.regex and not options.regex.search(item["PATH"]):
+                return False
+            if options.mime and not fnmatch.fnmatchcase(item["mimeType"], options.mime):
+                return False
+            if options.type and (options.type == "d") != is_folder(item):
+                return False
+            if newer or older:
+                # e.g., `Shared with me` has no (valid) modifiedTime; it can't match.
+                modified = self._utc(item.get("modifiedTime", ""))
+                if not modified:
+                    return False
+                if newer and modified < newer:
+                    return False
+                if older and modified >= older:
+                    return False
+            if options.min_size is not None or options.max_size is not None:
+                size = int(item.get("size", 0))
+                if options.min_size is not None and size < options.min_size:
+                    return False
+                if options.max_size is not None and size > options.max_size:
+                    return False
+            return True
+
+        return _predicate
+
+    @staticmethod
+    def _utc(text: str) -> datetime | None:
+        """Return RFC 3339 time `text`; (UTC, if it has no offset, like `parse_time`'s).
+
+        Return None if `text` isn't a time.
+        """
+
+        try:
+            when = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        return when if when.tzinfo else when.replace(tzinfo=timezone.utc)
@@ -18,12 +18,21 @@ class DriveFoldersCmd(GoogleDriveCmd):
         group = parser.add_mutually_exclusive_group()
         self.add_long_listing_option(group)
         self.add_pretty_print_option(group)
+        self.add_format_option(group)
+        self.add_fields_option(parser)
         self.add_limit_option(parser)
+        self.add_filter_options(parser)
 
     def run(self) -> None:
         """Run drive `folders` command."""
 
-        for folder in self.cli.api.all_folders:
+        folders = self.filter_items(self.cli.api.iter_folders(self.build_query()))
+
+        if self.options.format:
+            self.write_items(folders)
+            return
+
+        for folder in folders:
             if self.check_limit():
                 break
 
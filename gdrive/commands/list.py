@@ -1,6 +1,8 @@
 """Drive `list` command module."""
 
 import os
+from collections.abc import Iterable
+from typing import Any
 
 from gdrive.commands import GoogleDriveCmd
 
@@ -21,6 +23,8 @@ class DriveListCmd(GoogleDriveCmd):
         group.add_argument("-t", "--time", action="store_true", help="use a time listing format")
         self.add_long_listing_option(group)
         self.add_pretty_print_option(group)
+        self.add_format_option(group)
+        self.add_fields_option(parser)
 
         group = parser.add_mutually_exclusive_group()
         group.add_argument("-f", "--files-only", action="store_true", help="show files only")
@@ -34,6 +38,8 @@ class DriveListCmd(GoogleDriveCmd):
         )
 
         self.add_limit_option(parser)
+        self.add_filter_options(parser)
+        self.add_since_option(parser)
 
         parser.add_argument(
             "path",
@@ -49,14 +55,39 @@ class DriveListCmd(GoogleDriveCmd):
         If path refers to a file, the file is listed;
         (note: there may be multiple files in a folder with the same name).
         If path refers to a folder, the folder's contents are listed.
+        Filters apply to the contents; recursing, all sub-folders are searched.
+        But, recursing `--since` a time, the drive is searched once for files
+        modified since, and those beneath `PATH` are listed.
         """
 
-        for item in self.cli.api.list(
-            self.options.path,
-            self.options.files_only,
-            self.options.folders_only,
-            self.options.recursive,
-        ):
+        api = self.cli.api
+        options = self.options
+        path = api.normalize_path(options.path)
+        mark = self.open_mark("list {}{}".format(path, " -R" if options.recursive else ""))
+        query = self.build_query(mark)
+
+        if mark and mark.since and options.recursive and not options.folders_only:
+            prefix = os.path.join(path, "")
+            items: Iterable[dict[str, Any]] = sorted(
+                (
+                    x
+                    for x in api.iter_files(query, folder_index=True)
+                    if x["PATH"].startswith(prefix)
+                ),
+                key=lambda _: _["PATH"].lower(),
+            )
+        else:
+            items = api.list(
+                path, options.files_only, options.folders_only, options.recursive, query
+            )
+        items = self.filter_items(items)
+
+        if self.options.format:
+            self.write_items(items)
+            self.save_mark(mark)
+            return
+
+        for item in items:
             if self.check_limit():
                 break
 
@@ -83,3 +114,5 @@ class DriveListCmd(GoogleDriveCmd):
                 )
             else:
                 print(filename)
+
+        self.save_mark(mark)
@@ -0,0 +1,72 @@
+"""Drive `mirror` command module."""
+
+from loguru import logger
+
+from gdrive.commands import GoogleDriveCmd
+from gdrive.mirror import Mirror
+
+
+class DriveMirrorCmd(GoogleDriveCmd):
+    """Drive `mirror` command class."""
+
+    def init_command(self) -> None:
+        """Initialize drive `mirror` command."""
+
+        parser = self.add_subcommand_parser(
+            "mirror",
+            help="two-way sync of a local folder and a drive folder",
+            description="mirror.description",
+        )
+
+        self.add_no_action_option(parser, "print the plan, but don't apply it")
+
+        self.add_jobs_option(parser)
+
+        parser.add_argument(
+            "local",
+            metavar="LOCAL",
+            help="local folder",
+        )
+
+        parser.add_argument(
+            "remote",
+            metavar="REMOTE",
+            help="drive folder",
+        )
+
+    def run(self) -> None:
+        """Run drive `mirror` command.
+
+        Changes since the last `mirror` of the same `LOCAL` and `REMOTE`
+        (including deletions and moves) are propagated to the other side.
+        """
+
+        mirror = Mirror(self.cli.api, self.options, self.options.local, self.options.remote)
+        actions = mirror.plan()
+
+        if self.options.no_action:
+            for action in actions:
+                if action["op"] in ("record", "forget"):
+                    continue
+                if "from" in action:
+                    print(
+                        str.format(
+                            "{:<14s} {:s} -> {:s}", action["op"], action["from"], action["path"]
+                        )
+                    )
+                elif "conflict" in action:
+                    print(
+                        str.format(
+                            "{:<14s} {:s}; keeping the other as {:s}",
+                            action["op"],
+                            action["path"],
+                            action["conflict"],
+                        )
+                    )
+                else:
+                    print(str.format("{:<14s} {:s}", action["op"], action["path"]))
+            return
+
+        failures = mirror.apply(actions, self.options.jobs, self.options.large_jobs)
+        if failures:
+            logger.error("{} of {} actions failed", failures, len(actions))
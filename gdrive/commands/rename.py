@@ -15,6 +15,8 @@ class DriveRenameCmd(GoogleDriveCmd):
             description="rename.description",
         )
 
+        self.add_no_action_option(parser, "don't rename anything")
+
         parser.add_argument(
             "src",
             help="file to rename",
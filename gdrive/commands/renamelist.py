@@ -2,12 +2,17 @@
 
 import json
 
+from loguru import logger
+
 from gdrive.commands import GoogleDriveCmd
 
 
 class DriveRenamelistCmd(GoogleDriveCmd):
     """Drive `renamelist` command class."""
 
+    # Renames per call to `rename_many`, and per sync of the journal.
+    _CHUNK_SIZE = 1000
+
     def init_command(self) -> None:
         """Initialize drive `renamelist` command."""
 
@@ -17,6 +22,9 @@ class DriveRenamelistCmd(GoogleDriveCmd):
             description="renamelist.description",
         )
 
+        self.add_no_action_option(parser, "don't rename anything")
+        self.add_restart_option(parser)
+
         parser.add_argument(
             "listfile",
             help="file with list of renames",
@@ -29,8 +37,12 @@ class DriveRenamelistCmd(GoogleDriveCmd):
         oldrootlen = len(oldroot)
         newroot = "/Ginger-PC/"
 
+        journal = self.open_journal()
+
+        renames = []
+        in_doubt = set()
         with open(self.options.listfile, encoding="utf-8") as file:
-            for raw_line in file:
+            for lineno, raw_line in enumerate(file, 1):
                 line = raw_line.strip()
                 if not line:
                     break
@@ -45,4 +57,32 @@ class DriveRenamelistCmd(GoogleDriveCmd):
                 assert target.startswith(oldroot)
                 target = newroot + target[oldrootlen:]
 
-                self.cli.api.rename(self.options, src, target)
+                # skip renames completed by a previous run; those interrupted may be done.
+                key = src + " -> " + target
+                if journal.is_done(key):
+                    logger.debug("Skipping line {} {!r}; done", lineno, key)
+                    continue
+                renames.append((key, src, target))
+                if journal.state(key) == "pending":
+                    in_doubt.add((src, target))
+
+        results = []
+        with journal:
+            for start in range(0, len(renames), self._CHUNK_SIZE):
+                chunk = renames[start : start + self._CHUNK_SIZE]
+                for key, _, _ in chunk:
+                    journal.record(key, "pending")
+                journal.sync()
+
+                chunk_results = self.cli.api.rename_many(
+                    self.options, [x[1:] for x in chunk], in_doubt
+                )
+                for (key, _, _), result in zip(chunk, chunk_results, strict=True):
+                    if "error" in result:
+                        journal.record(key, "failed", error=result["error"])
+                    elif not self.options.no_action:
+                        journal.record(key, "done", id=result["id"])
+                journal.sync()
+                results += chunk_results
+
+        self.print_batch_summary("renamed", results)
@@ -0,0 +1,44 @@
+"""Drive `trash` command module."""
+
+from gdrive.commands import GoogleDriveCmd
+
+
+class DriveTrashCmd(GoogleDriveCmd):
+    """Drive `trash` command class."""
+
+    def init_command(self) -> None:
+        """Initialize drive `trash` command."""
+
+        parser = self.add_subcommand_parser(
+            "trash",
+            help="move files and folders to the trash",
+            description="trash.description",
+        )
+
+        self.add_no_action_option(parser, "don't trash anything")
+
+        parser.add_argument(
+            "--listfile",
+            help="file with list of paths to trash, one per line",
+        )
+
+        parser.add_argument(
+            "path",
+            metavar="PATH",
+            nargs="*",
+            help="file or folder to trash",
+        )
+
+    def run(self) -> None:
+        """Run drive `trash` command."""
+
+        paths = list(self.options.path)
+        if self.options.listfile:
+            with open(self.options.listfile, encoding="utf-8") as file:
+                paths.extend(x for line in file if (x := line.rstrip("\n")))
+
+        if not paths:
+            self.parser.error("Missing PATH or --listfile")
+
+        results = self.cli.api.trash_many(self.options, paths)
+        self.print_batch_summary("trashed", results)
@@ -1,13 +1,34 @@
 """Drive `uploaddir` command module."""
 
+import io
+import json
+import os
+import time
+from collections.abc import Iterable, Iterator
+from functools import partial
+from operator import itemgetter
+
 from libfile import File
 
+from gdrive.bundle import MANIFEST_SUFFIX, Bundle, IterStream, manifest_path, zstd
 from gdrive.commands import GoogleDriveCmd
+from gdrive.lanes import Lanes
+from gdrive.pipeline import Pipeline
+from gdrive.units import format_size, parse_size
 
 
 class DriveUploaddirCmd(GoogleDriveCmd):
     """Drive `uploaddir` command class."""
 
+    # Files whose target folders are resolved (and created) together.
+    _FOLDERS_BATCH = 1000
+
+    # With `--bundle`, files no larger than this are bundled.
+    _BUNDLE_FILE_SIZE = 1 << 20
+
+    # Bundles are streamed to the drive in resumable chunks of up to this size.
+    _BUNDLE_CHUNKSIZE = 8 << 20
+
     def init_command(self) -> None:
         """Initialize drive `uploaddir` command."""
 
@@ -39,11 +60,38 @@ class DriveUploaddirCmd(GoogleDriveCmd):
 
         parser.set_defaults(convert=True)
 
+        self.add_dedupe_option(parser)
+        self.add_no_action_option(parser, "don't create or upload anything")
+        self.add_jobs_option(parser)
+
         parser.add_argument(
             "--target-folder",
             help="root of destination tree",
         )
 
+        parser.add_argument(
+            "--bundle",
+            action="store_true",
+            help="pack files of up to {}B into tar bundles, each with a manifest of the "
+            "offset of each member, rather than upload each; see `extract`".format(
+                format_size(self._BUNDLE_FILE_SIZE)
+            ),
+        )
+
+        parser.add_argument(
+            "--bundle-size",
+            type=parse_size,
+            default="256M",
+            metavar="SIZE",
+            help="pack no more than `SIZE` bytes into each bundle (default: `%(default)s`)",
+        )
+
+        parser.add_argument(
+            "--zstd",
+            action="store_true",
+            help="compress bundles with zstd; (requires `zstandard`)",
+        )
+
         parser.add_argument(
             "path",
             metavar="PATH",
@@ -52,7 +100,157 @@ class DriveUploaddirCmd(GoogleDriveCmd):
         )
 
     def run(self) -> None:
-        """Run drive `uploaddir` command."""
+        """Run drive `uploaddir` command.
+
+        Walk, classify, resolve target folders and transfer, as a pipeline; so
+        neither the disk nor the network waits for the other. With `--bundle`,
+        the walk is done first, to set aside (and name) the small files.
+        """
+
+        api = self.cli.api
+        options = self.options
+
+        if options.zstd:
+            if not options.bundle:
+                self.parser.error("--zstd requires --bundle")
+            try:
+                zstd()
+            except RuntimeError as e:
+                self.parser.error(str(e))
+
+        # crawl once, up front, rather than racing to in the workers.
+        _ = api.all_folders
+        if options.dedupe:
+            _ = api.items_by_md5
+
+        # many concurrent requests for small files; a few resumable streams for large.
+        lanes = Lanes(itemgetter("size"), options.jobs, options.large_jobs)
+
+        # with `--bundle`, small files are set aside, and bundled after the rest are
+        # uploaded; they're named first, so a collision fails before any upload.
+        files: Iterable[File] = File.walk(options.path)
+        bundled: list[str] = []
+        if options.bundle:
+            unbundled: list[File] = []
+            for file in files:
+                if os.path.getsize(file.pathname) <= self._BUNDLE_FILE_SIZE:
+                    bundled.append(file.pathname)
+                else:
+                    unbundled.append(file)
+            files = unbundled
+        arcnames = self._arcnames(bundled)
+
+        pipeline = (
+            Pipeline(iter(files))
+            .add_stage("classify", partial(api.classify_upload, options), options.jobs)
+            .add_batch_stage(
+                "folders", partial(api.resolve_upload_folders, options), self._FOLDERS_BATCH
+            )
+            .add_lanes_stage(
+                "transfer",
+                lanes.timed(partial(api.transfer_upload, options)),
+                lanes.workers,
+                lanes.route,
+            )
+        )
+        for _ in pipeline.run():
+            pass
+
+        if bundled:
+            self._upload_bundles(bundled, arcnames)
+
+        self.print_upload_summary()
+        for line in lanes.summary():
+            print(line)
+
+    def _upload_bundles(self, pathnames: list[str], arcnames: dict[str, str]) -> None:
+        """Upload `pathnames` in tar bundles, each with a manifest; to the target folder.
+
+        Each is a member named per `arcnames`, of `_arcnames`. Each bundle is
+        streamed to the drive as it is packed; then its manifest is saved
+        locally, and uploaded beside it. The members are counted as uploaded
+        files. With `--no-action`, the files that would be bundled are printed.
+        """
+
+        api = self.cli.api
+        options = self.options
+        folder_path = api.normalize_path(options.target_folder or api.root_folder["PATH"])
+        compression = "zstd" if options.zstd else None
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+
+        for n, group in enumerate(self._plan_bundles(pathnames), 1):
+            bundle = Bundle(
+                "bundle-{}-{:04d}.tar{}".format(stamp, n, ".zst" if compression else ""),
+                compression,
+            )
+            path = os.path.join(folder_path, bundle.name)
+            if options.no_action:
+                print(f"would bundle {len(group):d} files -> {path}")
+                for pathname in group:
+                    print(f"    {pathname} as {arcnames[pathname]}")
+                continue
+
+            response = api.upload_stream(
+                options,
+                IterStream(bundle.segments((x, arcnames[x]) for x in group)),
+                path,
+                self._BUNDLE_CHUNKSIZE,
+                "application/zstd" if compression else "application/x-tar",
+            )
+
+            manifest = bundle.manifest() | {"id": response["id"]}
+            content = json.dumps(manifest, separators=(",", ":")).encode()
+            local = manifest_path(bundle.name)
+            local.parent.mkdir(parents=True, exist_ok=True)
+            local.write_bytes(content)
+            api.upload_stream(
+                options,
+                io.BytesIO(content),
+                path + MANIFEST_SUFFIX,
+                self._BUNDLE_CHUNKSIZE,
+                "application/json",
+            )
+            api.count_uploads(len(group), sum(os.path.getsize(x) for x in group))
+            print(f"bundled {len(group):d} files ({bundle.offset:d} bytes) -> {path}")
+
+    def _plan_bundles(self, pathnames: list[str]) -> Iterator[list[str]]:
+        """Generate groups of `pathnames`, of no more than `--bundle-size` bytes each."""
+
+        group: list[str] = []
+        nbytes = 0
+        for pathname in pathnames:
+            size = os.path.getsize(pathname)
+            if group and nbytes + size > self.options.bundle_size:
+                yield group
+                group, nbytes = [], 0
+            group.append(pathname)
+            nbytes += size
+        if group:
+            yield group
+
+    def _arcnames(self, pathnames: list[str]) -> dict[str, str]:
+        """Return map of each of `pathnames` to its member name; fail if any two collide.
+
+        A member is named by its path relative to the folder containing the
+        `PATH` it was found in; e.g., ``x/a`` of ``../x/a``, found in ``../x``.
+        """
+
+        roots = sorted((os.path.abspath(x) for x in self.options.path), key=len, reverse=True)
+
+        arcnames: dict[str, str] = {}
+        pathnames_by_arcname: dict[str, str] = {}
+        for pathname in pathnames:
+            abspath = os.path.abspath(pathname)
+            root = next(
+                (x for x in roots if abspath == x or abspath.startswith(x + os.sep)), abspath
+            )
+            arcname = os.path.relpath(abspath, os.path.dirname(root)).replace(os.sep, "/")
+
+            other = pathnames_by_arcname.setdefault(arcname, pathname)
+            if other != pathname:
+                self.parser.error(
+                    f"Can't bundle both {other!r} and {pathname!r} as member {arcname!r}"
+                )
+            arcnames[pathname] = arcname
 
-        for file in File.walk(self.options.path):
-            self.cli.api.upload(self.options, file)
+        return arcnames
@@ -39,6 +39,9 @@ class DriveUploadfileCmd(GoogleDriveCmd):
 
         parser.set_defaults(convert=True)
 
+        self.add_dedupe_option(parser)
+        self.add_no_action_option(parser, "don't create or upload anything")
+
         parser.add_argument(
             "path",
             metavar="PATH",
@@ -63,3 +66,5 @@ class DriveUploadfileCmd(GoogleDriveCmd):
 
         for file in File.walk(self.options.path):
             self.cli.api.upload(self.options, file)
+
+        self.print_upload_summary()
@@ -4,8 +4,10 @@ import json
 import os
 
 from libfile import File
+from loguru import logger
 
 from gdrive.commands import GoogleDriveCmd
+from gdrive.journal import Journal
 
 
 class DriveUploadlistCmd(GoogleDriveCmd):
@@ -48,6 +50,10 @@ class DriveUploadlistCmd(GoogleDriveCmd):
 
         parser.set_defaults(convert=True)
 
+        self.add_dedupe_option(parser)
+        self.add_no_action_option(parser, "don't create or upload anything")
+        self.add_restart_option(parser)
+
         parser.add_argument(
             "--target-folder",
             help="destination folder",
@@ -64,8 +70,12 @@ class DriveUploadlistCmd(GoogleDriveCmd):
         oldroot = "/home/rlane/ext/Ginger/"
         newroot = "/My Drive/Ginger-PC/"
 
+        journal = self.open_journal()
+
+        uploads = []
+        keys = set()
         with open(self.options.listfile, encoding="utf-8") as file:
-            for raw_line in file:
+            for lineno, raw_line in enumerate(file, 1):
                 line = raw_line.strip()
                 if not line:
                     break
@@ -80,10 +90,43 @@ class DriveUploadlistCmd(GoogleDriveCmd):
                 assert target.startswith(newroot)
                 # target = newroot + target[oldrootlen:]
 
-                self.options.target_folder = os.path.dirname(target)
+                # skip uploads completed by a previous run, or listed already.
+                if journal.is_done(target) or target in keys:
+                    logger.debug("Skipping line {} {!r}; done", lineno, target)
+                    continue
+                keys.add(target)
+                uploads.append((target, src, os.path.dirname(target)))
+
+        # create the whole folder tree before uploading any files.
+        self.cli.api.create_folders(self.options, {x[2] for x in uploads})
+
+        with journal:
+            for key, src, target_folder in uploads:
+                self.options.target_folder = target_folder
 
                 upload_file = File(src)
 
                 # logger.error('src {!r} target_folder {!r}', file, self.options.target_folder)
 
-                self.cli.api.upload(self.options, upload_file)
+                self._upload(journal, key, upload_file)
+
+        self.print_upload_summary()
+
+    def _upload(self, journal: Journal, key: str, file: File) -> None:
+        """Upload `file`, operation `key` (its target) of the list; recording its progress in `journal`."""
+
+        api = self.cli.api
+
+        # an upload interrupted after it completed, but before it was recorded?
+        if journal.state(key) == "pending" and (response := api.find_upload(self.options, file)):
+            logger.info("Already uploaded {!r}", response["PATH"])
+            journal.record(key, "done", id=response["id"])
+            return
+
+        journal.record(key, "pending")
+        response = api.upload(self.options, file)
+        if "ERROR" in response:
+            journal.record(key, "failed", error=response["ERROR"])
+        else:
+            journal.record(key, "done", id=response.get("id") or response.get("DEDUPED"))
+        journal.sync()
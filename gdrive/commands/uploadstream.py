@@ -0,0 +1,71 @@
+"""Drive `uploadstream` command module."""
+
+import sys
+
+from gdrive.commands import GoogleDriveCmd
+from gdrive.media import CHUNK_MULTIPLE
+from gdrive.units import parse_size
+
+
+class DriveUploadstreamCmd(GoogleDriveCmd):
+    """Drive `uploadstream` command class."""
+
+    def init_command(self) -> None:
+        """Initialize drive `uploadstream` command."""
+
+        parser = self.add_subcommand_parser(
+            "uploadstream",
+            help="upload standard input, or any stream, to a new file",
+            description="uploadstream.description",
+        )
+
+        parser.add_argument(
+            "--chunksize",
+            type=parse_size,
+            default="8M",
+            metavar="SIZE",
+            help="send `SIZE` bytes per request; a multiple of `256K` (default: `%(default)s`)",
+        )
+
+        parser.add_argument(
+            "--mimetype",
+            default="application/octet-stream",
+            help="mimetype of the content (default: `%(default)s`)",
+        )
+
+        self.add_no_action_option(parser, "don't upload anything")
+
+        parser.add_argument(
+            "source",
+            metavar="SOURCE",
+            help="`-` for standard input, or a pipe or file",
+        )
+
+        parser.add_argument(
+            "target",
+            metavar="TARGET",
+            help="drive pathname of the new file",
+        )
+
+    def run(self) -> None:
+        """Run drive `uploadstream` command.
+
+        Memory is bounded by `--chunksize`; nothing is staged on local disk.
+        """
+
+        if self.options.chunksize % CHUNK_MULTIPLE:
+            self.parser.error("--chunksize must be a multiple of 256K")
+
+        if self.options.source == "-":
+            self._upload(sys.stdin.buffer)
+        else:
+            with open(self.options.source, "rb") as stream:
+                self._upload(stream)
+
+    def _upload(self, stream: object) -> None:
+        """Upload `stream` to `TARGET`."""
+
+        response = self.cli.api.upload_stream(
+            self.options, stream, self.options.target, self.options.chunksize
+        )
+        print(response["PATH"])
@@ -0,0 +1,261 @@
+"""Drive `watch` command module."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Any
+
+import xdg
+from loguru import logger
+
+from gdrive.commands import GoogleDriveCmd
+
+# id -> (name, parent-id, mimeType) of an item.
+Known = dict[str, tuple[str, str | None, str]]
+
+
+class WatchState:
+    """Database of the position of a `watch` in the change log, and the items known as of it.
+
+    It's saved incrementally; each page of changes updates only the items it
+    changed, and the position, in one transaction.
+    """
+
+    def __init__(self, account: str, path: str) -> None:
+        """Open (or create) the database of `account` watching `path`."""
+
+        digest = hashlib.sha1((account + "\0" + path).encode()).hexdigest()[:16]
+        self.path = xdg.xdg_data_home() / "gdrive" / "watch" / f"{digest}.db"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        logger.debug("Opening watch state {!r}", str(self.path))
+        self.db = sqlite3.connect(self.path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS items"
+            " (id TEXT PRIMARY KEY, name TEXT, parent TEXT, mime TEXT)"
+        )
+        self.db.execute("CREATE TABLE IF NOT EXISTS tops (id TEXT PRIMARY KEY, path TEXT)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS position (token TEXT)")
+
+    def load(self) -> tuple[str | None, Known, dict[str, str]]:
+        """Return the saved page token, or None; the known items; and the top-level PATHs."""
+
+        row = self.db.execute("SELECT token FROM position").fetchone()
+        if not row:
+            return None, {}, {}
+
+        known = {
+            row[0]: (row[1], row[2], row[3])
+            for row in self.db.execute("SELECT id, name, parent, mime FROM items")
+        }
+        paths = dict(self.db.execute("SELECT id, path FROM tops"))
+        return str(row[0]), known, paths
+
+    def reset(self, known: Known, paths: dict[str, str]) -> None:
+        """Replace all the known items, and top-level PATHs."""
+
+        self.db.execute("DELETE FROM items")
+        self.db.execute("DELETE FROM tops")
+        self.db.executemany(
+            "INSERT INTO items VALUES (?, ?, ?, ?)", ((k, *v) for k, v in known.items())
+        )
+        self.db.executemany("INSERT INTO tops VALUES (?, ?)", paths.items())
+
+    def update(self, known: Known, ids: set[str]) -> None:
+        """Save the items `ids` as now `known`; or delete those no longer known."""
+
+        for item_id in ids:
+            if item_id in known:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?)",
+                    (item_id, *known[item_id]),
+                )
+            else:
+                self.db.execute("DELETE FROM items WHERE id = ?", (item_id,))
+
+    def commit(self, token: str) -> None:
+        """Save page `token`, and commit it with the changes to the items as of it."""
+
+        logger.trace("Saving page token {!r} to {!r}", token, str(self.path))
+        self.db.execute("DELETE FROM position")
+        self.db.execute("INSERT INTO position VALUES (?)", (token,))
+        self.db.commit()
+
+
+class DriveWatchCmd(GoogleDriveCmd):
+    """Drive `watch` command class."""
+
+    def init_command(self) -> None:
+        """Initialize drive `watch` command."""
+
+        parser = self.add_subcommand_parser(
+            "watch",
+            help="stream changes to files and folders as json lines",
+            description="watch.description",
+        )
+
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=10.0,
+            metavar="SECONDS",
+            help="seconds between polls once caught up (default: `%(default)s`)",
+        )
+
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="exit when caught up, rather than polling",
+        )
+
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="forget the saved position; report only changes made from now on",
+        )
+
+        parser.add_argument(
+            "path",
+            metavar="PATH",
+            nargs="?",
+            default="/",
+            help="report only changes at or beneath `PATH` (default: everywhere)",
+        )
+
+    def run(self) -> None:
+        """Run drive `watch` command.
+
+        Emit one json object per change, with ``event`` one of ``add``, ``modify``,
+        ``move`` (with ``OLDPATH``) or ``trash``. The position in the change log,
+        and the items of the tree of known items it resolves PATHs with that each
+        page of events changed, are saved together (see `WatchState`) after the
+        page is written and flushed; so a restarted `watch` resumes where it left
+        off, without missing or repeating events.
+        """
+
+        api = self.cli.api
+        self.path = "" if self.options.path == "/" else api.normalize_path(self.options.path)
+
+        # every known item; folders are needed to resolve PATHs, and files to tell
+        # an `add` from a `modify` or a `move`.
+        self.known: Known = {}
+        # id -> PATH of each top-level folder.
+        self.paths: dict[str, str] = {}
+        # ids of the known items changed since the state was last saved.
+        self.changed: set[str] = set()
+
+        state = WatchState(api.about()["user"]["emailAddress"], self.path)
+        token = None
+        if not self.options.reset:
+            token, self.known, self.paths = state.load()
+        if not token:
+            # take the position first, then crawl; so no change between is missed.
+            token = api.get_start_page_token()
+            self._crawl()
+            state.reset(self.known, self.paths)
+            state.commit(token)
+
+        while True:
+            response = api.list_changes(token)
+            changes = response.get("changes", [])
+            for change in changes:
+                event = self._event(change)
+                if event:
+                    sys.stdout.write(json.dumps(event, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+
+            token = response.get("nextPageToken") or response["newStartPageToken"]
+            # a page without changes changes nothing to resume from.
+            if changes:
+                state.update(self.known, self.changed)
+                self.changed.clear()
+                state.commit(token)
+
+            if "nextPageToken" not in response:
+                if self.options.once:
+                    return
+                time.sleep(self.options.interval)
+
+    def _crawl(self) -> None:
+        """Set the tree of known items from a crawl of all folders and files."""
+
+        api = self.cli.api
+        for item in api.all_folders + api.all_files:
+            parents = item.get("parents")
+            self.known[item["id"]] = (
+                item["name"],
+                parents[0] if parents else None,
+                item["mimeType"],
+            )
+            if item.get("PARENT") is None:
+                self.paths[item["id"]] = item["PATH"]
+
+    def _event(self, change: dict[str, Any]) -> dict[str, Any] | None:
+        """Return event describing `change`, or None if it is outside of `PATH`.
+
+        Changes to shared drives themselves, rather than to items, are ignored.
+        """
+
+        file_id = change.get("fileId")
+        if change.get("changeType", "file") != "file" or not file_id:
+            return None
+
+        file = change.get("file") or {}
+        old = self.known.get(file_id)
+        oldpath = self._path_of(file_id) if old else None
+
+        event: dict[str, Any] = {"id": file_id, "time": change.get("time")}
+        self.changed.add(file_id)
+        if change.get("removed") or file.get("trashed"):
+            event["event"] = "trash"
+            self.known.pop(file_id, None)
+            path = oldpath
+        else:
+            parents = file.get("parents")
+            self.known[file_id] = (
+                file["name"],
+                parents[0] if parents else None,
+                file["mimeType"],
+            )
+            path = self._path_of(file_id)
+            if not old:
+                event["event"] = "add"
+            elif old[:2] != self.known[file_id][:2]:
+                event["event"] = "move"
+                event["OLDPATH"] = oldpath
+            else:
+                event["event"] = "modify"
+            event["mimeType"] = file["mimeType"]
+            event["modifiedTime"] = file.get("modifiedTime")
+
+        event["PATH"] = path
+        if not self._in_scope(path) and not self._in_scope(oldpath):
+            return None
+        return event
+
+    def _path_of(self, item_id: str) -> str | None:
+        """Return ``PATH`` of known item `item_id`, resolved through its known ancestors."""
+
+        names: list[str] = []
+        node_id: str | None = item_id
+        while node_id:
+            if node_id in self.paths:
+                return os.path.join(self.paths[node_id], *reversed(names))
+            node = self.known.get(node_id)
+            if not node:
+                return None  # an ancestor is not visible.
+            names.append(node[0])
+            node_id = node[1]
+
+        # no parents; like `all_files`, it's `Shared with me`.
+        return os.path.join(self.cli.api.shared_with_me_folder["PATH"], *reversed(names))
+
+    def _in_scope(self, path: str | None) -> bool:
+        """Return True if `path` is at or beneath `PATH`."""
+
+        if path is None:
+            return not self.path
+        return path == self.path or path.startswith(self.path + os.path.sep)
@@ -0,0 +1,227 @@
+"""Local, searchable snapshot of all Google Drive folders and files."""
+
+import bisect
+import json
+import os
+import re
+from collections.abc import Callable, Generator, Iterable
+from pathlib import Path
+from typing import Any
+
+import xdg
+from loguru import logger
+
+from gdrive.output import ItemWriter
+
+__all__ = ["DriveIndex"]
+
+DriveItem = dict[str, Any]
+
+# A name's tokens are its runs of letters and digits.
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Tokens are indexed by their n-grams of this length; (shorter tokens, by themselves).
+_GRAM = 3
+
+# Wildcards of `fnmatch` patterns; the literal text between them is indexable.
+_GLOB_WILDCARDS_RE = re.compile(r"\[[^\]]*\]|[*?]")
+
+
+class DriveIndex:
+    """Searchable snapshot of all folders and files.
+
+    Items are kept sorted by ``PATH`` (case-insensitive, like ``all_folders`` and
+    ``all_files``), so the items beneath any folder occupy one contiguous range,
+    found by bisection. An inverted index maps each lower-cased name token to the
+    (ascending) positions of the items having that token in their name; and an
+    n-gram index maps each trigram to the tokens containing it, so the tokens
+    containing a fragment of a name are looked up, not scanned for.
+    """
+
+    def __init__(self, items: Iterable[DriveItem]) -> None:
+        """Index `items`, which must each have a ``PATH``."""
+
+        self.items = sorted(items, key=lambda _: _["PATH"].lower())
+        self._keys = [x["PATH"].lower() for x in self.items]
+
+        self._postings: dict[str, list[int]] = {}
+        for pos, item in enumerate(self.items):
+            for token in set(_TOKEN_RE.findall(item["name"].lower())):
+                self._postings.setdefault(token, []).append(pos)
+
+        self._grams: dict[str, set[str]] = {}
+        for token in self._postings:
+            for gram in self._grams_of(token):
+                self._grams.setdefault(gram, set()).add(token)
+
+    @staticmethod
+    def _grams_of(text: str) -> set[str]:
+        """Return the n-grams of `text`; or `text` itself, if shorter."""
+
+        if len(text) < _GRAM:
+            return {text}
+        return {text[i : i + _GRAM] for i in range(len(text) - _GRAM + 1)}
+
+    def _tokens_containing(self, fragment: str) -> set[str]:
+        """Return the tokens containing `fragment`."""
+
+        if len(fragment) < _GRAM:
+            # every token containing it has an n-gram (or is a short token) containing it;
+            # the n-grams are few, unlike the tokens.
+            return {
+                x for gram, tokens in self._grams.items() if fragment in gram for x in tokens
+            }
+
+        grams = sorted(self._grams_of(fragment), key=lambda _: len(self._grams.get(_, ())))
+        tokens = set(self._grams.get(grams[0], ()))
+        for gram in grams[1:]:
+            tokens &= self._grams.get(gram, set())
+        return {x for x in tokens if fragment in x}
+
+    @property
+    def root_name(self) -> str:
+        """Return name of the top-level folder ``My Drive``."""
+
+        for item in self.items:
+            if (
+                item["PATH"].count(os.path.sep) == 1
+                and item["id"] != "shared-with-me"
+                and "driveId" not in item
+            ):
+                return str(item["name"])
+        return "My Drive"
+
+    def normalize_path(self, path: str) -> str:
+        """Return `path` absolute from a top-level folder; like ``_normalize_drive_path``.
+
+        Only an absolute `path` may start with the name of a shared drive.
+        """
+
+        absolute = path.startswith(os.path.sep)
+        path = os.path.normpath(path).strip(os.path.sep) if path else ""
+        if not path:
+            return os.path.sep + self.root_name
+
+        top, _ = self.subtree(os.path.sep + path.split(os.path.sep)[0])
+        if not top or (not absolute and "driveId" in self.items[top[0]]):
+            path = os.path.join(self.root_name, path)
+
+        return os.path.sep + path
+
+    @staticmethod
+    def default_path() -> Path:
+        """Return pathname of the cached snapshot."""
+
+        return xdg.xdg_cache_home() / "gdrive" / "index.jsonl"
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> "DriveIndex | None":
+        """Return the snapshot cached at `path`, or None if there isn't one.
+
+        Items are re-linked to their ``PARENT`` folders by ``parents[0]``.
+        """
+
+        path = path or cls.default_path()
+        if not path.exists():
+            return None
+
+        logger.debug("Loading index {!r}", str(path))
+        with open(path, encoding="utf-8") as fh:
+            items = [json.loads(line) for line in fh]
+
+        by_id = {x["id"]: x for x in items}
+        for item in items:
+            ids = item.get("parents")
+            item["PARENT"] = by_id.get(ids[0]) if ids else None
+
+        return cls(items)
+
+    @classmethod
+    def discard(cls, path: Path | None = None) -> None:
+        """Remove the snapshot cached at `path`; e.g., when it's known to be stale."""
+
+        path = path or cls.default_path()
+        logger.debug("Discarding index {!r}", str(path))
+        path.unlink(missing_ok=True)
+
+    def save(self, path: Path | None = None) -> None:
+        """Cache this snapshot at `path`; atomically replacing any previous snapshot."""
+
+        path = path or self.default_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+
+        logger.debug("Saving index {!r}", str(path))
+        with open(tmp, "w", encoding="utf-8") as fh, ItemWriter("jsonl", stream=fh) as writer:
+            for item in self.items:
+                writer.write(item)
+
+        os.replace(tmp, path)
+
+    def subtree(self, path: str) -> list[range]:
+        """Return ranges of positions of the items at `path`, and of all items beneath it."""
+
+        key = path.rstrip(os.path.sep).lower()
+        children = key + os.path.sep
+        # every key beneath `path` starts with `children`, and sorts before `after`.
+        after = key + chr(ord(os.path.sep) + 1)
+
+        return [
+            range(bisect.bisect_left(self._keys, key), bisect.bisect_right(self._keys, key)),
+            range(
+                bisect.bisect_left(self._keys, children),
+                bisect.bisect_left(self._keys, after),
+            ),
+        ]
+
+    def _candidates(self, fragments: list[str], within: range) -> Iterable[int]:
+        """Return positions, in `within`, of items with names containing all `fragments`."""
+
+        if not fragments:
+            return within
+
+        positions: set[int] | None = None
+        # the longest fragments are the most selective.
+        for fragment in sorted(fragments, key=len, reverse=True):
+            # any name containing `fragment` has a token containing `fragment`.
+            matches: set[int] = set()
+            for token in self._tokens_containing(fragment):
+                postings = self._postings[token]
+                lo = bisect.bisect_left(postings, within.start)
+                hi = bisect.bisect_left(postings, within.stop)
+                matches.update(postings[lo:hi])
+            positions = matches if positions is None else positions & matches
+            if not positions:
+                return []
+
+        assert positions is not None
+        return sorted(positions)
+
+    @staticmethod
+    def glob_fragments(pattern: str) -> list[str]:
+        """Return the lower-cased literal tokens of `fnmatch` `pattern`."""
+
+        return [
+            token
+            for literal in _GLOB_WILDCARDS_RE.split(pattern.lower())
+            for token in _TOKEN_RE.findall(literal)
+        ]
+
+    def find(
+        self,
+        path: str,
+        predicate: Callable[[DriveItem], bool] | None = None,
+        fragments: list[str] | None = None,
+    ) -> Generator[DriveItem, None, None]:
+        """Generate items at and beneath `path`, in ``PATH`` order.
+
+        Only items whose names contain each of `fragments` (lower-cased literal
+        tokens; see `glob_fragments`) are considered, and those are filtered by
+        `predicate`.
+        """
+
+        for within in self.subtree(path):
+            for pos in self._candidates(fragments or [], within):
+                item = self.items[pos]
+                if predicate is None or predicate(item):
+                    yield item
@@ -0,0 +1,120 @@
+"""Write-ahead journal of the operations of a list-driven command."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from types import TracebackType
+from typing import Any, TextIO
+
+import xdg
+from loguru import logger
+
+__all__ = ["Journal"]
+
+
+class Journal:
+    """Record of the state of each operation of a list file; to resume after a crash.
+
+    The journal is a JSON-lines file, under the xdg data dir, keyed by the list
+    file's path. Each line records an operation's ``key`` (what it does, e.g.,
+    its target; not its line number, so an edited list still skips what's been
+    done), its ``state`` (``pending``, ``done`` or ``failed``) and any resulting
+    drive ``id`` or ``error``. An operation is recorded ``pending`` before it
+    starts, so one interrupted is known to be in doubt. Records are only
+    appended; on open, the last record of each key is its state.
+    """
+
+    def __init__(self, listfile: str, readonly: bool = False) -> None:
+        """Open (or create) the journal of `listfile`; without changing it if `readonly`."""
+
+        digest = hashlib.sha1(os.path.abspath(listfile).encode()).hexdigest()[:16]
+        self.path: Path = xdg.xdg_data_home() / "gdrive" / "journal" / (digest + ".jsonl")
+
+        self.records: dict[str, dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn write, by a crash.
+                    self.records[record["key"]] = record
+            logger.info("Resuming from journal {!r}", str(self.path))
+
+        self.readonly = readonly
+        self._fh: TextIO | None = None
+        self._open()
+
+    def _open(self) -> None:
+        """Open the journal file for appending, unless `readonly`."""
+
+        if not self.readonly:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            torn = False
+            if self.path.exists() and self.path.stat().st_size:
+                with open(self.path, "rb") as fh:
+                    fh.seek(-1, os.SEEK_END)
+                    torn = fh.read(1) != b"\n"
+
+            # Not a context manager; held open, for appending, until `close`.
+            self._fh = open(self.path, "a", encoding="utf-8")  # noqa: SIM115
+            if torn:
+                # end the torn write, so the next record starts on a line of its own.
+                self._fh.write("\n")
+
+    def __enter__(self) -> "Journal":
+        """Return this journal."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close this journal."""
+        self.close()
+
+    def state(self, key: str) -> str | None:
+        """Return the state of operation `key`, or None if never started."""
+
+        record = self.records.get(key)
+        return record["state"] if record else None
+
+    def is_done(self, key: str) -> bool:
+        """Return True if operation `key` has completed."""
+
+        return self.state(key) == "done"
+
+    def record(self, key: str, state: str, **fields: Any) -> None:
+        """Record the `state`, and any `fields`, of operation `key`."""
+
+        record = {"key": key, "state": state} | fields
+        self.records[key] = record
+        if self._fh:
+            self._fh.write(json.dumps(record) + "\n")
+            self._fh.flush()
+
+    def sync(self) -> None:
+        """Make the records written so far durable."""
+
+        if self._fh:
+            os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        """Sync and close this journal."""
+
+        if self._fh:
+            self.sync()
+            self._fh.close()
+            self._fh = None
+
+    def discard(self) -> None:
+        """Forget all records; to start over."""
+
+        logger.info("Discarding journal {!r}", str(self.path))
+        self.close()
+        self.records = {}
+        self.path.unlink(missing_ok=True)
+        self._open()
@@ -0,0 +1,83 @@
+"""Schedule transfers in lanes by size; small files and large files."""
+
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from gdrive.units import format_size
+
+__all__ = ["SMALL_FILE_SIZE", "Lanes"]
+
+# Files no larger than this are small; (as `GoogleDriveAPI` sends them in one request).
+SMALL_FILE_SIZE = 8 << 20
+
+
+class Lanes:
+    """Route each transfer, by its size, to the ``small`` or ``large`` lane.
+
+    Small files are dominated by per-request latency, so their lane has many
+    workers; large files are dominated by bandwidth, so their lane has few,
+    and a stream of small files never waits behind them. Each lane's files,
+    bytes and throughput are recorded, for `summary`.
+    """
+
+    def __init__(
+        self,
+        size: Callable[[Any], int],
+        small_workers: int,
+        large_workers: int,
+        threshold: int = SMALL_FILE_SIZE,
+    ) -> None:
+        """Route items by `size` of each, over `threshold` to the large lane; with the given workers."""
+
+        self.size = size
+        self.threshold = threshold
+        self.workers = {"small": max(1, small_workers), "large": max(1, large_workers)}
+        self._lock = threading.Lock()
+        self._stats = {
+            lane: {"files": 0, "bytes": 0, "start": 0.0, "end": 0.0} for lane in self.workers
+        }
+
+    def route(self, item: Any) -> str:
+        """Return the name of the lane of `item`."""
+
+        return "large" if self.size(item) > self.threshold else "small"
+
+    def timed(self, func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        """Return `func`, recording the size and time of each item in its lane's stats."""
+
+        def wrapper(item: Any) -> Any:
+            start = time.monotonic()
+            result = func(item)
+            end = time.monotonic()
+            with self._lock:
+                stats = self._stats[self.route(item)]
+                stats["files"] += 1
+                stats["bytes"] += self.size(item)
+                stats["start"] = min(stats["start"] or start, start)
+                stats["end"] = max(stats["end"], end)
+            return result
+
+        return wrapper
+
+    def summary(self) -> list[str]:
+        """Return a line of each lane's files, bytes and throughput."""
+
+        lines = []
+        for lane, stats in self._stats.items():
+            if not stats["files"]:
+                continue
+            seconds = max(stats["end"] - stats["start"], 1e-3)
+            lines.append(
+                str.format(
+                    "{} lane: {:d} files ({}B) in {:.1f}s; {:.1f} files/s, {}B/s",
+                    lane,
+                    stats["files"],
+                    format_size(stats["bytes"]),
+                    seconds,
+                    stats["files"] / seconds,
+                    format_size(stats["bytes"] / seconds),
+                )
+            )
+        return lines
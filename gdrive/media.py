@@ -0,0 +1,221 @@
+"""File-like access to Google Drive media."""
+
+import hashlib
+import io
+import random
+import ssl
+import time
+from collections import Counter
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from googleapiclient.errors import HttpError  # type: ignore[import-untyped]
+from googleapiclient.http import (  # type: ignore[import-untyped]
+    DEFAULT_CHUNK_SIZE,
+    MediaIoBaseDownload,
+    MediaUpload,
+)
+from loguru import logger
+
+from gdrive.batch import is_retryable
+
+__all__ = ["CHUNK_MULTIPLE", "ChunkSizer", "HashingWriter", "MediaReader", "StreamUpload"]
+
+# Resumable upload chunks must be multiples of this, except the last.
+CHUNK_MULTIPLE = 256 * 1024
+
+# Seconds a chunk should take; chunks much faster are grown, and much slower are shrunk.
+_CHUNK_SECONDS = 3.0
+
+# Errors of the network, rather than, e.g., of the local disk; worth retrying a chunk after.
+# (`socket.timeout` is `TimeoutError`.)
+_NETWORK_ERRORS = (ConnectionError, TimeoutError, ssl.SSLError)
+
+T = TypeVar("T")
+
+
+class MediaReader(io.RawIOBase):
+    """Read-only stream of the content of a media request, fetched a chunk at a time.
+
+    Memory is bounded by `chunksize`; wrap in `io.BufferedReader` for `readline`, etc.
+    """
+
+    def __init__(self, request: Any, chunksize: int = DEFAULT_CHUNK_SIZE) -> None:
+        """Prepare to read the content of `request`; e.g., ``files().get_media(...)``."""
+
+        super().__init__()
+        self._chunk = io.BytesIO()
+        self._downloader = MediaIoBaseDownload(self._chunk, request, chunksize=chunksize)
+        self._done = False
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        """Return True; this stream is readable."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Read up to ``len(buffer)`` bytes into `buffer`; return number of bytes read."""
+
+        while not self._pending and not self._done:
+            self._chunk.seek(0)
+            self._chunk.truncate()
+            _, self._done = self._downloader.next_chunk()
+            self._pending = memoryview(self._chunk.getvalue())
+
+        nbytes = min(len(buffer), len(self._pending))
+        buffer[:nbytes] = self._pending[:nbytes]
+        self._pending = self._pending[nbytes:]
+        return nbytes
+
+
+class HashingWriter:
+    """Write to `fh`, computing the md5 of what's written in the same pass."""
+
+    def __init__(self, fh: Any = None) -> None:
+        """Prepare to write to binary file-like `fh` (which may be set later)."""
+
+        self.fh = fh
+        # Not for security; this matches the drive's ``md5Checksum``.
+        self.md5 = hashlib.md5()
+
+    def write(self, data: bytes) -> int:
+        """Write `data`; return number of bytes written."""
+
+        self.md5.update(data)
+        return int(self.fh.write(data))
+
+
+class StreamUpload(MediaUpload):  # type: ignore[misc]
+    """Resumable upload of a non-seekable stream (a pipe, `stdin`) of unknown size.
+
+    Only the bytes not yet acknowledged by the server are kept; so memory is
+    bounded by `chunksize`, and a chunk can be re-sent after an error.
+    """
+
+    def __init__(
+        self,
+        stream: Any,
+        mimetype: str = "application/octet-stream",
+        chunksize: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """Prepare to upload the content of binary `stream`."""
+
+        if chunksize % CHUNK_MULTIPLE:
+            raise ValueError(f"chunksize must be a multiple of {CHUNK_MULTIPLE}")
+
+        self._stream = stream
+        self._mimetype = mimetype
+        self._chunksize = chunksize
+        self._buffer = bytearray()  # unacknowledged bytes, from `_offset`.
+        self._offset = 0
+        self._eof = False
+
+    def chunksize(self) -> int:
+        """Return chunk size; (larger than any remaining chunk, once at end of stream).
+
+        `HttpRequest.next_chunk` finishes the upload on a "short read" (one
+        that is less than the chunk size); this ensures that one happens,
+        even when the stream ends on a chunk boundary.
+        """
+
+        return self._chunksize + 1 if self._eof else self._chunksize
+
+    def mimetype(self) -> str:
+        """Return mimetype of the content."""
+        return self._mimetype
+
+    def size(self) -> int | None:
+        """Return None; the size is not known until the end of the stream."""
+        return None
+
+    def resumable(self) -> bool:
+        """Return True; only resumable uploads can be of unknown size."""
+        return True
+
+    def has_stream(self) -> bool:
+        """Return False; content is provided by `getbytes`."""
+        return False
+
+    def getbytes(self, begin: int, length: int) -> bytes:
+        """Return up to `length` bytes, starting at offset `begin`."""
+
+        if begin < self._offset:
+            raise ValueError(f"Can't rewind stream to {begin}; at {self._offset}")
+
+        # discard bytes the server has acknowledged.
+        del self._buffer[: begin - self._offset]
+        self._offset = begin
+
+        # read one extra byte, to learn whether the stream ends with this chunk.
+        while not self._eof and len(self._buffer) <= length:
+            data = self._stream.read(length + 1 - len(self._buffer))
+            if not data:
+                self._eof = True
+            self._buffer += data
+
+        return bytes(self._buffer[:length])
+
+
+class ChunkSizer:
+    """Chunk size of a transfer, adapted to the throughput and errors of its chunks.
+
+    A full chunk sent in well under `_CHUNK_SECONDS` is a needless round trip,
+    so the size doubles; one taking well over it loses much work if it fails,
+    so the size halves, as it does after an error. Sizes are multiples of
+    `CHUNK_MULTIPLE`, within `minimum` and `maximum`; ``sizes`` counts the
+    chunks of each size, and ``errors`` the chunks retried.
+    """
+
+    def __init__(self, size: int, minimum: int, maximum: int, retries: int = 5) -> None:
+        """Start at chunks of `size` bytes; retrying a chunk failed by the network up to `retries` times."""
+
+        self.minimum = max(CHUNK_MULTIPLE, minimum - minimum % CHUNK_MULTIPLE)
+        self.maximum = max(self.minimum, maximum - maximum % CHUNK_MULTIPLE)
+        self.size = self._clamp(size)
+        self.retries = retries
+        self.sizes: Counter[int] = Counter()
+        self.errors = 0
+
+    def _clamp(self, size: int) -> int:
+        """Return `size`, rounded down to a multiple of `CHUNK_MULTIPLE`, within bounds."""
+
+        return min(max(size - size % CHUNK_MULTIPLE, self.minimum), self.maximum)
+
+    def next_chunk(self, transfer: Callable[[int], T], position: Callable[[], int]) -> T:
+        """Return ``transfer(size)``, of the next chunk; retrying, and adapting the size.
+
+        `position` returns the bytes transferred so far.
+        """
+
+        attempt = 0
+        while True:
+            begin, start, size = position(), time.monotonic(), self.size
+            try:
+                result = transfer(size)
+            except (HttpError, *_NETWORK_ERRORS) as e:
+                if attempt == self.retries or not (
+                    isinstance(e, _NETWORK_ERRORS) or is_retryable(e)
+                ):
+                    raise
+                attempt += 1
+                self.errors += 1
+                self.size = self._clamp(self.size // 2)
+                logger.warning("Retrying chunk of {} bytes, next of {}: {}", size, self.size, e)
+                time.sleep(2**attempt * random.uniform(0.5, 1))
+                continue
+
+            self.sizes[size] += 1
+            self._adapt(size, position() - begin, time.monotonic() - start)
+            return result
+
+    def _adapt(self, size: int, nbytes: int, seconds: float) -> None:
+        """Grow or shrink the chunk size, after `nbytes` of a chunk of `size` took `seconds`."""
+
+        if nbytes >= size and seconds < _CHUNK_SECONDS / 2:
+            self.size = self._clamp(size * 2)
+        elif seconds > _CHUNK_SECONDS * 2:
+            self.size = self._clamp(size // 2)
+        if self.size != size:
+            logger.debug(
+                "Chunk size {} -> {} bytes; {} in {:.2f}s", size, self.size, nbytes, seconds
+            )
@@ -0,0 +1,459 @@
+"""Two-way mirror of a local folder and a Google Drive folder."""
+
+import hashlib
+import os
+import sqlite3
+import time
+from argparse import Namespace
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any
+
+import xdg
+from loguru import logger
+
+from gdrive.api import GoogleDriveAPI
+from gdrive.lanes import Lanes
+
+__all__ = ["Mirror", "MirrorState"]
+
+DriveItem = dict[str, Any]
+
+# (relative) path -> {"size", "mtime_ns"}
+LocalFiles = dict[str, dict[str, int]]
+
+# (relative) path -> {"id", "md5", "size", "mtime_ns"}
+StateRecords = dict[str, dict[str, Any]]
+
+
+class MirrorState:
+    """Database of the files of a mirror as they were when last in sync.
+
+    Without it, a file missing from one side could have been either deleted
+    there or created on the other side; with it, changes are detected and
+    propagated, and unchanged files are left alone.
+    """
+
+    def __init__(self, local: str, remote: str) -> None:
+        """Open (or create) the database for mirroring `local` and `remote`."""
+
+        key = os.path.abspath(local) + "\0" + remote
+        digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+        self.path = xdg.xdg_data_home() / "gdrive" / "mirror" / f"{digest}.db"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        logger.debug("Opening mirror state {!r}", str(self.path))
+        self.db = sqlite3.connect(self.path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS files"
+            " (path TEXT PRIMARY KEY, id TEXT, md5 TEXT, size INTEGER, mtime_ns INTEGER)"
+        )
+
+    def load(self) -> StateRecords:
+        """Return all records."""
+
+        return {
+            row[0]: {"id": row[1], "md5": row[2], "size": row[3], "mtime_ns": row[4]}
+            for row in self.db.execute("SELECT path, id, md5, size, mtime_ns FROM files")
+        }
+
+    def put(self, path: str, record: dict[str, Any]) -> None:
+        """Add or replace the record of `path`."""
+
+        self.db.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+            (path, record["id"], record["md5"], record["size"], record["mtime_ns"]),
+        )
+
+    def delete(self, path: str) -> None:
+        """Delete the record of `path`."""
+
+        self.db.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def commit(self) -> None:
+        """Commit changes."""
+
+        self.db.commit()
+
+
+class Mirror:
+    """Two-way mirror of a local folder and a drive folder.
+
+    `plan` compares the local tree, the drive subtree (from the crawl) and the
+    state of the last sync, and returns the list of actions to bring them back
+    in sync. `apply` performs the actions concurrently.
+
+    Actions are dicts with an ``op`` and the relative ``path`` it applies to:
+
+        upload          new local file; create it on the drive.
+        download        new drive file; create it locally.
+        update-remote   local file changed; replace the drive file's content.
+        update-local    drive file changed; replace the local file.
+        move-remote     local file was moved (``from``); move the drive file.
+        move-local      drive file was moved (``from``); move the local file.
+        trash-remote    local file was deleted; trash the drive file.
+        delete-local    drive file was deleted; delete the local file.
+        record          both sides already agree; just record the state.
+        forget          both sides were deleted; just forget the state.
+
+    When a file changed on both sides, the newer version wins (``update-remote``
+    or ``update-local``), and the older is kept beside it, locally, as ``NAME
+    (conflict TIMESTAMP).EXT``; (the action's ``conflict``), which the next
+    mirror uploads, like any new local file.
+    """
+
+    def __init__(self, api: GoogleDriveAPI, args: Namespace, local: str, remote: str) -> None:
+        """Prepare to mirror local folder `local` and drive folder `remote`."""
+
+        self.api = api
+        self.args = args
+        self.local = local
+        self.remote = api.normalize_path(remote)
+        self.state = MirrorState(local, self.remote)
+
+        self.local_files: LocalFiles = {}
+        self.remote_files: dict[str, DriveItem] = {}
+        self.records: StateRecords = {}
+        self.stamp = time.strftime("%Y%m%dT%H%M%S")
+
+    def scan(self) -> None:
+        """Gather the local files, the drive files and the state of the last sync."""
+
+        for dirpath, _, filenames in os.walk(self.local):
+            for filename in filenames:
+                pathname = os.path.join(dirpath, filename)
+                stats = os.stat(pathname)
+                relpath = os.path.relpath(pathname, self.local).replace(os.path.sep, "/")
+                self.local_files[relpath] = {
+                    "size": stats.st_size,
+                    "mtime_ns": stats.st_mtime_ns,
+                }
+
+        prefix = self.remote + "/"
+        for item in self.api.all_files:
+            if not item["PATH"].startswith(prefix):
+                continue
+            relpath = item["PATH"][len(prefix) :]
+            if "md5Checksum" not in item:
+                logger.debug("Skipping {!r}; no binary content", item["PATH"])
+            elif relpath in self.remote_files:
+                logger.warning("Skipping {!r}; duplicate name", item["PATH"])
+            else:
+                self.remote_files[relpath] = item
+
+        self.records = self.state.load()
+
+    def plan(self) -> list[dict[str, Any]]:
+        """Return list of actions to bring the local and drive folders back in sync."""
+
+        self.scan()
+        actions: list[dict[str, Any]] = []
+        done: set[str] = set()
+
+        self._plan_moves(actions, done)
+
+        for relpath in sorted(
+            self.local_files.keys() | self.remote_files.keys() | self.records.keys()
+        ):
+            if relpath not in done:
+                action = self._plan_path(relpath)
+                if action:
+                    actions.append(action)
+
+        return actions
+
+    def _plan_moves(self, actions: list[dict[str, Any]], done: set[str]) -> None:
+        """Detect files moved on one side since the last sync; to be moved on the other."""
+
+        local, remote, records = self.local_files, self.remote_files, self.records
+
+        # moved on the drive: same id, new path; the old local copy is unchanged.
+        paths_by_id = {x["id"]: relpath for relpath, x in records.items()}
+        for relpath, item in remote.items():
+            old = paths_by_id.get(item["id"])
+            if (
+                old
+                and old != relpath
+                and relpath not in records
+                and relpath not in local
+                and old not in remote
+                and old in local
+                and not self._local_changed(old)
+            ):
+                actions.append({"op": "move-local", "path": relpath, "from": old, "item": item})
+                done.update((relpath, old))
+
+        # moved locally: a new local file has the content of a vanished one.
+        vanished: dict[int, list[str]] = {}
+        for relpath, record in records.items():
+            if relpath not in local and relpath in remote and not self._remote_changed(relpath):
+                vanished.setdefault(record["size"], []).append(relpath)
+
+        for relpath, stats in local.items():
+            if relpath in records or relpath in remote or relpath in done:
+                continue
+            for old in vanished.get(stats["size"], []):
+                if old not in done and self._md5sum(relpath) == records[old]["md5"]:
+                    actions.append(
+                        {"op": "move-remote", "path": relpath, "from": old, "item": remote[old]}
+                    )
+                    done.update((relpath, old))
+                    break
+
+    # Too many returns; one per combination of local, remote and recorded state.
+    def _plan_path(self, relpath: str) -> dict[str, Any] | None:  # noqa: PLR0911
+        """Return the action to sync `relpath`, or None if it is in sync."""
+
+        in_local = relpath in self.local_files
+        item = self.remote_files.get(relpath)
+        record = self.records.get(relpath)
+
+        if record is None:
+            return self._plan_new_path(relpath, in_local, item)
+
+        if not in_local and not item:
+            return {"op": "forget", "path": relpath}
+
+        if not item:
+            if self._local_changed(relpath):
+                return {"op": "upload", "path": relpath}
+            return {"op": "delete-local", "path": relpath}
+
+        if not in_local:
+            if self._remote_changed(relpath):
+                return {"op": "download", "path": relpath, "item": item}
+            return {"op": "trash-remote", "path": relpath, "item": item}
+
+        local_changed = self._local_changed(relpath)
+        remote_changed = self._remote_changed(relpath)
+        if not local_changed and not remote_changed:
+            return None
+        if local_changed and self._md5sum(relpath) == item["md5Checksum"]:
+            return {"op": "record", "path": relpath, "item": item}
+        if not remote_changed:
+            return {"op": "update-remote", "path": relpath, "item": item}
+        if not local_changed:
+            return {"op": "update-local", "path": relpath, "item": item}
+        return self._resolve_conflict(relpath, item)
+
+    def _plan_new_path(
+        self, relpath: str, in_local: bool, item: DriveItem | None
+    ) -> dict[str, Any]:
+        """Return the action to sync `relpath`, which has not been synced before."""
+
+        if in_local and item:
+            if self._md5sum(relpath) == item["md5Checksum"]:
+                return {"op": "record", "path": relpath, "item": item}
+            return self._resolve_conflict(relpath, item)
+        if in_local:
+            return {"op": "upload", "path": relpath}
+        assert item
+        return {"op": "download", "path": relpath, "item": item}
+
+    def _resolve_conflict(self, relpath: str, item: DriveItem) -> dict[str, Any]:
+        """Return action for a file that differs on both sides; the newer wins.
+
+        The older version is kept, as a local conflict copy.
+        """
+
+        local_time = self.local_files[relpath]["mtime_ns"] / 1e9
+        remote_time = datetime.fromisoformat(item["modifiedTime"].replace("Z", "+00:00"))
+        newer = "local" if local_time > remote_time.timestamp() else "remote"
+
+        stem, ext = os.path.splitext(relpath)
+        conflict = f"{stem} (conflict {self.stamp}){ext}"
+        logger.warning(
+            "Conflict {!r}; using the {} version, keeping the other as {!r}",
+            relpath,
+            newer,
+            conflict,
+        )
+
+        op = "update-remote" if newer == "local" else "update-local"
+        return {"op": op, "path": relpath, "item": item, "conflict": conflict}
+
+    def _local_changed(self, relpath: str) -> bool:
+        """Return True if local `relpath` is not as it was when last in sync."""
+
+        stats, record = self.local_files[relpath], self.records[relpath]
+        return bool(stats["size"] != record["size"] or stats["mtime_ns"] != record["mtime_ns"])
+
+    def _remote_changed(self, relpath: str) -> bool:
+        """Return True if drive `relpath` is not as it was when last in sync."""
+
+        item, record = self.remote_files[relpath], self.records[relpath]
+        return bool(item["id"] != record["id"] or item["md5Checksum"] != record["md5"])
+
+    def _md5sum(self, relpath: str) -> str:
+        """Return md5 digest of local `relpath`."""
+
+        return self.api.md5sum(self._local_path(relpath))
+
+    def _local_path(self, relpath: str) -> str:
+        """Return local pathname of `relpath`."""
+
+        return os.path.join(self.local, *relpath.split("/"))
+
+    def apply(self, actions: list[dict[str, Any]], jobs: int, large_jobs: int = 2) -> int:
+        """Perform `actions` with concurrent workers; return number of failures.
+
+        Drive folders are created first, in order; then the actions run
+        concurrently, and the state is updated as each action completes.
+        Transfers of large files run in a lane of their own, of `large_jobs`
+        workers, largest first; all else runs in a lane of `jobs` workers.
+        """
+
+        reldirs = {
+            os.path.dirname(x["path"])
+            for x in actions
+            if x["op"] in ("upload", "move-remote", "update-remote")
+        }
+        for reldir in sorted(reldirs):
+            self._remote_folder(reldir)
+
+        handlers: dict[str, Callable[[dict[str, Any]], dict[str, Any] | None]] = {
+            "upload": self._upload,
+            "download": self._download,
+            "update-remote": self._update_remote,
+            "update-local": self._download,
+            "move-remote": self._move_remote,
+            "move-local": self._move_local,
+            "trash-remote": self._trash_remote,
+            "delete-local": self._delete_local,
+            "record": self._record,
+            "forget": lambda _: None,
+        }
+
+        lanes = Lanes(self._action_size, jobs, large_jobs)
+        executors = {
+            lane: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"mirror-{lane}")
+            for lane, workers in lanes.workers.items()
+        }
+
+        failures = 0
+        with executors["small"], executors["large"]:
+            futures = {
+                executors[lanes.route(x)].submit(lanes.timed(handlers[x["op"]]), x): x
+                for x in sorted(actions, key=self._action_size, reverse=True)
+            }
+            for future in as_completed(futures):
+                action = futures[future]
+                try:
+                    record = future.result()
+                except Exception as e:  # noqa: PLW0703
+                    # Catch broad exceptions; one failure must not stop the others.
+                    logger.error("{} {!r}: {}", action["op"], action["path"], e)
+                    failures += 1
+                    continue
+
+                if "from" in action:
+                    self.state.delete(action["from"])
+                if record:
+                    self.state.put(action["path"], record)
+                else:
+                    self.state.delete(action["path"])
+                self.state.commit()
+
+        for line in lanes.summary():
+            logger.info("{}", line)
+        return failures
+
+    def _action_size(self, action: dict[str, Any]) -> int:
+        """Return the bytes that `action` transfers; 0 if it transfers none."""
+
+        if action["op"] in ("upload", "update-remote"):
+            return self.local_files.get(action["path"], {}).get("size", 0)
+        if action["op"] in ("download", "update-local"):
+            return int(action["item"].get("size", 0))
+        return 0
+
+    def _remote_folder(self, reldir: str) -> DriveItem:
+        """Return drive folder for `reldir`, creating it if necessary."""
+
+        path = os.path.join(self.remote, *reldir.split("/")) if reldir else self.remote
+        folder = self.api.get_folder(path) or self.api.makedirs(self.args, path)
+        assert folder is not None
+        return folder
+
+    def _local_record(self, relpath: str, item: DriveItem) -> dict[str, Any]:
+        """Return state record of `relpath`, after syncing it with drive `item`."""
+
+        stats = os.stat(self._local_path(relpath))
+        return {
+            "id": item["id"],
+            "md5": item.get("md5Checksum"),
+            "size": stats.st_size,
+            "mtime_ns": stats.st_mtime_ns,
+        }
+
+    def _upload(self, action: dict[str, Any]) -> dict[str, Any]:
+        """Create the drive file."""
+
+        relpath = action["path"]
+        reldir, name = os.path.split(relpath)
+        item = self.api.create_file(
+            self.args, self._local_path(relpath), name, self._remote_folder(reldir)
+        )
+        return self._local_record(relpath, item)
+
+    def _download(self, action: dict[str, Any]) -> dict[str, Any]:
+        """Create or replace the local file."""
+
+        relpath = action["path"]
+        pathname = self._local_path(relpath)
+        if "conflict" in action:
+            # keep the older, local, version.
+            conflict = self._local_path(action["conflict"])
+            logger.info("Keeping {!r} as {!r}", pathname, conflict)
+            os.replace(pathname, conflict)
+        os.makedirs(os.path.dirname(pathname), exist_ok=True)
+        self.api.download_file(self.args, action["item"], pathname)
+        return self._local_record(relpath, action["item"])
+
+    def _update_remote(self, action: dict[str, Any]) -> dict[str, Any]:
+        """Replace the drive file's content."""
+
+        relpath = action["path"]
+        if "conflict" in action:
+            # keep the older, drive, version.
+            self.api.download_file(
+                self.args, action["item"], self._local_path(action["conflict"])
+            )
+        item = self.api.update_file(self.args, action["item"], self._local_path(relpath))
+        return self._local_record(relpath, item)
+
+    def _move_remote(self, action: dict[str, Any]) -> dict[str, Any]:
+        """Move the drive file."""
+
+        relpath = action["path"]
+        reldir, name = os.path.split(relpath)
+        item = self.api.move_item(self.args, action["item"], self._remote_folder(reldir), name)
+        return self._local_record(relpath, item)
+
+    def _move_local(self, action: dict[str, Any]) -> dict[str, Any]:
+        """Move the local file."""
+
+        relpath = action["path"]
+        pathname = self._local_path(relpath)
+        os.makedirs(os.path.dirname(pathname), exist_ok=True)
+        logger.info("Moving {!r} -> {!r}", self._local_path(action["from"]), pathname)
+        os.replace(self._local_path(action["from"]), pathname)
+        return self._local_record(relpath, action["item"])
+
+    def _trash_remote(self, action: dict[str, Any]) -> None:
+        """Trash the drive file."""
+
+        self.api.trash(self.args, action["item"])
+
+    def _delete_local(self, action: dict[str, Any]) -> None:
+        """Delete the local file."""
+
+        pathname = self._local_path(action["path"])
+        logger.info("Deleting {!r}", pathname)
+        os.remove(pathname)
+
+    def _record(self, action: dict[str, Any]) -> dict[str, Any]:
+        """Record the state of a file already in sync."""
+
+        return self._local_record(action["path"], action["item"])
@@ -0,0 +1,223 @@
+"""Streaming pipeline of concurrent stages, connected by bounded queues."""
+
+import queue
+import threading
+from collections.abc import Callable, Generator, Iterable
+from typing import Any
+
+from loguru import logger
+
+__all__ = ["Pipeline"]
+
+# Marks the end of a stage's input.
+_END = object()
+
+
+class Pipeline:
+    """Stream items from a source through stages, each with its own pool of threads.
+
+    Stages are connected by bounded queues; a stage that falls behind blocks
+    those upstream of it (backpressure), so memory is bounded by the queue
+    sizes, not by the number of items. Items are not kept in order.
+
+    A stage is either a function of one item, run by ``workers`` threads, or
+    a function of a batch of items (of up to ``batch_size``, or whatever is
+    queued), run by one thread. Either returns the item(s) to pass on to the
+    next stage; an item that is None is dropped. An item whose stage raises is
+    logged and dropped. A stage may also be split into lanes, each with its
+    own queue and workers, that items are routed to.
+    """
+
+    def __init__(self, source: Iterable[Any], maxsize: int = 1000) -> None:
+        """Stream the items of `source`, queueing no more than `maxsize` between stages."""
+
+        self.source = source
+        self.maxsize = maxsize
+        self._stages: list[dict[str, Any]] = []
+
+    def add_stage(self, name: str, func: Callable[[Any], Any], workers: int = 1) -> "Pipeline":
+        """Add stage `name`, running `func` on each item, with `workers` threads."""
+
+        self._stages.append({"name": name, "func": func, "workers": max(1, workers)})
+        return self
+
+    def add_batch_stage(
+        self, name: str, func: Callable[[list[Any]], Iterable[Any]], batch_size: int
+    ) -> "Pipeline":
+        """Add stage `name`, running `func` on batches of up to `batch_size` items, with one thread."""
+
+        self._stages.append({"name": name, "func": func, "workers": 1, "batch_size": batch_size})
+        return self
+
+    def add_lanes_stage(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        lanes: dict[str, int],
+        route: Callable[[Any], str],
+    ) -> "Pipeline":
+        """Add stage `name`, running `func` on each item, in the lane that `route` returns.
+
+        Each of `lanes` (name to number of workers) has its own queue and
+        threads; so items of one lane don't wait behind those of another.
+        """
+
+        self._stages.append(
+            {"name": name, "func": func, "workers": 1, "lanes": lanes, "route": route}
+        )
+        return self
+
+    def run(self) -> Generator[Any, None, None]:
+        """Start all stages, and generate the output items of the last stage."""
+
+        queues: list[queue.Queue[Any]] = [
+            queue.Queue(maxsize=self.maxsize) for _ in range(len(self._stages) + 1)
+        ]
+
+        threading.Thread(
+            target=self._feed, args=(queues[0],), name="source", daemon=True
+        ).start()
+        # the caller of `run` is the one consumer of the last stage.
+        consumers = [x["workers"] for x in self._stages[1:]] + [1]
+        for n, stage in enumerate(self._stages):
+            self._start_stage(stage, queues[n], queues[n + 1], consumers[n])
+
+        while (item := queues[-1].get()) is not _END:
+            yield item
+
+    def _start_stage(
+        self,
+        stage: dict[str, Any],
+        inq: queue.Queue[Any],
+        outq: queue.Queue[Any],
+        consumers: int,
+    ) -> None:
+        """Start the worker thread(s) of `stage`, taking items from `inq` and putting on `outq`.
+
+        When all have finished, `outq` is ended for each of its `consumers`.
+        """
+
+        lanes = stage.get("lanes", {"": stage["workers"]})
+        running = [sum(lanes.values())]
+        lock = threading.Lock()
+
+        def done() -> None:
+            # the last worker of a stage ends the next stage's input; once per worker.
+            with lock:
+                running[0] -= 1
+                if running[0]:
+                    return
+            for _ in range(consumers):
+                outq.put(_END)
+
+        laneqs = {lane: inq for lane in lanes}
+        if "lanes" in stage:
+            laneqs = {lane: queue.Queue(maxsize=self.maxsize) for lane in lanes}
+            threading.Thread(
+                target=self._router,
+                args=(stage, inq, laneqs),
+                name="{}-router".format(stage["name"]),
+                daemon=True,
+            ).start()
+
+        worker = self._batch_worker if "batch_size" in stage else self._worker
+        for lane, workers in lanes.items():
+            for n in range(workers):
+                threading.Thread(
+                    target=worker,
+                    args=(stage, laneqs[lane], outq, done),
+                    name="-".join(filter(None, (stage["name"], lane, str(n)))),
+                    daemon=True,
+                ).start()
+
+    def _feed(self, outq: queue.Queue[Any]) -> None:
+        """Put each item of the source, then an end marker for each worker, on `outq`."""
+
+        try:
+            for item in self.source:
+                outq.put(item)
+        # Reason: a failing source ends the stream early, rather than hanging it.
+        except Exception:  # noqa: BLE001
+            logger.exception("source")
+        finally:
+            for _ in range(self._stages[0]["workers"] if self._stages else 1):
+                outq.put(_END)
+
+    @staticmethod
+    def _router(
+        stage: dict[str, Any],
+        inq: queue.Queue[Any],
+        laneqs: dict[str, queue.Queue[Any]],
+    ) -> None:
+        """Put each item of `inq` on the queue of its lane; then an end marker for each worker."""
+
+        while (item := inq.get()) is not _END:
+            try:
+                lane = stage["route"](item)
+                laneq = laneqs[lane]
+            # Reason: one bad item mustn't stop the stream; it's logged, and dropped.
+            except Exception:  # noqa: BLE001
+                logger.exception("{} {!r}", stage["name"], item)
+                continue
+            laneq.put(item)
+
+        for lane, laneq in laneqs.items():
+            for _ in range(stage["lanes"][lane]):
+                laneq.put(_END)
+
+    @staticmethod
+    def _worker(
+        stage: dict[str, Any],
+        inq: queue.Queue[Any],
+        outq: queue.Queue[Any],
+        done: Callable[[], None],
+    ) -> None:
+        """Run `stage` on each item of `inq`, putting its results on `outq`."""
+
+        while (item := inq.get()) is not _END:
+            try:
+                result = stage["func"](item)
+            # Reason: one bad item mustn't stop the stream; it's logged, and dropped.
+            except Exception:  # noqa: BLE001
+                logger.exception("{} {!r}", stage["name"], item)
+                continue
+            if result is not None:
+                outq.put(result)
+        done()
+
+    @staticmethod
+    def _batch_worker(
+        stage: dict[str, Any],
+        inq: queue.Queue[Any],
+        outq: queue.Queue[Any],
+        done: Callable[[], None],
+    ) -> None:
+        """Run `stage` on batches of the items of `inq`, putting their results on `outq`."""
+
+        ended = False
+        while not ended:
+            # block for the first item of a batch; then take whatever else is queued.
+            batch = []
+            item = inq.get()
+            while item is not _END:
+                batch.append(item)
+                if len(batch) >= stage["batch_size"]:
+                    break
+                try:
+                    item = inq.get_nowait()
+                except queue.Empty:
+                    break
+            ended = item is _END
+
+            if not batch:
+                continue
+            try:
+                results = stage["func"](batch)
+            # Reason: one bad batch mustn't stop the stream; it's logged, and dropped.
+            except Exception:  # noqa: BLE001
+                logger.exception("{} of {} items", stage["name"], len(batch))
+                continue
+            for result in results:
+                if result is not None:
+                    outq.put(result)
+        done()
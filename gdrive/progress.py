@@ -0,0 +1,225 @@
+"""Aggregate progress of concurrent transfers."""
+
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, TextIO
+
+from gdrive.bwlimit import BandwidthLimit
+from gdrive.units import format_size
+
+__all__ = ["MODES", "Progress", "Transfer"]
+
+# Values of `--progress`.
+MODES = ("auto", "tty", "json", "none")
+
+# Seconds between status lines on a terminal, and between json records otherwise.
+_TTY_INTERVAL = 0.5
+_JSON_INTERVAL = 10.0
+
+# Weight of the latest interval in the smoothed transfer rates.
+_SMOOTHING = 0.3
+
+
+class Transfer:
+    """One transfer (upload or download) in flight; see `Progress.start`."""
+
+    def __init__(self, progress: "Progress", name: str, size: int | None) -> None:
+        """Track transfer `name` of `size` bytes (if known) for `progress`."""
+
+        self.progress = progress
+        self.name = name
+        self.size = size
+        self.done = 0
+
+    def update(self, done: int) -> None:
+        """Record that `done` bytes, in all, have been transferred; pacing per any `bwlimit`."""
+
+        delta = done - self.done
+        with self.progress.lock:
+            self.progress.bytes_done += delta
+        self.done = done
+        if self.progress.bwlimit and delta > 0:
+            self.progress.bwlimit.consume(delta)
+
+    def finish(self, ok: bool = True) -> None:
+        """Record that this transfer has ended; successfully if `ok`."""
+
+        self.progress.finish(self, ok)
+
+
+class Progress:
+    """Bytes and files done, failed and in flight, across all workers.
+
+    Workers `start` a `Transfer`, `update` it after each chunk, and `finish`
+    it; each is one counter update, under a lock. A background thread renders
+    the totals periodically, with smoothed files/s and bytes/s, and an ETA if
+    the total to transfer is known (see `expect`); as a live status line on a
+    terminal, or as json records otherwise.
+    """
+
+    def __init__(
+        self,
+        mode: str = "auto",
+        stream: TextIO | None = None,
+        bwlimit: BandwidthLimit | None = None,
+    ) -> None:
+        """Render progress per `mode` (one of `MODES`) to `stream` (default: stderr).
+
+        Transfers are paced, as they report each chunk, by `bwlimit`, if given.
+        """
+
+        self.stream = stream or sys.stderr
+        self.bwlimit = bwlimit
+        if mode == "auto":
+            mode = "tty" if self.stream.isatty() else "json"
+        self.mode = mode
+
+        self.lock = threading.Lock()
+        self.active: set[Transfer] = set()
+        self.files_done = 0
+        self.files_failed = 0
+        self.files_expected = 0
+        self.bytes_done = 0
+        self.bytes_skipped = 0
+        self.bytes_expected = 0
+        # chunks of each size, and chunks retried; to confirm the tuning of `ChunkSizer`.
+        self.chunk_sizes: Counter[int] = Counter()
+        self.chunk_errors = 0
+
+        self._start_time = 0.0
+        self._last: tuple[float, int, int] = (0.0, 0, 0)
+        self._rates = [0.0, 0.0]  # files/s, bytes/s
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def expect(self, files: int = 1, nbytes: int = 0) -> None:
+        """Add `files` and `nbytes` to the total to transfer; for the ETA."""
+
+        with self.lock:
+            self.files_expected += files
+            self.bytes_expected += nbytes
+
+    def skip(self, nbytes: int = 0) -> None:
+        """Record that an expected file of `nbytes` needn't be transferred."""
+
+        with self.lock:
+            self.files_done += 1
+            self.bytes_skipped += nbytes
+
+    def start(self, name: str, size: int | None = None) -> Transfer:
+        """Return a new `Transfer` of `name`, of `size` bytes (if known)."""
+
+        transfer = Transfer(self, name, size)
+        with self.lock:
+            self.active.add(transfer)
+            if not self._start_time:
+                self._start_time = time.monotonic()
+                self._last = (self._start_time, 0, 0)
+            if self._thread is None and self.mode != "none":
+                self._thread = threading.Thread(target=self._run, name="progress", daemon=True)
+                self._thread.start()
+        return transfer
+
+    def finish(self, transfer: Transfer, ok: bool = True) -> None:
+        """Record that `transfer` has ended; successfully if `ok`."""
+
+        with self.lock:
+            self.active.discard(transfer)
+            if ok:
+                self.files_done += 1
+            else:
+                self.files_failed += 1
+
+    def add_chunks(self, sizes: Counter[int], errors: int) -> None:
+        """Record the chunks of each size, and the chunks retried, of a transfer."""
+
+        with self.lock:
+            self.chunk_sizes.update(sizes)
+            self.chunk_errors += errors
+
+    def close(self) -> None:
+        """Stop rendering, after rendering the final totals."""
+
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._render(final=True)
+
+    def _run(self) -> None:
+        """Render the totals periodically, until closed."""
+
+        interval = _TTY_INTERVAL if self.mode == "tty" else _JSON_INTERVAL
+        while not self._stop.wait(interval):
+            self._render()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the totals, rates and ETA."""
+
+        now = time.monotonic()
+        with self.lock:
+            record: dict[str, Any] = {
+                "files_done": self.files_done,
+                "files_failed": self.files_failed,
+                "files_active": len(self.active),
+                "files_expected": self.files_expected,
+                "bytes_done": self.bytes_done,
+                "bytes_skipped": self.bytes_skipped,
+                "bytes_expected": self.bytes_expected,
+                "chunk_sizes": {str(k): v for k, v in sorted(self.chunk_sizes.items())},
+                "chunk_errors": self.chunk_errors,
+            }
+
+        then, files, nbytes = self._last
+        if now > then:
+            for n, delta in enumerate((self.files_done - files, self.bytes_done - nbytes)):
+                rate = delta / (now - then)
+                old = self._rates[n]
+                self._rates[n] = rate if not old else _SMOOTHING * rate + (1 - _SMOOTHING) * old
+            self._last = (now, record["files_done"], record["bytes_done"])
+
+        record["files_per_sec"] = round(self._rates[0], 2)
+        record["bytes_per_sec"] = int(self._rates[1])
+        record["elapsed"] = round(now - self._start_time, 1)
+
+        remaining = self.bytes_expected - self.bytes_done - self.bytes_skipped
+        record["eta"] = (
+            round(remaining / self._rates[1]) if remaining > 0 and self._rates[1] else None
+        )
+        return record
+
+    def _render(self, final: bool = False) -> None:
+        """Render the totals; a status line on a terminal, or a json record."""
+
+        record = self.snapshot()
+        if self.mode == "json":
+            self.stream.write(json.dumps(record) + "\n")
+        else:
+            self.stream.write("\r" + self.format(record) + "\x1b[K" + ("\n" if final else ""))
+        self.stream.flush()
+
+    @staticmethod
+    def format(record: dict[str, Any]) -> str:
+        """Return status line of `record`, from `snapshot`."""
+
+        files = "{} files".format(record["files_done"])
+        if record["files_expected"]:
+            files = "{}/{} files".format(record["files_done"], record["files_expected"])
+
+        parts = [
+            files,
+            format_size(record["bytes_done"]) + "B",
+            "{:.1f} files/s".format(record["files_per_sec"]),
+            format_size(record["bytes_per_sec"]) + "B/s",
+            "{} active".format(record["files_active"]),
+        ]
+        if record["files_failed"]:
+            parts.append("{} failed".format(record["files_failed"]))
+        if record["eta"] is not None:
+            parts.append("ETA {}".format(time.strftime("%H:%M:%S", time.gmtime(record["eta"]))))
+
+        return "  ".join(parts)
@@ -0,0 +1,81 @@
+"""Compile item filters into the ``q`` expression of ``files().list``."""
+
+import re
+from argparse import Namespace
+from datetime import datetime, timedelta, timezone
+
+__all__ = ["build_query", "format_time", "parse_time", "quote"]
+
+# Relative times; e.g., ``7d`` is a week ago.
+_AGO_RE = re.compile(r"^\s*(\d+)\s*([hdw])\s*$", re.IGNORECASE)
+_AGO_UNITS = {"h": "hours", "d": "days", "w": "weeks"}
+
+
+def quote(value: str) -> str:
+    """Return `value` as a quoted string literal of a query.
+
+    See https://developers.google.com/drive/api/guides/search-files#query_string_examples
+    """
+
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def format_time(when: datetime) -> str:
+    """Return `when` in the RFC 3339 (UTC) form of a query."""
+
+    return when.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def parse_time(text: str) -> str:
+    """Return time `text` in the RFC 3339 (UTC) form of a query.
+
+    `text` is an ISO 8601 date or date-time (local, unless it has an offset),
+    e.g., ``2024-06-01`` or ``2024-06-01T12:00``; or a time ago, in hours, days
+    or weeks, e.g., ``12h``, ``7d`` or ``2w``. Raise ValueError if `text` is
+    invalid; (so that it may be used as an `argparse` ``type``).
+    """
+
+    match = _AGO_RE.match(text)
+    if match:
+        when = datetime.now(timezone.utc) - timedelta(
+            **{_AGO_UNITS[match[2].lower()]: int(match[1])}
+        )
+    else:
+        try:
+            when = datetime.fromisoformat(text.strip())
+        except ValueError:
+            raise ValueError(f"Invalid time {text!r}") from None
+
+    return format_time(when)
+
+
+def build_query(options: Namespace) -> str:
+    """Return the terms of `options` (from `add_filter_options`), and-ed; or "" if none.
+
+    Any of `--mime` matches; a type ending with ``/*`` matches its prefix.
+    """
+
+    terms = []
+
+    if options.mime:
+        mimes = [
+            "mimeType contains " + quote(x[:-1])
+            if x.endswith("/*")
+            else "mimeType = " + quote(x)
+            for x in options.mime
+        ]
+        terms.append(mimes[0] if len(mimes) == 1 else "(" + " or ".join(mimes) + ")")
+
+    if options.name_contains:
+        terms.append("name contains " + quote(options.name_contains))
+
+    if options.modified_after:
+        terms.append("modifiedTime > " + quote(options.modified_after))
+
+    if options.modified_before:
+        terms.append("modifiedTime < " + quote(options.modified_before))
+
+    if options.owner:
+        terms.append(quote(options.owner) + " in owners")
+
+    return " and ".join(terms)
@@ -0,0 +1,77 @@
+"""High-water marks of incremental listings; for `--since @lastrun`."""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import xdg
+from loguru import logger
+
+from gdrive.query import format_time, parse_time
+
+__all__ = ["LASTRUN", "HighWaterMark", "parse_since"]
+
+# `--since` this, to list items modified since the last run.
+LASTRUN = "@lastrun"
+
+
+def parse_since(text: str) -> str:
+    """Return `text`, ``@lastrun`` or a time of `parse_time`; (an `argparse` ``type``)."""
+
+    return LASTRUN if text.strip().lower() == LASTRUN else parse_time(text)
+
+
+class HighWaterMark:
+    """Time of the last run of a listing, by an account; saved under the xdg data dir.
+
+    The mark is keyed by the account and the listing's ``scope``, e.g., ``files``,
+    so each incremental job resumes from its own last run.
+    """
+
+    # A run's mark is its start, less this allowance for skew between the local
+    # and drive clocks; so an item modified during a run is listed again, not missed.
+    SKEW = timedelta(minutes=1)
+
+    def __init__(self, account: str, scope: str, since: str) -> None:
+        """Start a run of `scope` by `account`, listing items modified after `since`.
+
+        `since` is from `parse_since`; with ``@lastrun``, and no last run, ``since``
+        is None, to list all items.
+        """
+
+        digest = hashlib.sha1((account + "\0" + scope).encode()).hexdigest()[:16]
+        self.path: Path = xdg.xdg_data_home() / "gdrive" / "since" / f"{digest}.json"
+        self.account = account
+        self.scope = scope
+        self.start = datetime.now(timezone.utc)
+
+        self.since: str | None = since
+        if since == LASTRUN:
+            self.since = self.last()
+            if not self.since:
+                logger.info("No last run of {!r}; listing all items", scope)
+
+    def last(self) -> str | None:
+        """Return the saved mark of the last run, or None."""
+
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                return str(json.load(fh)["time"])
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    def save(self) -> None:
+        """Save the mark of this run, atomically; once its listing is complete."""
+
+        mark = {
+            "account": self.account,
+            "scope": self.scope,
+            "time": format_time(self.start - self.SKEW),
+        }
+        logger.debug("Saving mark {!r} to {!r}", mark, str(self.path))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(mark) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
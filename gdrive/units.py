@@ -0,0 +1,46 @@
+"""Parse and format byte counts."""
+
+import re
+
+__all__ = ["format_size", "parse_size"]
+
+_KIBI = 1024
+_UNITS = "KMGTPE"
+
+# Show one decimal place for values below this; e.g., ``1.5M`` but ``15M``.
+_TENTHS_BELOW = 10
+
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d*)?)\s*(?:([KMGTPE])I?)?B?\s*$", re.IGNORECASE)
+
+
+def parse_size(text: str) -> int:
+    """Return number of bytes in `text`; e.g., ``512``, ``10K``, ``1.5M``, ``2GiB``.
+
+    Suffixes are binary multiples (``K`` is 1024). Raise ValueError if `text` is invalid;
+    (so that it may be used as an `argparse` ``type``).
+    """
+
+    match = _SIZE_RE.match(text)
+    if not match:
+        raise ValueError(f"Invalid size {text!r}")
+
+    number, unit = match.groups()
+    power = _UNITS.index(unit.upper()) + 1 if unit else 0
+    return int(float(number) * _KIBI**power)
+
+
+def format_size(nbytes: float, human_readable: bool = True) -> str:
+    """Return `nbytes` formatted for display; e.g., ``1.5M``, like ``du -h``."""
+
+    if not human_readable or abs(nbytes) < _KIBI:
+        return str(int(nbytes))
+
+    value = float(nbytes)
+    power = 0
+    while abs(value) >= _KIBI and power < len(_UNITS):
+        value /= _KIBI
+        power += 1
+
+    suffix = _UNITS[power - 1]
+
+    return f"{value:.1f}{suffix}" if abs(value) < _TENTHS_BELOW else f"{value:.0f}{suffix}"
@@ -0,0 +1,393 @@
+import threading
+from argparse import Namespace
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from gdrive.api import GoogleDriveAPI
+from gdrive.progress import Progress
+
+
+class _Files:
+    """Fake ``service.files()``; each corpus (by ``driveId``) has 3 pages of 2 items.
+
+    Every item is returned by every query, so time-range partitions overlap entirely.
+    """
+
+    def list(self, **parms: Any) -> Any:
+        drive = parms.get("driveId", "root")
+        page = int(parms.get("pageToken") or 0)
+        response: dict[str, Any] = {
+            "files": [
+                {
+                    "id": f"{drive}-{page}-{n}",
+                    "name": f"{page}-{n}",
+                    "parents": [drive],
+                    "modifiedTime": f"2024-01-0{page + 1}T00:00:0{n}.000Z",
+                }
+                for n in range(2)
+            ]
+        }
+        if page < 2:
+            response["nextPageToken"] = str(page + 1)
+        return SimpleNamespace(execute=lambda: response)
+
+    def get(self, **parms: Any) -> Any:
+        return SimpleNamespace(file_id=parms["fileId"])
+
+    def create(self, **parms: Any) -> Any:
+        return SimpleNamespace(file_id=None, body=parms["body"])
+
+    def get_media(self, **parms: Any) -> Any:
+        return SimpleNamespace(headers={}, execute=lambda num_retries: b"abc")
+
+    def update(self, **parms: Any) -> Any:
+        body = {"id": parms["fileId"], "name": ""} | parms.get("body", {})
+        return SimpleNamespace(file_id=None, body=body)
+
+
+# Folders visible to, but not listed for, the user; "hidden" can't be fetched at all.
+UNLISTED = {
+    "p1": {"id": "p1", "name": "P1", "parents": ["p2"]},
+    "p2": {"id": "p2", "name": "P2", "parents": ["hidden"]},
+}
+
+
+class _Batch:
+    """Fake batch request; counts batches executed."""
+
+    executed = 0
+
+    def __init__(self, callback: Any) -> None:
+        self.callback = callback
+        self.requests: list[Any] = []
+
+    def add(self, request: Any, request_id: str) -> None:
+        self.requests.append((request, request_id))
+
+    def execute(self) -> None:
+        _Batch.executed += 1
+        for request, request_id in self.requests:
+            if request.file_id is None:
+                body = request.body
+                self.callback(request_id, {"id": "id-" + body["name"]} | body, None)
+            elif request.file_id in UNLISTED:
+                self.callback(request_id, dict(UNLISTED[request.file_id]), None)
+            else:
+                self.callback(request_id, None, Exception("404"))
+
+
+@pytest.fixture(autouse=True)
+def _connect(monkeypatch: pytest.MonkeyPatch) -> None:
+    # each crawl thread makes its own connection.
+    monkeypatch.setattr(
+        "libgoogle.connect",
+        lambda *_: SimpleNamespace(files=_Files, new_batch_http_request=_Batch),
+    )
+
+
+def _api(drives: list[str], crawl_partitions: int = 1) -> GoogleDriveAPI:
+    api = GoogleDriveAPI.__new__(GoogleDriveAPI)
+    api.options = Namespace(
+        all_fields=False, shared_drives=True, crawl_partitions=crawl_partitions
+    )
+    api._local = threading.local()
+    api.progress = Progress("none")
+    api._shared_drives = [
+        {"id": x, "driveId": x, "name": x.upper(), "PATH": "/" + x.upper(), "PARENT": None}
+        for x in drives
+    ]
+    return api
+
+
+def test_partitions() -> None:
+    partitions = _api(["d1", "d2"])._partitions({"q": "not trashed"})
+    assert partitions[0] == {"q": "not trashed"}
+    assert [x["driveId"] for x in partitions[1:]] == ["d1", "d2"]
+    assert all(x["corpora"] == "drive" for x in partitions[1:])
+
+
+def test_partitions_by_time() -> None:
+    partitions = _api([], crawl_partitions=2)._partitions({"q": "not trashed"})
+    assert [x["q"] for x in partitions] == [
+        "not trashed and modifiedTime < '2024-01-01T00:00:01.000Z'",
+        "not trashed and modifiedTime >= '2024-01-01T00:00:01.000Z'",
+    ]
+
+
+def test_crawl_dedupes_partitions() -> None:
+    ids = [x["id"] for x in _api(["d1"], crawl_partitions=3)._crawl({"q": "not trashed"})]
+    assert len(ids) == len(set(ids)) == 12
+
+
+def test_crawl_all_partitions() -> None:
+    api = _api(["d1", "d2"])
+    ids = [x["id"] for x in api._crawl({"q": "not trashed"})]
+    assert len(ids) == len(set(ids)) == 18
+    assert {x.split("-")[0] for x in ids} == {"root", "d1", "d2"}
+
+
+def test_crawl_stop_early() -> None:
+    api = _api([f"d{n}" for n in range(8)])
+    crawl = api._crawl({"q": "not trashed"})
+    assert next(crawl)
+    crawl.close()  # must not hang on blocked producers.
+
+
+def test_resolve_parents() -> None:
+    api = _api([])
+    api._items_by_id = {}
+    api._shared_with_me_folder = {"id": "shared-with-me", "name": "Shared with me"}
+    api._shared_with_me_folder |= {"PATH": "/Shared with me", "PARENT": None}
+
+    items: list[dict[str, Any]] = [{"id": "f1", "name": "F1", "parents": ["p1"]}, {"id": "f2"}]
+    _Batch.executed = 0
+    found = api._resolve_parents(items)
+
+    # one batch for p1, one for p2, one for the unreachable parent of p2.
+    assert _Batch.executed == 3
+    assert [x["id"] for x in found] == ["p1", "p2"]
+
+    api._link_folders(found)
+    assert found[0]["PATH"] == "/Shared with me/P2/P1"
+    assert api._parent_of(items[0]) is found[0]
+
+
+def _api_with_folders() -> GoogleDriveAPI:
+    api = _api([])
+    root: dict[str, Any] = {
+        "id": "root",
+        "name": "My Drive",
+        "PATH": "/My Drive",
+        "PARENT": None,
+    }
+    shared: dict[str, Any] = {"id": "shared-with-me", "name": "Shared with me", "PARENT": None}
+    shared["PATH"] = "/Shared with me"
+    a: dict[str, Any] = {"id": "a", "name": "a", "PATH": "/My Drive/a", "PARENT": root}
+    api._root_folder, api._shared_with_me_folder = root, shared
+    api._items_by_id = {x["id"]: x for x in (root, shared, a)}
+    api._sort_folders()
+    return api
+
+
+def test_create_folders_by_level() -> None:
+    api = _api_with_folders()
+    args = Namespace(no_action=0)
+
+    _Batch.executed = 0
+    folders = api.create_folders(args, ["a/b/c", "/My Drive/a/b/d", "x", "a"])
+
+    # one batch per level; x, then a/b, then (a/b/c, a/b/d).
+    assert _Batch.executed == 3
+    assert sorted(folders) == [
+        "/My Drive/a",
+        "/My Drive/a/b/c",
+        "/My Drive/a/b/d",
+        "/My Drive/x",
+    ]
+    assert folders["/My Drive/a/b/c"]["PARENT"]["PATH"] == "/My Drive/a/b"
+    assert [x["PATH"] for x in api.all_folders] == [
+        "/My Drive",
+        "/My Drive/a",
+        "/My Drive/a/b",
+        "/My Drive/a/b/c",
+        "/My Drive/a/b/d",
+        "/My Drive/x",
+        "/Shared with me",
+    ]
+
+
+def test_create_folders_no_action() -> None:
+    api = _api_with_folders()
+    args = Namespace(no_action=1)
+
+    _Batch.executed = 0
+    folders = api.create_folders(args, ["a/b/c"])
+
+    assert _Batch.executed == 0
+    assert folders["/My Drive/a/b/c"]["FAKE-FOLDER"]
+    assert len(api.all_folders) == 3
+
+
+def test_rename_many_validates() -> None:
+    api = _api_with_folders()
+    items: list[dict[str, Any]] = [
+        {"id": "f", "name": "f", "parents": ["a"], "PATH": "/My Drive/a/f"},
+        {"id": "g", "name": "g", "parents": ["a"], "PATH": "/My Drive/a/g"},
+    ]
+    by_path = {x["PATH"]: x for x in items}
+    api._live_items_by_path = lambda paths, lookup=False: {  # type: ignore[method-assign]
+        x: by_path[x] for x in paths if x in by_path
+    }
+
+    results = api.rename_many(
+        Namespace(no_action=1),
+        [("a/f", "a/b/f"), ("a/f", "a/h"), ("a/g", "a/f"), ("a/x", "a/y"), ("a/g", "a/b/f")],
+    )
+
+    assert [x.get("error") for x in results] == [
+        None,
+        "Source already renamed",
+        "Target already exists",
+        "Can't find source",
+        "Target already exists",
+    ]
+
+    # a missing source, with an existing target, is done only if in doubt; (not a typo).
+    renames = [("a/x", "a/g")]
+    assert api.rename_many(Namespace(no_action=1), renames)[0]["error"] == "Can't find source"
+    assert api.rename_many(Namespace(no_action=1), renames, renames)[0]["id"] == "g"
+
+
+def test_rename_many_in_waves(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    api = _api_with_folders()
+    api._by_path = {
+        "/My Drive/a": {"id": "a", "name": "a", "parents": ["root"]},
+        "/My Drive/a/f": {"id": "f", "name": "f", "parents": ["a"]},
+    }
+
+    # the drive is as indexed.
+    assert api._by_path is not None
+    index = api._by_path
+    monkeypatch.setattr(
+        api,
+        "_get_items_by_id",
+        lambda ids: {x["id"]: dict(x) for x in index.values() if x["id"] in ids},
+    )
+    monkeypatch.setattr(api, "_get_items_at_path", lambda _: iter([]))
+
+    _Batch.executed = 0
+    results = api.rename_many(Namespace(no_action=0), [("a", "b"), ("b/f", "b/g")])
+
+    # b/f is found only after a is renamed, and its folder re-pathed.
+    assert _Batch.executed == 2
+    assert [x.get("error") for x in results] == [None, None]
+    assert sorted(index) == ["/My Drive/b", "/My Drive/b/g"]
+    assert [x["PATH"] for x in api.all_folders] == [
+        "/My Drive",
+        "/My Drive/b",
+        "/Shared with me",
+    ]
+    assert api.get_folder("b") is not None
+
+
+def test_trash_many_no_action(monkeypatch: pytest.MonkeyPatch) -> None:
+    api = _api_with_folders()
+    found = {"/My Drive/a/f": {"id": "f", "name": "f", "parents": ["a"]}}
+    monkeypatch.setattr(
+        api,
+        "_live_items_by_path",
+        lambda paths, lookup: {x: found[x] for x in paths if x in found},
+    )
+
+    results = api.trash_many(Namespace(no_action=1), ["a/f", "/My Drive/a/f", "a/x"])
+    assert [x.get("error") for x in results] == [
+        None,
+        "Source already trashed",
+        "Can't find source",
+    ]
+
+
+def test_fetch_range_progress() -> None:
+    api = _api([])
+    assert api.fetch_range({"id": "f", "name": "f"}, 0, 3) == b"abc"
+    assert (api.progress.files_done, api.progress.bytes_done) == (1, 3)
+
+
+def test_find_upload(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    api = _api_with_folders()
+    docx = tmp_path / "r.docx"
+    docx.write_bytes(b"not really a docx")
+    txt = tmp_path / "r.txt"
+    txt.write_bytes(b"text")
+    found = [
+        {"id": "doc", "name": "r.docx", "mimeType": "application/vnd.google-apps.document"},
+        {"id": "txt", "name": "r.txt", "mimeType": "text/plain", "md5Checksum": "x"},
+    ]
+    monkeypatch.setattr(api, "upload_folder_path", lambda args, file: "/My Drive/a")
+    monkeypatch.setattr(
+        api, "_search", lambda folder, name, files_only: [x for x in found if x["name"] == name]
+    )
+
+    # a converted google doc has no md5; it's found by its mimeType.
+    args = Namespace(add_timestamp=False, convert=True)
+    item = api.find_upload(args, SimpleNamespace(pathname=str(docx)))
+    assert item is not None
+    assert (item["id"], item["PATH"]) == ("doc", "/My Drive/a/r.docx")
+
+    # anything else, by its md5.
+    args = Namespace(add_timestamp=False, convert=False)
+    assert api.find_upload(args, SimpleNamespace(pathname=str(docx))) is None
+    assert api.find_upload(args, SimpleNamespace(pathname=str(txt))) is None
+    found[1]["md5Checksum"] = api.md5sum(str(txt))
+    item = api.find_upload(args, SimpleNamespace(pathname=str(txt)))
+    assert item is not None
+    assert item["id"] == "txt"
+
+
+def test_live_items_by_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    api = _api_with_folders()
+    index: dict[str, dict[str, Any]] = {
+        "/My Drive/a/f": {"id": "f", "name": "f", "parents": ["a"]},
+        "/My Drive/a/g": {"id": "g", "name": "g", "parents": ["a"]},
+        "/My Drive/a/t": {"id": "t", "name": "t", "parents": ["a"]},
+    }
+    api._by_path = dict(index)
+
+    # since the index was cached; g was moved, t was trashed, and n was created.
+    fetched: dict[str, dict[str, Any]] = {
+        "f": {"id": "f", "name": "f", "parents": ["a"]},
+        "g": {"id": "g", "name": "g", "parents": ["root"]},
+        "t": {"id": "t", "name": "t", "parents": ["a"], "trashed": True},
+    }
+    created = {"/My Drive/a/n": {"id": "n", "name": "n", "parents": ["a"]}}
+    monkeypatch.setattr(api, "_get_items_by_id", lambda ids: {x: fetched[x] for x in ids})
+    monkeypatch.setattr(
+        api, "_get_items_at_path", lambda x: iter([created[x]] if x in created else [])
+    )
+
+    paths = [*index, "/My Drive/a/n"]
+    assert sorted(api._live_items_by_path(paths)) == ["/My Drive/a/f"]
+    assert sorted(api._live_items_by_path(paths, lookup=True)) == [
+        "/My Drive/a/f",
+        "/My Drive/a/n",
+    ]
+    assert sorted(api._by_path) == ["/My Drive/a/f", "/My Drive/a/n"]
+
+
+def test_lookup_file_by_content_owned() -> None:
+    api = _api(["d1"])
+    api._items_by_md5 = None
+    api._items_by_md5_lock = threading.Lock()
+    api._all_files = [
+        {"id": "theirs", "md5Checksum": "m", "size": "1", "PATH": "/Shared with me/f"},
+        {"id": "drive", "md5Checksum": "m", "size": "1", "driveId": "d1", "PATH": "/D1/f"},
+        {
+            "id": "mine",
+            "md5Checksum": "m",
+            "size": "1",
+            "ownedByMe": True,
+            "PATH": "/My Drive/f",
+        },
+    ]
+
+    assert api._lookup_file_by_content("m", 1) == api._all_files[2]
+    assert api._lookup_file_by_content("m", 1, "d1") == api._all_files[1]
+    assert api._lookup_file_by_content("m", 1, "d2") is None
+    assert api._lookup_file_by_content("m", 2) is None
+
+
+def test_normalize_drive_path() -> None:
+    api = _api(["d1"])
+    api._root_folder = {"id": "root", "name": "My Drive", "PATH": "/My Drive"}
+    api._shared_with_me_folder = {"id": "shared-with-me", "name": "Shared with me"}
+
+    assert api._normalize_drive_path("") == "/My Drive"
+    assert api._normalize_drive_path("a/") == "/My Drive/a"
+    assert api._normalize_drive_path("Shared with me/a") == "/Shared with me/a"
+    # only an absolute path is from a shared drive; a relative one, from My Drive.
+    assert api._normalize_drive_path("/D1/a") == "/D1/a"
+    assert api._normalize_drive_path("D1/a") == "/My Drive/D1/a"
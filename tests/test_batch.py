@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+from typing import Any
+
+import httplib2  # type: ignore[import-untyped]
+import pytest
+from googleapiclient.errors import HttpError  # type: ignore[import-untyped]
+
+from gdrive.batch import BatchExecutor
+
+
+def _error(status: int, reason: str = "") -> HttpError:
+    return HttpError(httplib2.Response({"status": status}), reason.encode())
+
+
+class _Service:
+    """Fake service; request ``n`` fails with ``failures[n]``, once each, if any."""
+
+    def __init__(self, failures: dict[str, HttpError]) -> None:
+        self.failures = failures
+        self.batches: list[list[str]] = []
+
+    def new_batch_http_request(self, callback: Any) -> Any:
+        requests: list[str] = []
+
+        def execute() -> None:
+            self.batches.append(requests)
+            for request_id in requests:
+                error = self.failures.pop(request_id, None)
+                callback(request_id, None if error else {"id": request_id}, error)
+
+        return SimpleNamespace(
+            add=lambda request, request_id: requests.append(request_id),
+            execute=execute,
+        )
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("time.sleep", lambda _: None)
+
+
+def test_batches_of_100() -> None:
+    service = _Service({})
+    responses, errors = BatchExecutor(service).execute({str(n): None for n in range(250)})
+    assert [len(x) for x in service.batches] == [100, 100, 50]
+    assert len(responses) == 250
+    assert not errors
+
+
+def test_retries_only_failed() -> None:
+    service = _Service(
+        {
+            "1": _error(503),
+            "2": _error(403, "rateLimitExceeded"),
+            "3": _error(404),
+            "4": _error(403, "insufficientFilePermissions"),
+        }
+    )
+    executor = BatchExecutor(service)
+    responses, errors = executor.execute({str(n): None for n in range(6)})
+
+    assert service.batches[1] == ["1", "2"]
+    assert sorted(responses) == ["0", "1", "2", "5"]
+    assert sorted(errors) == ["3", "4"]
+    assert executor.stats == {"batches": 2, "requests": 8, "retries": 2}
+
+
+def test_batch_failure() -> None:
+    service = _Service({})
+    make_batch = service.new_batch_http_request
+
+    def new_batch_http_request(callback: Any) -> Any:
+        # the transport fails after the first answer.
+        def answer_one(request_id: str, response: Any, exception: Any) -> None:
+            callback(request_id, response, exception)
+            raise ConnectionResetError("reset")
+
+        return make_batch(answer_one)
+
+    service.new_batch_http_request = new_batch_http_request  # type: ignore[method-assign]
+    responses, errors = BatchExecutor(service).execute({str(n): None for n in range(3)})
+
+    assert sorted(responses) == ["0"]
+    assert sorted(errors) == ["1", "2"]
+    assert isinstance(errors["1"], ConnectionResetError)
@@ -0,0 +1,74 @@
+import argparse
+import io
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from gdrive.bundle import Bundle, IterStream, coalesce, decode_segment
+from gdrive.commands.uploaddir import DriveUploaddirCmd
+
+
+@pytest.fixture(name="files")
+def fixture_files(tmp_path: Path) -> list[tuple[str, str]]:
+    files = []
+    for n, size in enumerate([0, 1, 511, 512, 5000]):
+        path = tmp_path / f"f{n}"
+        path.write_bytes(bytes([n]) * size)
+        files.append((str(path), f"dir/f{n}"))
+    return files
+
+
+@pytest.mark.parametrize("compression", [None, "zstd"])
+def test_bundle(files: list[tuple[str, str]], compression: str | None) -> None:
+    if compression:
+        pytest.importorskip("zstandard")
+    bundle = Bundle("b.tar", compression)
+    content = IterStream(bundle.segments(files)).read()
+    assert len(content) == bundle.offset
+
+    members = Bundle.members_of(bundle.manifest())
+    assert [x["name"] for x in members] == [x[1] for x in files]
+
+    # any member decodes alone, from its byte range.
+    for member, (pathname, _) in zip(members, files, strict=True):
+        segment = content[member["offset"] : member["offset"] + member["length"]]
+        info, data = decode_segment(segment, compression)
+        assert info.name == member["name"]
+        assert data == Path(pathname).read_bytes()
+
+    # and together, they're a valid archive.
+    if not compression:
+        with tarfile.open(fileobj=io.BytesIO(content)) as tar:
+            assert tar.getnames() == [x[1] for x in files]
+
+
+def test_coalesce() -> None:
+    members = [
+        {"name": "c", "offset": 5000, "length": 100},
+        {"name": "a", "offset": 0, "length": 1000},
+        {"name": "b", "offset": 1500, "length": 1000},
+    ]
+    ranges = [
+        (start, end, [x["name"] for x in group]) for start, end, group in coalesce(members, 1000)
+    ]
+    assert ranges == [(0, 2500, ["a", "b"]), (5000, 5100, ["c"])]
+
+
+def test_arcnames(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "x").mkdir()
+    monkeypatch.chdir(tmp_path / "x")
+    cmd = DriveUploaddirCmd.__new__(DriveUploaddirCmd)
+    cmd.parser = argparse.ArgumentParser()
+
+    cmd.options = argparse.Namespace(path=["../y", "a"])
+    assert cmd._arcnames(["../y/b/c", "a/d", "a"]) == {
+        "../y/b/c": "y/b/c",
+        "a/d": "a/d",
+        "a": "a",
+    }
+
+    # `../a/d` and `a/d` would be one member.
+    cmd.options = argparse.Namespace(path=["../a", "a"])
+    with pytest.raises(SystemExit):
+        cmd._arcnames(["../a/d", "a/d"])
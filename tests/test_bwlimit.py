@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from gdrive.bwlimit import BandwidthLimit, parse_schedule
+
+
+def test_parse_schedule() -> None:
+    assert parse_schedule("5M") == [(0, 5 << 20)]
+    assert parse_schedule("18:00,off 08:30,512K") == [(510, 512 << 10), (1080, None)]
+
+    for text in ["", "25:00,1M", "08:00", "08:00,1M 5M", "8,1M"]:
+        with pytest.raises(ValueError, match="Invalid"):
+            parse_schedule(text)
+
+
+def test_windows(monkeypatch: pytest.MonkeyPatch) -> None:
+    limit = BandwidthLimit(parse_schedule("08:00,5M 18:00,off"))
+
+    def at(hour: int) -> int | None:
+        monkeypatch.setattr(
+            "time.localtime", lambda: time.struct_time((0, 0, 0, hour, 0, 0, 0, 0, 0))
+        )
+        return limit.rate()
+
+    assert at(3) is None  # yesterday's last window.
+    assert at(8) == 5 << 20
+    assert at(17) == 5 << 20
+    assert at(18) is None
+
+
+def test_consume(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [0.0]
+
+    def sleep(seconds: float) -> None:
+        now[0] += seconds
+
+    monkeypatch.setattr("time.sleep", sleep)
+    limit = BandwidthLimit(parse_schedule("1000"), clock=lambda: now[0])
+
+    for _ in range(10):
+        limit.consume(500)
+    # 5000 bytes at 1000/s; the first chunk is not free, (the bucket starts empty).
+    assert now[0] == pytest.approx(5.0)
+
+    # idling fills the bucket to no more than one second's worth.
+    now[0] += 60
+    limit.consume(1000)
+    assert now[0] == pytest.approx(65.0)
+    limit.consume(1000)
+    assert now[0] == pytest.approx(66.0)
@@ -0,0 +1,54 @@
+import os
+from pathlib import Path
+
+from gdrive.cache import ContentCache
+
+FILE = {"id": "abc", "md5Checksum": "0123", "modifiedTime": "2024", "PATH": "/My Drive/f"}
+
+
+def test_key_changes_with_version() -> None:
+    key = ContentCache.key(FILE)
+    assert key != ContentCache.key({**FILE, "md5Checksum": "4567"})
+    assert key != ContentCache.key(FILE, "text/csv")
+
+
+def test_put_get(tmp_path: Path) -> None:
+    cache = ContentCache(tmp_path / "cache", 1024)
+    source = tmp_path / "source"
+    source.write_bytes(b"content")
+    target = tmp_path / "target"
+
+    key = ContentCache.key(FILE)
+    assert not cache.get(key, str(target))
+    cache.put(key, str(source), FILE)
+    assert cache.get(key, str(target))
+    assert target.read_bytes() == b"content"
+
+    [(_, stats, info)] = cache.entries()
+    assert stats.st_size == 7
+    assert info["PATH"] == FILE["PATH"]
+
+
+def test_evict_least_recently_used(tmp_path: Path) -> None:
+    cache = ContentCache(tmp_path / "cache", 10)
+    source = tmp_path / "source"
+    source.write_bytes(b"12345")
+
+    keys = [ContentCache.key({**FILE, "id": str(x)}) for x in range(3)]
+    for age, key in enumerate(keys[:2]):
+        cache.put(key, str(source), FILE)
+        os.utime(cache._path(key), (age, age))
+
+    cache.put(keys[2], str(source), FILE)  # exceeds 10 bytes; evicts keys[0].
+    assert not cache.get(keys[0], str(tmp_path / "target"))
+    assert cache.get(keys[1], str(tmp_path / "target"))
+    assert cache.clear() == 10
+
+
+def test_put_too_large(tmp_path: Path) -> None:
+    cache = ContentCache(tmp_path / "cache", 4)
+    source = tmp_path / "source"
+    source.write_bytes(b"12345")
+
+    cache.put(ContentCache.key(FILE), str(source), FILE)
+    assert not list(cache.entries())
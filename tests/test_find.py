@@ -0,0 +1,34 @@
+from argparse import Namespace
+from types import SimpleNamespace
+from typing import Any
+
+from gdrive.commands.find import DriveFindCmd
+from gdrive.query import parse_time
+
+
+def _cmd(**kwargs: Any) -> DriveFindCmd:
+    cmd = DriveFindCmd.__new__(DriveFindCmd)
+    options = dict.fromkeys(
+        ["name", "iname", "regex", "mime", "type", "newer", "older", "min_size", "max_size"]
+    )
+    cmd.options = Namespace(**(options | kwargs))
+    cmd.cli = SimpleNamespace(api=SimpleNamespace(is_folder=lambda _: False))  # type: ignore[assignment]
+    return cmd
+
+
+def test_predicate_times() -> None:
+    old = {"name": "old", "modifiedTime": "2024-01-01T00:00:00.000Z"}
+    new = {"name": "new", "modifiedTime": "2024-07-01T00:00:00.000Z"}
+    # e.g., `Shared with me`.
+    pseudo = {"name": "Shared with me", "modifiedTime": "-"}
+    items = [old, new, pseudo]
+
+    predicate = _cmd(newer=parse_time("2024-06-01T00:00:00+00:00"))._predicate()
+    assert [x["name"] for x in items if predicate(x)] == ["new"]
+
+    predicate = _cmd(older=parse_time("2024-06-01T00:00:00+00:00"))._predicate()
+    assert [x["name"] for x in items if predicate(x)] == ["old"]
+
+    # no time given; all match.
+    predicate = _cmd()._predicate()
+    assert [x["name"] for x in items if predicate(x)] == ["old", "new", "Shared with me"]
@@ -34,6 +34,8 @@ def drive_() -> GoogleDriveAPI:
         no_action=True,
         target_folder=None,
         target_basename=None,
+        progress="none",
+        bwlimit=None,
     )
     return GoogleDriveAPI(options)
 
@@ -279,3 +281,49 @@ def test_list_long_listing_root() -> None:
 
 def test_list_pretty_print_limit_2_root() -> None:
     run_cli(["list", "--pretty-print", "--limit", "2", "/"])
+
+
+# -------------------------------------------------------------------------------
+
+
+@slow
+def test_dupes_min_size_limit_2() -> None:
+    run_cli(["dupes", "--min-size", "1M", "--human-readable", "--limit", "2"])
+
+
+# -------------------------------------------------------------------------------
+
+
+@slow
+def test_du_max_depth_1() -> None:
+    run_cli(["du", "--max-depth", "1", "--sort", "size", "--human-readable", "/"])
+
+
+# -------------------------------------------------------------------------------
+
+
+@slow
+def test_find_iname_refresh() -> None:
+    run_cli(["find", "--refresh", "--iname", "*test*", "--type", "d", "/"])
+
+
+# -------------------------------------------------------------------------------
+
+
+@slow
+def test_watch_once() -> None:
+    run_cli(["watch", "--once", "/test-data"])
+
+
+# -------------------------------------------------------------------------------
+
+
+def test_cache_list() -> None:
+    run_cli(["cache", "--list", "--human-readable"])
+
+
+# -------------------------------------------------------------------------------
+
+
+def test_cat() -> None:
+    run_cli(["cat", "/test-data/test-doc"])
@@ -0,0 +1,81 @@
+from pathlib import Path
+from typing import Any
+
+from gdrive.index import DriveIndex
+
+FOLDER = "application/vnd.google-apps.folder"
+
+
+def _item(item_id: str, path: str, parent: str | None = None) -> dict[str, Any]:
+    return {
+        "id": item_id,
+        "name": path.rsplit("/", 1)[1],
+        "PATH": path,
+        "parents": [parent] if parent else [],
+        "mimeType": FOLDER if "." not in path else "text/plain",
+    }
+
+
+ITEMS = [
+    _item("root", "/My Drive"),
+    _item("a", "/My Drive/a", "root"),
+    _item("ab", "/My Drive/a b", "root"),
+    _item("a.txt", "/My Drive/a.txt", "root"),
+    _item("x", "/My Drive/a/Annual-Report.pdf", "a"),
+    _item("y", "/My Drive/a/notes.txt", "a"),
+    _item("z", "/My Drive/a b/report.txt", "ab"),
+    _item("shared-with-me", "/Shared with me"),
+]
+
+
+def _paths(index: DriveIndex, path: str, pattern: str | None = None) -> list[str]:
+    fragments = index.glob_fragments(pattern) if pattern else None
+    return [x["PATH"] for x in index.find(path, fragments=fragments)]
+
+
+def test_subtree_excludes_siblings() -> None:
+    index = DriveIndex(ITEMS)
+    assert _paths(index, "/My Drive/a") == [
+        "/My Drive/a",
+        "/My Drive/a/Annual-Report.pdf",
+        "/My Drive/a/notes.txt",
+    ]
+
+
+def test_glob_fragments() -> None:
+    assert DriveIndex.glob_fragments("*Report*.p[dD]f") == ["report", "p", "f"]
+
+
+def test_find_by_fragment() -> None:
+    index = DriveIndex(ITEMS)
+    assert _paths(index, "/My Drive", "*port*") == [
+        "/My Drive/a b/report.txt",
+        "/My Drive/a/Annual-Report.pdf",
+    ]
+    assert _paths(index, "/My Drive", "*nothing*") == []
+
+    # fragments shorter, and longer, than an n-gram.
+    assert _paths(index, "/My Drive", "*nu*l-re*") == ["/My Drive/a/Annual-Report.pdf"]
+    assert _paths(index, "/My Drive", "*annual*report*") == ["/My Drive/a/Annual-Report.pdf"]
+
+
+def test_normalize_path() -> None:
+    index = DriveIndex(ITEMS)
+    assert index.normalize_path("") == "/My Drive"
+    assert index.normalize_path("a/") == "/My Drive/a"
+    assert index.normalize_path("/Shared with me") == "/Shared with me"
+
+    drive = _item("d1", "/D1") | {"driveId": "d1"}
+    index = DriveIndex([*ITEMS, drive])
+    assert index.normalize_path("/D1/x") == "/D1/x"
+    assert index.normalize_path("D1/x") == "/My Drive/D1/x"
+
+
+def test_save_load(tmp_path: Path) -> None:
+    path = tmp_path / "index.jsonl"
+    DriveIndex(ITEMS).save(path)
+    index = DriveIndex.load(path)
+    assert index is not None
+    notes = next(index.find("/My Drive/a/notes.txt"))
+    assert notes["PARENT"]["PATH"] == "/My Drive/a"
+    assert DriveIndex.load(tmp_path / "missing.jsonl") is None
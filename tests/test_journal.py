@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pytest
+
+from gdrive.journal import Journal
+
+
+@pytest.fixture(name="listfile")
+def fixture_listfile(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> str:
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    path = tmp_path / "list.jsonl"
+    path.write_text('{"src": "a"}\n{"src": "b"}\n{"src": "c"}\n', encoding="utf-8")
+    return str(path)
+
+
+def test_resume(listfile: str) -> None:
+    with Journal(listfile) as journal:
+        journal.record("1", "pending")
+        journal.record("1", "done", id="id-1")
+        journal.record("2", "pending")
+        journal.record("3", "failed", error="oops")
+
+    journal = Journal(listfile, readonly=True)
+    assert journal.is_done("1")
+    assert journal.records["1"]["id"] == "id-1"
+    assert journal.state("2") == "pending"
+    assert journal.state("3") == "failed"
+    assert journal.state("4") is None
+
+
+def test_torn_write(listfile: str) -> None:
+    with Journal(listfile) as journal:
+        journal.record("1", "done")
+    with open(journal.path, "a", encoding="utf-8") as fh:
+        fh.write('{"key": "2", "sta')
+
+    with Journal(listfile) as journal:
+        assert journal.state("2") is None
+        journal.record("3", "done")
+
+    journal = Journal(listfile, readonly=True)
+    assert journal.is_done("1")
+    assert journal.is_done("3")
+
+
+def test_edited_list_resumes(listfile: str) -> None:
+    with Journal(listfile) as journal:
+        journal.record("/My Drive/a", "done")
+
+    with open(listfile, "a", encoding="utf-8") as fh:
+        fh.write('{"src": "d"}\n')
+    assert Journal(listfile, readonly=True).is_done("/My Drive/a")
+
+
+def test_discard(listfile: str) -> None:
+    with Journal(listfile) as journal:
+        journal.record("1", "done")
+        journal.discard()
+        journal.record("2", "done")
+
+    assert list(Journal(listfile, readonly=True).records) == ["2"]
@@ -0,0 +1,15 @@
+from gdrive.lanes import Lanes
+
+
+def test_lanes() -> None:
+    lanes = Lanes(len, small_workers=8, large_workers=0, threshold=3)
+    assert lanes.workers == {"small": 8, "large": 1}
+    assert lanes.route("abc") == "small"
+    assert lanes.route("abcd") == "large"
+
+    upper = lanes.timed(str.upper)
+    assert [upper(x) for x in ["a", "bc", "defg"]] == ["A", "BC", "DEFG"]
+
+    small, large = lanes.summary()
+    assert small.startswith("small lane: 2 files (3B)")
+    assert large.startswith("large lane: 1 files (4B)")
@@ -0,0 +1,161 @@
+import hashlib
+import io
+import re
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import httplib2  # type: ignore[import-untyped]
+import pytest
+
+from gdrive.api import GoogleDriveAPI
+from gdrive.media import CHUNK_MULTIPLE, ChunkSizer, MediaReader, StreamUpload
+
+CONTENT = bytes(range(256)) * 10
+
+
+class _Http:
+    """Serve ranges of `CONTENT`, like `get_media`."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.ranges: list[str] = []
+
+    def request(self, uri: str, method: str = "GET", **kwargs: Any) -> tuple[Any, bytes]:
+        self.requests += 1
+        self.ranges.append(kwargs["headers"]["range"])
+        match = re.match(r"bytes=(\d+)-(\d+)", kwargs["headers"]["range"])
+        assert match
+        start, end = int(match[1]), min(int(match[2]), len(CONTENT) - 1)
+        resp = httplib2.Response(
+            {"status": 206, "content-range": f"bytes {start}-{end}/{len(CONTENT)}"}
+        )
+        return resp, CONTENT[start : end + 1]
+
+
+def test_media_reader_chunks() -> None:
+    http = _Http()
+    request = SimpleNamespace(http=http, uri="https://example.com", headers={})
+    reader = io.BufferedReader(MediaReader(request, chunksize=1000))
+
+    assert reader.read(10) == CONTENT[:10]
+    assert reader.read() == CONTENT[10:]
+    assert reader.read() == b""
+    assert http.requests == 3
+
+
+@pytest.mark.parametrize("nchunks", [1.5, 2])
+def test_stream_upload_short_read_at_end(nchunks: float) -> None:
+    size = int(CHUNK_MULTIPLE * nchunks)
+    media = StreamUpload(io.BytesIO(b"x" * size), chunksize=CHUNK_MULTIPLE)
+    assert media.size() is None
+
+    offset = 0
+    while True:
+        data = media.getbytes(offset, media.chunksize())
+        offset += len(data)
+        if len(data) < media.chunksize():
+            break  # `next_chunk` finishes the upload.
+    assert offset == size
+
+
+def test_stream_upload_resends_unacknowledged() -> None:
+    media = StreamUpload(io.BytesIO(bytes(range(256)) * 4096), chunksize=CHUNK_MULTIPLE)
+    first = media.getbytes(0, CHUNK_MULTIPLE)
+    assert media.getbytes(0, CHUNK_MULTIPLE) == first  # retry.
+    assert media.getbytes(1000, 10) == first[1000:1010]  # partly acknowledged.
+    with pytest.raises(ValueError, match="rewind"):
+        media.getbytes(0, 10)
+
+
+def test_fetch_resumes_and_verifies(tmp_path: Path) -> None:
+    md5 = hashlib.md5(CONTENT).hexdigest()
+    target = tmp_path / "target"
+    (tmp_path / f".target.{md5[:8]}.partial").write_bytes(CONTENT[:1000])
+
+    http = _Http()
+    request = SimpleNamespace(http=http, uri="https://example.com", headers={})
+    assert GoogleDriveAPI._fetch(request, str(target), md5)
+
+    assert http.ranges[0].startswith("bytes=1000-")
+    assert target.read_bytes() == CONTENT
+    assert [x.name for x in tmp_path.iterdir()] == ["target"]
+
+
+def test_fetch_complete_partial(tmp_path: Path) -> None:
+    md5 = hashlib.md5(CONTENT).hexdigest()
+    target = tmp_path / "target"
+    partial = tmp_path / f".target.{md5[:8]}.partial"
+
+    # complete; renamed without a request.
+    partial.write_bytes(CONTENT)
+    http = _Http()
+    request = SimpleNamespace(http=http, uri="https://example.com", headers={})
+    assert GoogleDriveAPI._fetch(request, str(target), md5, size=len(CONTENT))
+    assert not http.ranges
+    assert target.read_bytes() == CONTENT
+
+    # complete, but corrupt; fetched again, from the start.
+    partial.write_bytes(bytes(len(CONTENT)))
+    assert GoogleDriveAPI._fetch(request, str(target), md5, size=len(CONTENT))
+    assert http.ranges[0].startswith("bytes=0-")
+    assert target.read_bytes() == CONTENT
+    assert [x.name for x in tmp_path.iterdir()] == ["target"]
+
+
+def test_fetch_checksum_mismatch(tmp_path: Path) -> None:
+    target = tmp_path / "target"
+    request = SimpleNamespace(http=_Http(), uri="https://example.com", headers={})
+    assert not GoogleDriveAPI._fetch(request, str(target), "0" * 32)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_chunk_sizer_adapts() -> None:
+    mib = 1 << 20
+    sizer = ChunkSizer(3 * mib + 1, minimum=1000, maximum=8 * mib)
+    assert (sizer.minimum, sizer.size) == (CHUNK_MULTIPLE, 3 * mib)
+
+    sizer._adapt(sizer.size, sizer.size, 0.1)  # fast; grow.
+    assert sizer.size == 6 * mib
+    sizer._adapt(sizer.size, sizer.size, 0.1)  # within maximum.
+    assert sizer.size == 8 * mib
+    sizer._adapt(sizer.size, 100, 0.1)  # short, last chunk; no change.
+    assert sizer.size == 8 * mib
+    sizer._adapt(sizer.size, sizer.size, 60)  # slow; shrink.
+    assert sizer.size == 4 * mib
+
+
+def test_chunk_sizer_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("time.sleep", lambda _: None)
+    sizer = ChunkSizer(4 * CHUNK_MULTIPLE, CHUNK_MULTIPLE, 4 * CHUNK_MULTIPLE, retries=2)
+    attempts: list[int] = []
+
+    def transfer(size: int) -> int:
+        attempts.append(size)
+        if len(attempts) < 3:
+            raise ConnectionResetError
+        return size
+
+    assert sizer.next_chunk(transfer, lambda: 0) == CHUNK_MULTIPLE
+    assert attempts == [4 * CHUNK_MULTIPLE, 2 * CHUNK_MULTIPLE, CHUNK_MULTIPLE]
+    assert sizer.errors == 2
+    assert sizer.sizes == {CHUNK_MULTIPLE: 1}
+
+    def fail(size: int) -> int:
+        attempts.append(size)
+        raise ConnectionResetError
+
+    attempts.clear()
+    with pytest.raises(ConnectionResetError):
+        sizer.next_chunk(fail, lambda: 0)
+    assert len(attempts) == 3  # first try, and 2 retries.
+
+    def disk_full(size: int) -> int:
+        attempts.append(size)
+        raise OSError(28, "No space left on device")
+
+    # not of the network; not retried.
+    attempts.clear()
+    with pytest.raises(OSError, match="No space"):
+        sizer.next_chunk(disk_full, lambda: 0)
+    assert len(attempts) == 1
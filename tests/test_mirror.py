@@ -0,0 +1,101 @@
+import hashlib
+from argparse import Namespace
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from gdrive.api import GoogleDriveAPI
+from gdrive.mirror import Mirror
+
+REMOTE = "/My Drive/backup"
+
+
+def _remote(name: str, content: bytes, item_id: str) -> dict[str, Any]:
+    return {
+        "id": item_id,
+        "name": name,
+        "PATH": f"{REMOTE}/{name}",
+        "md5Checksum": hashlib.md5(content).hexdigest(),
+        "modifiedTime": "2000-01-01T00:00:00.000Z",
+    }
+
+
+def _mirror(local: Path, remote_files: list[dict[str, Any]]) -> Mirror:
+    api: Any = SimpleNamespace(
+        all_files=remote_files,
+        normalize_path=lambda _: REMOTE,
+        md5sum=GoogleDriveAPI.md5sum,
+    )
+    return Mirror(api, Namespace(no_action=0), str(local), REMOTE)
+
+
+def _ops(actions: list[dict[str, Any]]) -> list[tuple[str, str]]:
+    return sorted((x["op"], x["path"]) for x in actions)
+
+
+@pytest.fixture(name="local")
+def fixture_local(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    local = tmp_path / "local"
+    local.mkdir()
+    (local / "same.txt").write_bytes(b"same")
+    (local / "new.txt").write_bytes(b"new")
+    return local
+
+
+def _record_all(mirror: Mirror) -> None:
+    """Pretend the first sync was applied, by recording every file as in sync."""
+    for relpath, item in mirror.remote_files.items():
+        mirror.state.put(relpath, mirror._local_record(relpath, item))
+    mirror.state.commit()
+
+
+def test_first_sync(local: Path) -> None:
+    mirror = _mirror(local, [_remote("same.txt", b"same", "1"), _remote("far.txt", b"far", "2")])
+    assert _ops(mirror.plan()) == [
+        ("download", "far.txt"),
+        ("record", "same.txt"),
+        ("upload", "new.txt"),
+    ]
+
+
+def test_local_delete_and_move(local: Path) -> None:
+    (local / "new.txt").unlink()
+    (local / "gone.txt").write_bytes(b"gone")
+    remote = [_remote("same.txt", b"same", "1"), _remote("gone.txt", b"gone", "3")]
+    mirror = _mirror(local, remote)
+    mirror.scan()
+    _record_all(mirror)
+
+    (local / "gone.txt").unlink()
+    (local / "same.txt").rename(local / "moved.txt")
+    assert _ops(_mirror(local, remote).plan()) == [
+        ("move-remote", "moved.txt"),
+        ("trash-remote", "gone.txt"),
+    ]
+
+
+def test_conflict_keeps_older(local: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    remote = [_remote("same.txt", b"same", "1")]
+    mirror = _mirror(local, remote)
+    mirror.scan()
+    _record_all(mirror)
+
+    # changed on both sides; the drive's (in 2000) is older.
+    (local / "same.txt").write_bytes(b"local edit")
+    remote = [_remote("same.txt", b"remote edit", "1")]
+    mirror = _mirror(local, remote)
+    [action] = [x for x in mirror.plan() if x["path"] == "same.txt"]
+    assert action["op"] == "update-remote"
+    assert action["conflict"] == f"same (conflict {mirror.stamp}).txt"
+
+    # had the drive's been newer; the local version is kept, and the drive's downloaded.
+    def download_file(_: Any, item: dict[str, Any], pathname: str) -> None:
+        Path(pathname).write_bytes(b"remote edit")
+
+    monkeypatch.setattr(mirror.api, "download_file", download_file, raising=False)
+    mirror._download(action | {"op": "update-local"})
+    assert (local / "same.txt").read_bytes() == b"remote edit"
+    assert (local / action["conflict"]).read_bytes() == b"local edit"
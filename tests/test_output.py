@@ -0,0 +1,54 @@
+import io
+import json
+from typing import Any
+
+import pytest
+
+from gdrive.output import ItemWriter
+
+ROOT: dict[str, Any] = {"id": "root", "name": "My Drive", "PATH": "/My Drive", "PARENT": None}
+ITEM: dict[str, Any] = {
+    "id": "abc",
+    "name": "a, b\nc",
+    "mimeType": "text/plain",
+    "modifiedTime": "2024-01-02T03:04:05.000Z",
+    "lastModifyingUser": {"displayName": "Someone"},
+    "PATH": "/My Drive/a, b\nc",
+    "PARENT": ROOT,
+}
+
+
+def _write(fmt: str, fields: list[str] | None = None) -> str:
+    stream = io.StringIO()
+    with ItemWriter(fmt, fields, stream) as writer:
+        writer.write(ITEM)
+    return stream.getvalue()
+
+
+def test_jsonl_strips_parent() -> None:
+    obj = json.loads(_write("jsonl"))
+    assert "PARENT" not in obj
+    assert obj["PATH"] == ITEM["PATH"]
+
+
+def test_jsonl_nested_fields() -> None:
+    obj = json.loads(_write("jsonl", ["id", "lastModifyingUser/displayName", "bogus"]))
+    assert obj == {"id": "abc", "lastModifyingUser/displayName": "Someone", "bogus": None}
+
+
+def test_csv_quotes_names() -> None:
+    lines = _write("csv", ["id", "PATH"])
+    assert lines == 'id,PATH\nabc,"/My Drive/a, b\nc"\n'
+
+
+def test_tsv_header() -> None:
+    assert _write("tsv").splitlines()[0].split("\t")[0] == "PATH"
+
+
+def test_print0() -> None:
+    assert _write("print0") == ITEM["PATH"] + "\0"
+
+
+def test_bogus_format() -> None:
+    with pytest.raises(ValueError, match="Unknown format"):
+        ItemWriter("bogus", stream=io.StringIO())
@@ -0,0 +1,75 @@
+import threading
+from collections.abc import Iterator
+
+from gdrive.pipeline import Pipeline
+
+
+def test_stages() -> None:
+    batches: list[int] = []
+
+    def batch(items: list[int]) -> list[int]:
+        batches.append(len(items))
+        return [x * 10 for x in items]
+
+    def fail_on_3(x: int) -> int:
+        if x == 3:
+            raise ValueError(x)
+        return x
+
+    pipeline = (
+        Pipeline(range(100), maxsize=5)
+        .add_stage("odd", lambda x: x if x % 2 else None, workers=4)
+        .add_stage("fail", fail_on_3, workers=3)
+        .add_batch_stage("batch", batch, batch_size=7)
+        .add_stage("plus", lambda x: x + 1, workers=2)
+    )
+
+    assert sorted(pipeline.run()) == [x * 10 + 1 for x in range(1, 100, 2) if x != 3]
+    assert max(batches) <= 7
+    assert sum(batches) == 49
+
+
+def test_backpressure() -> None:
+    produced = []
+    release = threading.Event()
+
+    def source() -> Iterator[int]:
+        for n in range(1000):
+            produced.append(n)
+            yield n
+
+    def slow(x: int) -> int:
+        release.wait()
+        return x
+
+    run = Pipeline(source(), maxsize=10).add_stage("slow", slow).run()
+    threading.Timer(0.2, release.set).start()
+    first = next(run)
+
+    # the source is held back by the queue; one in the stage, and 10 queued on each side.
+    assert first == 0
+    assert len(produced) <= 25
+    assert len(list(run)) == 999
+
+
+def test_lanes() -> None:
+    release = threading.Event()
+    small_done = []
+
+    def transfer(x: int) -> int:
+        if x >= 1000:
+            release.wait()
+        else:
+            small_done.append(x)
+            if len(small_done) == 50:
+                release.set()
+        return x
+
+    # the large items block until all small ones are done; small ones mustn't queue behind them.
+    pipeline = Pipeline([1000, 1001, *range(50)], maxsize=5).add_lanes_stage(
+        "transfer",
+        transfer,
+        {"small": 3, "large": 1},
+        lambda x: "large" if x >= 1000 else "small",
+    )
+    assert sorted(pipeline.run()) == [*range(50), 1000, 1001]
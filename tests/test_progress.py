@@ -0,0 +1,57 @@
+import io
+import json
+import threading
+
+from gdrive.progress import Progress
+
+
+def test_totals() -> None:
+    progress = Progress("none")
+    progress.expect(3, 3000)
+    progress.skip(1000)
+
+    def worker(name: str) -> None:
+        transfer = progress.start(name, 1000)
+        for done in range(100, 1001, 100):
+            transfer.update(done)
+        transfer.finish(name != "b")
+
+    threads = [threading.Thread(target=worker, args=(x,)) for x in "ab"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    record = progress.snapshot()
+    assert record["files_done"] == 2
+    assert record["files_failed"] == 1
+    assert record["files_active"] == 0
+    assert record["bytes_done"] == 2000
+    assert record["bytes_skipped"] == 1000
+    assert record["eta"] is None
+    assert progress._thread is None
+
+
+def test_json() -> None:
+    stream = io.StringIO()
+    progress = Progress("auto", stream)
+    assert progress.mode == "json"
+
+    progress.expect(2, 200)
+    progress.start("a", 100).update(50)
+    progress.close()
+
+    record = json.loads(stream.getvalue().splitlines()[-1])
+    assert record["bytes_done"] == 50
+    assert record["files_active"] == 1
+    assert record["eta"] is not None
+
+
+def test_format() -> None:
+    progress = Progress("none")
+    progress.expect(10, 10 << 20)
+    progress.start("a").update(1 << 20)
+    line = Progress.format(progress.snapshot())
+    assert line.startswith("0/10 files  1.0MB")
+    assert "1 active" in line
+    assert "ETA" in line
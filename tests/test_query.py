@@ -0,0 +1,50 @@
+from argparse import Namespace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from gdrive.query import build_query, parse_time, quote
+
+
+def _options(**kwargs: object) -> Namespace:
+    options = dict.fromkeys(
+        ["mime", "name_contains", "modified_after", "modified_before", "owner"]
+    )
+    return Namespace(**(options | kwargs))
+
+
+def test_quote() -> None:
+    assert quote("report") == "'report'"
+    assert quote("Bob's") == r"'Bob\'s'"
+    assert quote("a\\b") == r"'a\\b'"
+
+
+def test_parse_time() -> None:
+    assert parse_time("2024-06-01T12:00:00+02:00") == "2024-06-01T10:00:00"
+
+    ago = datetime.strptime(parse_time("7d"), "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+    assert abs(datetime.now(timezone.utc) - timedelta(days=7) - ago) < timedelta(minutes=1)
+
+    for text in ["", "yesterday", "7y"]:
+        with pytest.raises(ValueError, match="Invalid"):
+            parse_time(text)
+
+
+def test_build_query() -> None:
+    assert not build_query(_options())
+
+    assert build_query(_options(mime=["application/pdf"])) == "mimeType = 'application/pdf'"
+
+    assert build_query(
+        _options(
+            mime=["image/*", "application/pdf"],
+            name_contains="it's",
+            modified_after="2024-06-01T00:00:00",
+            owner="me@example.com",
+        )
+    ) == (
+        "(mimeType contains 'image/' or mimeType = 'application/pdf')"
+        r" and name contains 'it\'s'"
+        " and modifiedTime > '2024-06-01T00:00:00'"
+        " and 'me@example.com' in owners"
+    )
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+import pytest
+
+from gdrive.since import LASTRUN, HighWaterMark, parse_since
+
+
+@pytest.fixture(autouse=True)
+def fixture_data_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+
+
+def test_parse_since() -> None:
+    assert parse_since("@LastRun") == LASTRUN
+    assert parse_since("2024-06-01T00:00:00+00:00") == "2024-06-01T00:00:00"
+
+    with pytest.raises(ValueError, match="Invalid"):
+        parse_since("@yesterday")
+
+
+def test_lastrun() -> None:
+    first = HighWaterMark("me@example.com", "files", LASTRUN)
+    assert first.since is None
+    first.save()
+
+    mark = HighWaterMark("me@example.com", "files", LASTRUN)
+    assert mark.since == first.last()
+    assert mark.since is not None
+    assert mark.since < mark.start.strftime("%Y-%m-%dT%H:%M:%S")
+
+    # each account, and scope, has its own mark.
+    assert HighWaterMark("you@example.com", "files", LASTRUN).since is None
+    assert HighWaterMark("me@example.com", "list /My Drive", LASTRUN).since is None
+
+    # an explicit time is used as given.
+    assert HighWaterMark("me@example.com", "files", "2024-06-01T00:00:00").since == (
+        "2024-06-01T00:00:00"
+    )
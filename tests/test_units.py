@@ -0,0 +1,40 @@
+import pytest
+
+from gdrive.units import format_size, parse_size
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("512", 512),
+        ("10K", 10240),
+        ("1.5M", 1572864),
+        ("2GiB", 2 << 30),
+        ("3kb", 3072),
+    ],
+)
+def test_parse_size(text: str, expected: int) -> None:
+    assert parse_size(text) == expected
+
+
+def test_parse_size_invalid() -> None:
+    with pytest.raises(ValueError, match="Invalid size"):
+        parse_size("10X")
+
+
+@pytest.mark.parametrize(
+    ("nbytes", "expected"),
+    [
+        (0, "0"),
+        (1023, "1023"),
+        (1536, "1.5K"),
+        (15 << 20, "15M"),
+        (3 << 40, "3.0T"),
+    ],
+)
+def test_format_size(nbytes: int, expected: str) -> None:
+    assert format_size(nbytes) == expected
+
+
+def test_format_size_not_human_readable() -> None:
+    assert format_size(15 << 20, human_readable=False) == str(15 << 20)
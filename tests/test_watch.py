@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import pytest
+
+from gdrive.commands.watch import DriveWatchCmd, WatchState
+
+
+def _cmd() -> DriveWatchCmd:
+    cmd = DriveWatchCmd.__new__(DriveWatchCmd)
+    cmd.path = "/My Drive/a"
+    cmd.paths = {"root": "/My Drive"}
+    cmd.known = {"a": ("a", "root", "application/vnd.google-apps.folder")}
+    cmd.changed = set()
+    return cmd
+
+
+def test_event() -> None:
+    cmd = _cmd()
+
+    # changes to shared drives have no item.
+    assert cmd._event({"changeType": "drive", "driveId": "d1"}) is None
+
+    file = {"name": "f", "parents": ["a"], "mimeType": "text/plain"}
+    change = {"changeType": "file", "fileId": "f", "file": file}
+    event = cmd._event(change)
+    assert event is not None
+    assert (event["event"], event["PATH"]) == ("add", "/My Drive/a/f")
+
+    event = cmd._event(change)
+    assert event is not None
+    assert event["event"] == "modify"
+    assert cmd.changed == {"f"}
+
+
+def test_state(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path))
+    cmd = _cmd()
+    state = WatchState("me@example.com", cmd.path)
+    assert state.load() == (None, {}, {})
+
+    state.reset(cmd.known, cmd.paths)
+    state.commit("42")
+    assert WatchState("me@example.com", cmd.path).load() == ("42", cmd.known, cmd.paths)
+
+    # only the changed items are saved; with the token, as of them.
+    file = {"name": "f", "parents": ["a"], "mimeType": "text/plain"}
+    cmd._event({"changeType": "file", "fileId": "f", "file": file})
+    cmd._event({"changeType": "file", "fileId": "a", "removed": True})
+    state.update(cmd.known, cmd.changed)
+    state.commit("43")
+    restarted = WatchState("me@example.com", cmd.path).load()
+    assert restarted == ("43", {"f": ("f", "a", "text/plain")}, cmd.paths)
+
+    # each path watched has its own state.
+    assert WatchState("me@example.com", "/My Drive").load() == (None, {}, {})